@@ -0,0 +1,38 @@
+"""
+Deterministic synthetic play by play fixtures for the benchmark suite.
+
+Fixtures come from ``conflict_map.data.synthetic`` so the benchmarks see the
+same nflverse-shaped columns and joint distributions as offline load tests.
+Seasons are numbered from ``FIRST_SEASON`` and seeded, so repeated runs (and
+runs on different commits) time exactly the same input.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from conflict_map.data.synthetic import generate_season
+
+FIRST_SEASON = 1990
+
+
+def synthetic_seasons(n_seasons: int, seed: int = 0) -> pd.DataFrame:
+    """Concatenate ``n_seasons`` synthetic seasons starting at ``FIRST_SEASON``."""
+    frames = [generate_season(FIRST_SEASON + i, seed=seed) for i in range(n_seasons)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def scrimmage_plays(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply the same pass/run-with-a-down filter as ``occi.load_nfl_data``."""
+    return df[df["play_type"].isin(["pass", "run"]) & df["down"].notna()].reset_index(drop=True)
+
+
+def write_raw_seasons(df: pd.DataFrame, data_dir: Path) -> list[int]:
+    """Write one ``pbp_<season>.csv`` per season so the loaders can be timed."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    seasons: list[int] = []
+    for season, frame in df.groupby("season"):
+        frame.to_csv(data_dir / f"pbp_{season}.csv", index=False)
+        seasons.append(int(season))
+    return seasons
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Load test for the ``/api/score`` conflict scoring service.
+
+Fires concurrent POST requests of synthetic plays at the service and reports
+request and play throughput plus p50/p95/p99 latency as JSON. Without
+``--url`` the service is started in-process on a free port, once with
+micro-batching and once without (``--modes`` picks which), so the effect of
+coalescing can be compared directly.
+
+Usage::
+
+    python benchmarks/load_score.py --clients 32 --plays-per-request 5 --requests 2000
+    python benchmarks/load_score.py --url http://127.0.0.1:5002 --format arrow
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np  # noqa: E402
+import pyarrow as pa  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+from benchmarks.fixtures import synthetic_seasons  # noqa: E402
+from conflict_map.pipeline.live import iter_play_records  # noqa: E402
+from conflict_map.pipeline.scoring import MicroBatcher  # noqa: E402
+from conflict_map.service import ARROW_STREAM, create_app  # noqa: E402
+
+
+def _payloads(plays_per_request: int, count: int, fmt: str, seed: int) -> list[tuple[bytes, str]]:
+    df = synthetic_seasons(1, seed=seed)
+    records = list(iter_play_records(df))
+    payloads = []
+    for i in range(count):
+        start = (i * plays_per_request) % max(len(records) - plays_per_request, 1)
+        chunk = records[start:start + plays_per_request]
+        if fmt == "arrow":
+            table = pa.Table.from_pylist(chunk)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            payloads.append((sink.getvalue().to_pybytes(), ARROW_STREAM))
+        else:
+            payloads.append((json.dumps({"plays": chunk}).encode(), "application/json"))
+    return payloads
+
+
+def _post(url: str, body: bytes, content_type: str) -> float:
+    started = time.perf_counter()
+    req = urllib.request.Request(f"{url}/api/score", data=body, headers={"Content-Type": content_type})
+    with urllib.request.urlopen(req) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def run_load(url: str, payloads: list[tuple[bytes, str]], clients: int) -> dict:
+    """Send every payload with ``clients`` concurrent workers and summarise latency."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = np.array(list(pool.map(lambda p: _post(url, *p), payloads)))
+    elapsed = time.perf_counter() - started
+    p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+    return {
+        "requests": len(payloads),
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(len(payloads) / elapsed, 1),
+        "p50_ms": round(p50, 2),
+        "p95_ms": round(p95, 2),
+        "p99_ms": round(p99, 2),
+    }
+
+
+def _serve(batching: bool, max_wait_ms: float):
+    batcher = MicroBatcher(max_wait_ms=max_wait_ms) if batching else None
+    server = make_server("127.0.0.1", 0, create_app(batcher, batching=batching), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, batcher
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the /api/score conflict scoring service")
+    parser.add_argument("--url", help="Base URL of a running service (default: start one in-process)")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent client threads")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests to send")
+    parser.add_argument("--plays-per-request", type=int, default=5)
+    parser.add_argument("--format", choices=["json", "arrow"], default="json")
+    parser.add_argument(
+        "--modes", nargs="+", choices=["batched", "unbatched"], default=["batched", "unbatched"],
+        help="In-process service configurations to test (ignored with --url)",
+    )
+    parser.add_argument("--max-wait-ms", type=float, default=1.0, help="Batching window for the in-process service")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    payloads = _payloads(args.plays_per_request, args.requests, args.format, args.seed)
+    meta = {
+        "clients": args.clients,
+        "plays_per_request": args.plays_per_request,
+        "format": args.format,
+    }
+    results = {}
+    if args.url:
+        results["external"] = run_load(args.url.rstrip("/"), payloads, args.clients)
+    else:
+        for mode in args.modes:
+            server, batcher = _serve(mode == "batched", args.max_wait_ms)
+            try:
+                results[mode] = run_load(f"http://127.0.0.1:{server.server_port}", payloads, args.clients)
+                if batcher is not None:
+                    results[mode].update(batcher.stats())
+            finally:
+                server.shutdown()
+                if batcher is not None:
+                    batcher.close()
+    for result in results.values():
+        result["plays_per_sec"] = round(result["requests_per_sec"] * args.plays_per_request, 1)
+    print(json.dumps({"meta": meta, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the OCCI pipelines.
+
+Times loading (default and Arrow-backed), feature engineering, conflict
+scoring, aggregation, the legacy ``OCCICalculator``, the one-pass engine
+computing both indices, the live feed's per-play update and the Flask
+``/api/*`` endpoints on deterministic synthetic fixtures, then writes the
+results as JSON so runs on different commits can be diffed.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py --scales 1 10 50 --output bench.json
+    python benchmarks/run_benchmarks.py --scales 1 --compare bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from benchmarks.fixtures import scrimmage_plays, synthetic_seasons, write_raw_seasons  # noqa: E402
+from conflict_map.data.load import load_raw_season  # noqa: E402
+from conflict_map.features.build_features import engineer_basic_features  # noqa: E402
+from conflict_map.metrics.occi import compute_team_game_occi, compute_team_season_occi  # noqa: E402
+from conflict_map.model.conflict_score import compute_conflict_scores  # noqa: E402
+from conflict_map.model.unified import compute_unified_indices  # noqa: E402
+from conflict_map.pipeline.live import iter_play_records, run_live  # noqa: E402
+
+API_ENDPOINTS = [
+    "/api/team-rankings",
+    "/api/team-chart",
+    "/api/occi-distribution",
+    "/api/pass-vs-run",
+    "/api/team-detail/{team}",
+]
+# Plays replayed through the live aggregator; it works play by play, so a
+# fixed count keeps large scales quick.
+LIVE_PLAYS = 5000
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> tuple[float, float, Any]:
+    """Return (best seconds, peak traced MiB, last result) for ``fn``.
+
+    Timing and memory tracing run separately because tracemalloc slows NumPy
+    and pandas allocations enough to distort wall-clock numbers.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / (1024 * 1024), result
+
+
+def _record(name: str, scale: int, plays: int, seconds: float, peak_mb: float, **extra: Any) -> dict:
+    return {
+        "benchmark": name,
+        "scale_seasons": scale,
+        "plays": plays,
+        "seconds": round(seconds, 6),
+        "plays_per_sec": round(plays / seconds, 1) if seconds > 0 else None,
+        "peak_memory_mb": round(peak_mb, 2),
+        **extra,
+    }
+
+
+def _skipped(name: str, scale: int, reason: str) -> dict:
+    return {"benchmark": name, "scale_seasons": scale, "skipped": reason}
+
+
+def _load_webapp():
+    spec = importlib.util.spec_from_file_location("occi_webapp", ROOT / "webapp" / "app.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_conflict_map(df_raw: pd.DataFrame, scale: int, repeat: int, workdir: Path) -> list[dict]:
+    """Time every stage of the ``conflict_map`` pipeline on ``df_raw``."""
+    plays = len(df_raw)
+    results: list[dict] = []
+
+    seasons = write_raw_seasons(df_raw, workdir)
+    for arrow, suffix in ((False, ""), (True, "_arrow")):
+        seconds, peak, frames = _measure(
+            lambda arrow=arrow: [load_raw_season(s, data_dir=workdir, arrow=arrow) for s in seasons], repeat
+        )
+        frame_mb = sum(frame.memory_usage(deep=True).sum() for frame in frames) / (1024 * 1024)
+        results.append(
+            _record(f"load_raw_season{suffix}", scale, plays, seconds, peak, seasons=len(seasons), frame_mb=round(frame_mb, 2))
+        )
+    df_arrow = pd.concat(frames, ignore_index=True)
+
+    seconds, peak, df_feat = _measure(lambda: engineer_basic_features(df_raw), repeat)
+    results.append(_record("engineer_basic_features", scale, plays, seconds, peak))
+    seconds, peak, _ = _measure(lambda: engineer_basic_features(df_arrow), repeat)
+    results.append(_record("engineer_basic_features_arrow", scale, plays, seconds, peak))
+
+    seconds, peak, df_conf = _measure(lambda: compute_conflict_scores(df_feat), repeat)
+    results.append(_record("compute_conflict_scores", scale, plays, seconds, peak))
+
+    seconds, peak, df_game = _measure(lambda: compute_team_game_occi(df_conf), repeat)
+    results.append(_record("compute_team_game_occi", scale, plays, seconds, peak, rows_out=len(df_game)))
+
+    season_lookup = df_conf[["game_id", "season"]].drop_duplicates()
+    seconds, peak, df_season = _measure(
+        lambda: compute_team_season_occi(df_game, season_lookup=season_lookup), repeat
+    )
+    results.append(
+        _record("compute_team_season_occi", scale, plays, seconds, peak, rows_in=len(df_game), rows_out=len(df_season))
+    )
+    return results
+
+
+def bench_occi(df_raw: pd.DataFrame, scale: int, repeat: int) -> list[dict]:
+    """Time the legacy calculator and the Flask API endpoints built on it."""
+    df_raw = scrimmage_plays(df_raw)
+    plays = len(df_raw)
+    try:
+        from occi.calculator import OCCICalculator
+    except ImportError as exc:
+        return [_skipped("OCCICalculator", scale, f"import failed: {exc}")]
+
+    def run_calculator():
+        calc = OCCICalculator(df_raw)
+        calc.calculate_play_occi()
+        return calc, calc.calculate_team_occi()
+
+    seconds, peak, (calculator, team_stats) = _measure(run_calculator, repeat)
+    results = [_record("OCCICalculator", scale, plays, seconds, peak)]
+
+    try:
+        webapp = _load_webapp()
+    except ImportError as exc:
+        return results + [_skipped("flask_api", scale, f"import failed: {exc}")]
+
+    webapp.pbp_data = df_raw
+    webapp.calculator = calculator
+    webapp.team_stats = team_stats
+    client = webapp.app.test_client()
+    team = str(team_stats["posteam"].iloc[0])
+
+    for endpoint in API_ENDPOINTS:
+        url = endpoint.format(team=team)
+
+        def request(url=url):
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} returned HTTP {response.status_code}")
+            return len(response.data)
+
+        seconds, peak, payload_bytes = _measure(request, repeat)
+        results.append(
+            _record(f"flask{endpoint}", scale, plays, seconds, peak, response_bytes=payload_bytes)
+        )
+    return results
+
+
+def bench_unified(df_raw: pd.DataFrame, scale: int, repeat: int) -> list[dict]:
+    """Time the one-pass engine producing both indices and their team aggregates."""
+    df_raw = scrimmage_plays(df_raw)
+    plays = len(df_raw)
+    seconds, peak, result = _measure(lambda: compute_unified_indices(df_raw), repeat)
+    return [_record("compute_unified_indices", scale, plays, seconds, peak, rows_out=len(result.teams))]
+
+
+def bench_live(df_raw: pd.DataFrame, scale: int, repeat: int) -> list[dict]:
+    """Time ``LiveOCCI`` replaying the first ``LIVE_PLAYS`` plays, with per-play latency percentiles."""
+    plays = list(iter_play_records(df_raw.head(LIVE_PLAYS)))
+    latencies: list[float] = []
+
+    def replay():
+        latencies.clear()
+        return run_live(plays, on_update=lambda update: latencies.append(update["latency_ms"]))
+
+    seconds, peak, _ = _measure(replay, repeat)
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return [
+        _record(
+            "live_update",
+            scale,
+            len(plays),
+            seconds,
+            peak,
+            latency_p50_ms=round(float(p50), 4),
+            latency_p99_ms=round(float(p99), 4),
+        )
+    ]
+
+
+def run_suite(scales: list[int], repeat: int, seed: int) -> dict:
+    results: list[dict] = []
+    for scale in scales:
+        print(f"Building {scale}-season fixture...", file=sys.stderr)
+        df_raw = synthetic_seasons(scale, seed=seed)
+        with tempfile.TemporaryDirectory(prefix="occi_bench_") as tmp:
+            results.extend(bench_conflict_map(df_raw, scale, repeat, Path(tmp)))
+        results.extend(bench_occi(df_raw, scale, repeat))
+        results.extend(bench_unified(df_raw, scale, repeat))
+        results.extend(bench_live(df_raw, scale, repeat))
+        for row in results:
+            if row["scale_seasons"] != scale:
+                continue
+            if "skipped" in row:
+                print(f"  {row['benchmark']:<38} skipped ({row['skipped']})", file=sys.stderr)
+            else:
+                print(
+                    f"  {row['benchmark']:<38} {row['seconds']:>10.4f}s "
+                    f"{row['plays_per_sec'] or 0:>14,.0f} plays/s {row['peak_memory_mb']:>9.1f} MiB",
+                    file=sys.stderr,
+                )
+    return {"meta": _environment(seed, repeat), "results": results}
+
+
+def _environment(seed: int, repeat: int) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "seed": seed,
+        "repeat": repeat,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """List benchmarks whose throughput dropped by more than ``threshold``."""
+    key = lambda row: (row["benchmark"], row["scale_seasons"])  # noqa: E731
+    previous = {key(row): row for row in baseline.get("results", []) if row.get("plays_per_sec")}
+    regressions = []
+    for row in current["results"]:
+        old = previous.get(key(row))
+        if old is None or not row.get("plays_per_sec"):
+            continue
+        ratio = row["plays_per_sec"] / old["plays_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append(
+                f"{row['benchmark']} @ {row['scale_seasons']} seasons: "
+                f"{old['plays_per_sec']:,.0f} -> {row['plays_per_sec']:,.0f} plays/s ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the OCCI pipelines on synthetic fixtures")
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 50], help="Fixture sizes in seasons")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed repetitions per benchmark (best is kept)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic fixtures")
+    parser.add_argument("--output", type=Path, help="Write results JSON to this path (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to check for regressions")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Allowed throughput drop before --compare fails (default 0.10)"
+    )
+    args = parser.parse_args()
+
+    report = run_suite(args.scales, repeat=args.repeat, seed=args.seed)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    else:
+        print(text)
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
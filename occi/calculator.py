@@ -6,7 +6,13 @@ into structurally difficult situations using various play-by-play proxies.
 """
 
 import pandas as pd
-import numpy as np
+
+from conflict_map.metrics.bootstrap import bootstrap_team_occi
+from conflict_map.metrics.drives import compute_drive_occi
+from conflict_map.metrics.similarity import SimilarityIndex, component_profiles
+from conflict_map.metrics.sketch import build_group_digests
+from conflict_map.model import unified
+from conflict_map.model.unified import occi_components, occi_index
 
 
 class OCCICalculator:
@@ -22,18 +28,11 @@ class OCCICalculator:
     - Route variety and complexity
     """
     
-    # Weights for different OCCI components
-    WEIGHTS = {
-        'motion': 0.15,
-        'formation': 0.20,
-        'target_depth': 0.20,
-        'play_action': 0.15,
-        'personnel': 0.15,
-        'situational': 0.15,
-    }
+    # Weights for different OCCI components, shared with the one-pass engine
+    WEIGHTS = unified.OCCI_WEIGHTS
     
     # Maximum meaningful passing depth in yards for normalization
-    MAX_TARGET_DEPTH = 50.0
+    MAX_TARGET_DEPTH = unified.MAX_TARGET_DEPTH
     
     def __init__(self, pbp_data):
         """
@@ -43,128 +42,45 @@ class OCCICalculator:
             pbp_data: DataFrame with NFL play-by-play data
         """
         self.pbp_data = pbp_data.copy()
+        self.team_sketches = {}
         self._prepare_features()
     
-    def _prepare_features(self):
-        """Extract and prepare features for OCCI calculation."""
-        
-        # Motion score - use shift in formation or no_huddle as proxy
-        self.pbp_data['motion_score'] = np.where(
-            self.pbp_data['no_huddle'] == 1, 1.0,
-            np.where(self.pbp_data['shotgun'] == 1, 0.6, 0.3)
-        )
-        
-        # Formation score - based on personnel and shotgun usage
-        # More spread formations create more conflict
-        self.pbp_data['formation_score'] = self._calculate_formation_score()
-        
-        # Target depth score - deeper targets create more conflict
-        self.pbp_data['target_depth_score'] = self._calculate_target_depth_score()
-        
-        # Play action score
-        self.pbp_data['play_action_score'] = np.where(
-            self.pbp_data['pass_attempt'] == 1,
-            np.where(self.pbp_data['qb_dropback'] == 1, 0.7, 0.3),
-            0.5  # Run plays have moderate score
-        )
-        
-        # Personnel score - variety in personnel creates conflict
-        self.pbp_data['personnel_score'] = self._calculate_personnel_score()
-        
-        # Situational score - down and distance variety
-        self.pbp_data['situational_score'] = self._calculate_situational_score()
-    
-    def _calculate_formation_score(self):
-        """
-        Calculate formation complexity score.
-        
-        Returns normalized score based on formation type.
-        """
-        # Use shotgun and available receiver information as proxy
-        scores = np.zeros(len(self.pbp_data))
-        
-        # Shotgun formations generally more complex
-        shotgun_mask = self.pbp_data['shotgun'] == 1
-        scores[shotgun_mask] = 0.7
-        
-        # Under center
-        scores[~shotgun_mask] = 0.4
-        
-        # No huddle adds complexity
-        no_huddle_mask = self.pbp_data['no_huddle'] == 1
-        scores[no_huddle_mask] += 0.3
-        
-        return np.clip(scores, 0, 1)
-    
-    def _calculate_target_depth_score(self):
-        """
-        Calculate target depth score for passing plays.
-        
-        Deeper targets create more conflict for defense.
+    @classmethod
+    def from_scored_plays(cls, play_data):
         """
-        scores = np.zeros(len(self.pbp_data))
+        Wrap plays that already carry the component scores and ``occi``.
         
-        # For pass plays, use air_yards as proxy
-        pass_mask = self.pbp_data['pass_attempt'] == 1
-        air_yards = self.pbp_data['air_yards'].fillna(0)
+        Nothing is copied or recomputed, so ``play_data`` can be a read-only
+        frame over a shared play store (``conflict_map.pipeline.play_store``).
         
-        # Normalize air yards to 0-1 scale
-        normalized_depth = np.clip(air_yards / self.MAX_TARGET_DEPTH, 0, 1)
-        scores[pass_mask] = normalized_depth[pass_mask]
-        
-        # For run plays, use moderate fixed score
-        scores[~pass_mask] = 0.4
-        
-        return scores
-    
-    def _calculate_personnel_score(self):
-        """
-        Calculate personnel variety score.
+        Args:
+            play_data: DataFrame as returned by ``get_play_data_with_occi``
         
-        More diverse personnel creates more conflict.
+        Returns:
+            OCCICalculator over ``play_data``
         """
-        # Use number of pass attempts vs runs as proxy for variety
-        scores = np.where(
-            self.pbp_data['pass_attempt'] == 1,
-            0.6,  # Pass plays
-            0.4   # Run plays
-        )
-        
-        # Adjust for down - unexpected playcalls create more conflict
-        # E.g., passing on early downs, running on 3rd and long
-        down = self.pbp_data['down'].fillna(1)
-        ydstogo = self.pbp_data['ydstogo'].fillna(10)
-        
-        # Pass on 1st/2nd down or run on 3rd+ and long
-        unexpected_mask = (
-            ((down <= 2) & (self.pbp_data['pass_attempt'] == 1)) |
-            ((down >= 3) & (ydstogo >= 7) & (self.pbp_data['rush_attempt'] == 1))
-        )
-        scores[unexpected_mask] += 0.2
-        
-        return np.clip(scores, 0, 1)
+        calculator = cls.__new__(cls)
+        calculator.pbp_data = play_data
+        calculator.team_sketches = {}
+        return calculator
     
-    def _calculate_situational_score(self):
-        """
-        Calculate situational complexity score.
-        
-        More challenging situations create more conflict.
+    def _prepare_features(self):
         """
-        scores = np.ones(len(self.pbp_data)) * 0.5  # Base score
-        
-        # Scoring position increases complexity
-        yardline = self.pbp_data['yardline_100'].fillna(50)
-        scores += np.where(yardline <= 20, 0.2, 0)
-        
-        # Third/fourth down increases complexity
-        down = self.pbp_data['down'].fillna(1)
-        scores += np.where(down >= 3, 0.2, 0)
-        
-        # Close games increase complexity
-        score_diff = self.pbp_data['score_differential'].fillna(0).abs()
-        scores += np.where(score_diff <= 7, 0.1, 0)
-        
-        return np.clip(scores, 0, 1)
+        Extract and prepare features for OCCI calculation.
+        
+        The component scores come from the shared one-pass engine in
+        ``conflict_map.model.unified``, which also computes the conflict_map
+        score from the same arrays:
+        - motion: no huddle or shotgun as a proxy for pre-snap movement
+        - formation: shotgun spread vs under center, plus no huddle
+        - target depth: air yards on passes, a fixed score on runs
+        - play action: dropbacks on passes, a moderate score on runs
+        - personnel: pass vs run, plus unexpected calls for the down
+        - situational: scoring position, late downs and close games
+        """
+        components = occi_components(self.pbp_data, self.MAX_TARGET_DEPTH)
+        for name, scores in components.items():
+            self.pbp_data[name] = scores
     
     def calculate_play_occi(self):
         """
@@ -173,24 +89,21 @@ class OCCICalculator:
         Returns:
             Series with OCCI score for each play
         """
-        occi = (
-            self.pbp_data['motion_score'] * self.WEIGHTS['motion'] +
-            self.pbp_data['formation_score'] * self.WEIGHTS['formation'] +
-            self.pbp_data['target_depth_score'] * self.WEIGHTS['target_depth'] +
-            self.pbp_data['play_action_score'] * self.WEIGHTS['play_action'] +
-            self.pbp_data['personnel_score'] * self.WEIGHTS['personnel'] +
-            self.pbp_data['situational_score'] * self.WEIGHTS['situational']
-        )
-        
-        # Normalize to 0-100 scale
-        self.pbp_data['occi'] = occi * 100
+        # Weighted sum of the components on a 0-100 scale
+        self.pbp_data['occi'] = occi_index(self.pbp_data, self.WEIGHTS)
         
         return self.pbp_data['occi']
     
-    def calculate_team_occi(self):
+    def calculate_team_occi(self, use_sketch=False):
         """
         Calculate aggregate OCCI metrics by team.
         
+        Args:
+            use_sketch: If True, take the median (plus p10/p90 columns) from
+                mergeable t-digest sketches instead of an exact groupby
+                median. The sketches are kept on ``self.team_sketches`` so
+                they can be merged with other chunks or seasons.
+        
         Returns:
             DataFrame with team-level OCCI statistics
         """
@@ -198,9 +111,11 @@ class OCCICalculator:
         if 'occi' not in self.pbp_data.columns:
             self.calculate_play_occi()
         
+        occi_stats = ['mean', 'std', 'count'] if use_sketch else ['mean', 'std', 'median', 'count']
+        
         # Group by offensive team
         team_stats = self.pbp_data.groupby('posteam').agg({
-            'occi': ['mean', 'std', 'median', 'count'],
+            'occi': occi_stats,
             'pass_attempt': 'sum',
             'rush_attempt': 'sum',
         }).round(2)
@@ -216,6 +131,12 @@ class OCCICalculator:
             'rush_attempt_sum': 'rush_plays',
         })
         
+        if use_sketch:
+            sketch = self.get_team_sketches().loc[team_stats.index]
+            team_stats.insert(2, 'median_occi', sketch['median_occi'])
+            team_stats['p10_occi'] = sketch['p10_occi']
+            team_stats['p90_occi'] = sketch['p90_occi']
+        
         # Calculate pass rate
         team_stats['pass_rate'] = (
             team_stats['pass_plays'] / team_stats['total_plays'] * 100
@@ -226,6 +147,90 @@ class OCCICalculator:
         
         return team_stats.reset_index()
     
+    def get_team_sketches(self):
+        """
+        Build per-team t-digest sketches of play OCCI in one pass.
+        
+        Returns:
+            DataFrame indexed by team with rounded p10/median/p90 OCCI. The
+            underlying ``{team: TDigest}`` map is stored on
+            ``self.team_sketches``.
+        """
+        if 'occi' not in self.pbp_data.columns:
+            self.calculate_play_occi()
+        
+        self.team_sketches = build_group_digests(self.pbp_data['posteam'], self.pbp_data['occi'])
+        quantiles = {
+            team: digest.quantile([0.1, 0.5, 0.9]) for team, digest in self.team_sketches.items()
+        }
+        return pd.DataFrame.from_dict(
+            quantiles, orient='index', columns=['p10_occi', 'median_occi', 'p90_occi']
+        ).round(2)
+    
+    def bootstrap_team_occi(self, n_resamples=10000, level=0.95, seed=0, n_jobs=1):
+        """
+        Bootstrap confidence intervals and rank probabilities for team OCCI.
+        
+        Plays are resampled within each team, matching ``avg_occi`` from
+        ``calculate_team_occi``.
+        
+        Args:
+            n_resamples: Number of bootstrap resamples
+            level: Confidence level for the intervals
+            seed: Seed for the resampling
+            n_jobs: Worker processes to spread resample blocks over
+        
+        Returns:
+            Tuple of (intervals, rank_probabilities) DataFrames. Intervals
+            have avg_occi, std_error, ci_low, ci_high, rank, rank_ci_low and
+            rank_ci_high per team; rank probabilities have one ``rank_<n>``
+            column per rank.
+        """
+        if 'occi' not in self.pbp_data.columns:
+            self.calculate_play_occi()
+        
+        result = bootstrap_team_occi(
+            self.pbp_data, value_col='occi', team_col='posteam', season_col=None,
+            n_resamples=n_resamples, seed=seed, n_jobs=n_jobs,
+        )
+        columns = {'team': 'posteam', 'units': 'total_plays', 'occi': 'avg_occi'}
+        intervals = result.intervals(level).rename(columns=columns)
+        return intervals, result.rank_probabilities().rename(columns=columns)
+    
+    def calculate_drive_occi(self, unit='drive', threshold=40.0):
+        """
+        Calculate OCCI per drive or per series.
+        
+        Args:
+            unit: 'drive' or 'series'
+            threshold: Play OCCI (0-100 scale) at or above which a play counts
+                towards high-conflict plays and streaks
+        
+        Returns:
+            DataFrame with one row per drive/series: plays, occi_sum,
+            occi_mean, occi_max, high_conflict_plays and
+            longest_high_conflict_streak
+        """
+        if 'occi' not in self.pbp_data.columns:
+            self.calculate_play_occi()
+        
+        return compute_drive_occi(self.pbp_data, unit=unit, threshold=threshold, score_col='occi')
+    
+    def build_similarity_index(self, level='season'):
+        """
+        Build a nearest-neighbour index over team component profiles.
+        
+        Args:
+            level: 'season' for one profile per team-season, 'game' for one
+                per team-game
+        
+        Returns:
+            ``conflict_map.metrics.similarity.SimilarityIndex`` over the mean
+            motion, formation, target depth, play action, personnel and
+            situational scores
+        """
+        return SimilarityIndex(component_profiles(self.pbp_data, level=level))
+    
     def get_play_data_with_occi(self):
         """
         Get full play-by-play data with OCCI scores.
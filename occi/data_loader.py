@@ -1,32 +1,165 @@
 """
 Data loading utilities for NFL play-by-play data
+
+Seasons are fetched from nflverse one at a time and kept in a local cache
+(one parquet file per season). Each season is trimmed as it arrives: only
+the columns the OCCI calculator reads are requested, rows are filtered to
+pass/run plays with a down, and numeric columns are downcast where no value
+changes. Later calls read the cached files, pushing the column selection and
+the play filter down to the parquet reader.
+
+The cache lives in ``data/cache/occi`` unless ``OCCI_CACHE_DIR`` is set.
+Setting ``OCCI_OFFLINE=true`` (or passing ``offline=True``) never touches
+the network and fails for seasons that are not cached.
 """
 
-import nfl_data_py as nfl
+import os
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
+from conflict_map.model.unified import KEY_COLUMNS, OCCI_COLUMNS
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / 'data' / 'cache' / 'occi'
+SCRIMMAGE_PLAY_TYPES = ['pass', 'run']
+# Largest integer every float32 represents exactly.
+_FLOAT32_EXACT = 2 ** 24
+
+
+def default_columns():
+    """
+    Columns ``OCCICalculator`` and the dashboards read from the play-by-play.
+    
+    Returns:
+        List of column names, including ``play_type`` for the play filter
+    """
+    return list(KEY_COLUMNS) + list(OCCI_COLUMNS) + ['play_type']
+
+
+def season_cache_path(season, cache_dir=None):
+    """Path of the cached play-by-play file for one season."""
+    cache_dir = Path(cache_dir or os.environ.get('OCCI_CACHE_DIR') or DEFAULT_CACHE_DIR)
+    return cache_dir / f'pbp_{season}.parquet'
+
+
+def downcast_numeric(df):
+    """
+    Downcast numeric columns without changing any value.
+    
+    Integer columns take the smallest integer type that holds them. Float
+    columns whose values are all whole numbers within float32's exact range
+    (flags, downs, yards, scores) become float32, keeping NaN for missing
+    values; fractional columns such as EPA stay float64.
+    
+    Args:
+        df: DataFrame to downcast
+    
+    Returns:
+        DataFrame with downcast columns
+    """
+    converted = {}
+    for col in df.columns:
+        values = df[col]
+        if values.dtype.kind in "iu":
+            converted[col] = pd.to_numeric(values, downcast='integer')
+        elif values.dtype == np.float64:
+            present = values.to_numpy()[~np.isnan(values.to_numpy())]
+            if np.all(present == np.round(present)) and np.all(np.abs(present) <= _FLOAT32_EXACT):
+                converted[col] = values.astype(np.float32)
+    return df.assign(**converted) if converted else df
+
+
+def scrimmage_plays(pbp):
+    """Pass and run plays with a down (no special teams, kneels without a down, etc.)."""
+    return pbp[pbp['play_type'].isin(SCRIMMAGE_PLAY_TYPES) & pbp['down'].notna()]
+
+
+def _fetch_season(season, columns):
+    """Download one season's play-by-play from nflverse, limited to ``columns``."""
+    import nfl_data_py as nfl
+    
+    return nfl.import_pbp_data([season], columns=columns, include_participation=False, downcast=False)
+
+
+def _refresh_season(season, columns, path):
+    """Download, trim and cache one season; returns the trimmed frame."""
+    pbp = _fetch_season(season, columns)
+    pbp = downcast_numeric(scrimmage_plays(pbp).reset_index(drop=True))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    pbp.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return pbp
+
 
-def load_nfl_data(seasons, refresh=False):
+def _read_cached_season(path, columns):
+    """Read a cached season, pushing the columns and the play filter down to parquet."""
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    
+    play_filter = pc.field('play_type').isin(SCRIMMAGE_PLAY_TYPES) & pc.field('down').is_valid()
+    return pq.read_table(path, columns=columns, filters=play_filter).to_pandas()
+
+
+def _cached_columns(path):
+    import pyarrow.parquet as pq
+    
+    return set(pq.read_schema(path).names)
+
+
+def load_nfl_data(seasons, refresh=False, columns=None, cache_dir=None, offline=None):
     """
     Load NFL play-by-play data for specified seasons.
     
     Args:
         seasons: List of seasons (years) to load data for
-        refresh: If True, download fresh data; otherwise use cached data
-        
+        refresh: True to download every season again, False to use cached
+            seasons, or a list of seasons to download again (e.g. the one in
+            progress) while using the cache for the rest
+        columns: Columns to load (default: ``default_columns()``); a cached
+            season missing any of them is downloaded again
+        cache_dir: Directory of the season cache (default: ``OCCI_CACHE_DIR``
+            or ``data/cache/occi``)
+        offline: Never download; defaults to the ``OCCI_OFFLINE`` environment
+            variable
+    
     Returns:
         DataFrame with play-by-play data
+    
+    Raises:
+        FileNotFoundError: If offline and a season is not cached
+        ValueError: If offline and a refresh is requested
     """
+    seasons = [int(season) for season in seasons]
+    columns = list(dict.fromkeys(columns or default_columns()))
+    for required in ('play_type', 'down'):
+        if required not in columns:
+            columns.append(required)
+    if offline is None:
+        offline = os.environ.get('OCCI_OFFLINE', 'false').lower() == 'true'
+    if refresh is True:
+        refresh_seasons = set(seasons)
+    else:
+        refresh_seasons = {int(season) for season in (refresh or [])}
+    if offline and refresh_seasons:
+        raise ValueError('cannot refresh seasons in offline mode')
+    
     print(f"Loading NFL play-by-play data for seasons: {seasons}")
-    pbp = nfl.import_pbp_data(seasons, downcast=False)
+    frames = []
+    for season in seasons:
+        path = season_cache_path(season, cache_dir)
+        cached = path.exists() and season not in refresh_seasons and set(columns) <= _cached_columns(path)
+        if cached:
+            frames.append(_read_cached_season(path, columns))
+        elif offline:
+            raise FileNotFoundError(f"season {season} is not cached with the requested columns in {path.parent}")
+        else:
+            frames.append(_refresh_season(season, columns, path)[columns])
     
-    # Filter to regular plays (exclude special teams, kickoffs, etc.)
-    pbp = pbp[
-        (pbp['play_type'].isin(['pass', 'run'])) &
-        (pbp['down'].notna())
-    ].copy()
+    pbp = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
     
-    print(f"Loaded {len(pbp)} plays from {pbp['game_id'].nunique()} games")
+    print(f"Loaded {len(pbp)} plays from {pbp['game_id'].nunique() if 'game_id' in pbp else 0} games")
     
     return pbp
 
@@ -37,7 +170,7 @@ def get_team_list(pbp_data):
     
     Args:
         pbp_data: DataFrame with play-by-play data
-        
+    
     Returns:
         Sorted list of unique team abbreviations
     """
@@ -10,7 +10,9 @@ setup(
     description="Offensive Conflict Creation Index for NFL teams",
     long_description=long_description,
     long_description_content_type="text/markdown",
-    packages=find_packages(),
+    # occi imports the OCCI engine from the conflict_map package under src/.
+    packages=find_packages(exclude=["tests", "tests.*"]) + find_packages(where="src"),
+    package_dir={"conflict_map": "src/conflict_map"},
     python_requires=">=3.8",
     install_requires=[
         "pandas>=2.0.0",
@@ -18,5 +20,8 @@ setup(
         "nfl_data_py>=0.3.0",
         "flask>=3.0.0",
         "plotly>=5.17.0",
+        "pyarrow>=14.0.0",
+        "scipy>=1.10.0",
+        "requests>=2.31.0",
     ],
 )
@@ -9,10 +9,12 @@ from typing import List
 import pandas as pd
 import streamlit as st
 
+from ..pipeline.play_index import PLAY_INDEX_FILE, PlayFilter, PlayIndex
 from ..viz.plots import plot_team_season_occi, plot_team_season_trend
 
 DATA_DIR = pathlib.Path(__file__).resolve().parents[2] / "data" / "processed"
 METADATA_PATH = DATA_DIR / "occi_run_metadata.json"
+PAGE_SIZES = [25, 50, 100]
 
 st.set_page_config(
     page_title="OCCI Lite Explorer",
@@ -62,8 +64,16 @@ def build_demo_game_data() -> pd.DataFrame:
     return pd.DataFrame(demo)
 
 
+def data_version() -> int:
+    """Changes whenever a run or weekly append finishes; loaders take it so new outputs bypass the cache."""
+    try:
+        return METADATA_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
 @st.cache_data
-def load_run_metadata() -> dict | None:
+def load_run_metadata(version: int) -> dict | None:
     if METADATA_PATH.exists():
         try:
             return json.loads(METADATA_PATH.read_text())
@@ -73,7 +83,7 @@ def load_run_metadata() -> dict | None:
 
 
 @st.cache_data
-def load_team_season_occi() -> tuple[pd.DataFrame, pathlib.Path | None]:
+def load_team_season_occi(version: int) -> tuple[pd.DataFrame, pathlib.Path | None]:
     csv_path = DATA_DIR / "team_season_occi.csv"
     if csv_path.exists():
         return pd.read_csv(csv_path), csv_path
@@ -82,13 +92,43 @@ def load_team_season_occi() -> tuple[pd.DataFrame, pathlib.Path | None]:
 
 
 @st.cache_data
-def load_team_game_occi() -> tuple[pd.DataFrame | None, pathlib.Path]:
+def load_team_game_occi(version: int) -> tuple[pd.DataFrame | None, pathlib.Path]:
     csv_path = DATA_DIR / "team_game_occi.csv"
     if csv_path.exists():
         return pd.read_csv(csv_path), csv_path
     return build_demo_game_data(), csv_path
 
 
+@st.cache_data
+def load_team_occi_splits(version: int) -> pd.DataFrame | None:
+    csv_path = DATA_DIR / "team_occi_splits.csv"
+    if csv_path.exists():
+        return pd.read_csv(csv_path, dtype={"value": str})
+    return None
+
+
+@st.cache_resource
+def load_play_index(version: int) -> PlayIndex | None:
+    path = DATA_DIR / PLAY_INDEX_FILE
+    return PlayIndex(path) if path.exists() else None
+
+
+@st.cache_data
+def query_play_options(version: int) -> dict[str, list]:
+    return load_play_index(version).options()
+
+
+@st.cache_data(max_entries=64)
+def query_play_page(version: int, play_filter: PlayFilter, page: int, page_size: int, descending: bool):
+    return load_play_index(version).page(play_filter, page, page_size, descending)
+
+
+@st.cache_data(max_entries=64)
+def query_play_charts(version: int, play_filter: PlayFilter) -> tuple[pd.DataFrame, pd.DataFrame]:
+    index = load_play_index(version)
+    return index.histogram(play_filter), index.sample(play_filter)
+
+
 def style_app_shell() -> None:
     st.markdown(
         """
@@ -204,6 +244,75 @@ def render_game_section(df_game: pd.DataFrame | None, default_team: str | None,
     )
 
 
+def render_splits_section(df_splits: pd.DataFrame | None, default_team: str | None) -> None:
+    st.header("Situational splits")
+    if df_splits is None or df_splits.empty:
+        st.info("Run the CLI to generate `data/processed/team_occi_splits.csv` for situation, opponent, and personnel splits.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    if "season" in df_splits.columns:
+        seasons = sorted(df_splits["season"].unique())
+        season = col1.selectbox("Season", seasons, index=len(seasons) - 1, key="split_season")
+        df_splits = df_splits[df_splits["season"] == season]
+    teams = sorted(df_splits["team"].unique())
+    team = col2.selectbox(
+        "Team", teams, index=teams.index(default_team) if default_team in teams else 0, key="split_team"
+    )
+    split = col3.selectbox(
+        "Split by",
+        sorted(df_splits["split"].unique()),
+        format_func=lambda name: name.replace("_", " "),
+        key="split_dimension",
+    )
+
+    subset = df_splits[(df_splits["team"] == team) & (df_splits["split"] == split)]
+    subset = subset.sort_values("occi_mean", ascending=False)
+    st.bar_chart(subset.set_index("value")["occi_mean"], height=280)
+    st.dataframe(
+        subset[["value", "plays", "occi_mean", "occi_std"]].style.format({"occi_mean": "{:.3f}", "occi_std": "{:.3f}"}),
+        use_container_width=True,
+    )
+
+
+def render_play_explorer(version: int) -> None:
+    st.header("Play explorer")
+    index = load_play_index(version)
+    if index is None:
+        st.info("Run the CLI to generate `data/processed/play_index.parquet` for play-level drill-down.")
+        return
+
+    options = query_play_options(version)
+    col1, col2, col3, col4 = st.columns(4)
+    play_filter = PlayFilter(
+        teams=tuple(col1.multiselect("Offense", options["teams"], key="plays_teams")),
+        seasons=tuple(col2.multiselect("Season", options["seasons"], key="plays_seasons")),
+        weeks=tuple(col3.multiselect("Week", options["weeks"], key="plays_weeks")),
+        situations=tuple(col4.multiselect("Situation", options["situations"], key="plays_situations")),
+    )
+
+    col1, col2, col3 = st.columns(3)
+    order = col1.radio("Conflict score", ["Highest first", "Lowest first"], horizontal=True, key="plays_order")
+    page_size = col2.selectbox("Plays per page", PAGE_SIZES, index=1, key="plays_page_size")
+    page_number = col3.number_input("Page", min_value=1, value=1, step=1, key="plays_page")
+
+    result = query_play_page(version, play_filter, int(page_number) - 1, page_size, order == "Highest first")
+    if result.total_rows == 0:
+        st.warning("No plays match the selected filters.")
+        return
+    st.caption(f"Page {result.page + 1} of {result.pages} — {result.total_rows:,} matching plays")
+    st.dataframe(result.rows, use_container_width=True, hide_index=True)
+
+    histogram, sample = query_play_charts(version, play_filter)
+    col1, col2 = st.columns(2)
+    col1.subheader("Conflict score distribution")
+    col1.bar_chart(histogram.assign(bin=histogram["bin_start"].round(3)).set_index("bin")["plays"], height=280)
+    col2.subheader("EPA vs conflict score")
+    if len(sample) < result.total_rows:
+        col2.caption(f"Random sample of {len(sample):,} plays")
+    col2.scatter_chart(sample, x="conflict_score", y="epa", height=280)
+
+
 def render_methodology() -> None:
     with st.expander("What am I looking at?", expanded=False):
         st.markdown(
@@ -219,9 +328,10 @@ def main() -> None:
     st.title("Offensive Conflict Creation Index (OCCI) — Lite")
     st.write("Explore league-wide stress creation using only public play-by-play signals.")
 
-    df_season, season_csv_path = load_team_season_occi()
-    df_game, game_csv_path = load_team_game_occi()
-    metadata = load_run_metadata()
+    version = data_version()
+    df_season, season_csv_path = load_team_season_occi(version)
+    df_game, game_csv_path = load_team_game_occi(version)
+    metadata = load_run_metadata(version)
 
     if metadata:
         base_range = metadata.get("base_seasons") or metadata.get("seasons", [])
@@ -238,6 +348,8 @@ def main() -> None:
     highlight_teams = render_season_section(df_season)
     render_trend_section(df_season, highlight_teams)
     render_game_section(df_game, highlight_teams[0] if highlight_teams else None, game_csv_path.exists())
+    render_splits_section(load_team_occi_splits(version), highlight_teams[0] if highlight_teams else None)
+    render_play_explorer(version)
     render_methodology()
 
     if season_csv_path is None:
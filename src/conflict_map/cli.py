@@ -4,14 +4,287 @@ Command line interface for computing OCCI from raw play by play.
 from __future__ import annotations
 
 import argparse
+import json
+import threading
 from pathlib import Path
 
-from .data.load import load_raw_multiple_seasons
-from .pipeline.updates import append_weekly_updates, build_from_ranges, run_pipeline
+import pandas as pd
+
+from .config import CACHE_DIR, DEFAULT_MODEL_PATH, RAW_DATA_DIR, WEEKLY_RAW_DATA_DIR
+from .data.load import load_raw_multiple_seasons, season_raw_path
+from .data.synthetic import REGULAR_SEASON_WEEKS, write_synthetic_season, write_synthetic_weekly
+from .features.build_features import engineer_basic_features
+from .model.learned import DEFAULT_ALPHA, TARGETS, ConflictModel, cross_validate_by_season, fit_conflict_model
+from .pipeline.cache import RawFiles
+from .pipeline.instrumentation import PipelineRecorder, file_bytes
+from .pipeline.live import iter_play_records, open_feed, replay_to_file, run_live, serve_replay
+from .pipeline.overlap import Fetcher, build_overlapped, range_sources
+from .pipeline.updates import append_weekly_updates, build_from_ranges, rescore_from_features, run_pipeline
+from .pipeline.watch import DEFAULT_POLL_SECONDS, DEFAULT_SETTLE_SECONDS, WeeklyWatcher
+
+
+def _add_generate_parser(subparsers: argparse._SubParsersAction) -> None:
+    generate = subparsers.add_parser(
+        "generate",
+        help="Write synthetic nflverse-style play-by-play files for offline testing.",
+        description="Write synthetic nflverse-style pbp_YYYY.csv(.gz) or weekly files, streamed week by week.",
+    )
+    generate.add_argument("--seasons", nargs="+", type=int, required=True, help="Seasons to generate.")
+    generate.add_argument(
+        "--weeks",
+        nargs="+",
+        type=int,
+        help="Week numbers to simulate (default: 1-18).",
+    )
+    generate.add_argument(
+        "--weekly",
+        action="store_true",
+        help="Write one pbp_<season>_week_<week> file per week instead of a single season file.",
+    )
+    generate.add_argument(
+        "--output-dir",
+        type=Path,
+        help=f"Target directory (default: {RAW_DATA_DIR} or {WEEKLY_RAW_DATA_DIR} with --weekly).",
+    )
+    generate.add_argument("--seed", type=int, default=0, help="Random seed; identical seeds give identical files.")
+    generate.add_argument(
+        "--teams",
+        type=int,
+        default=32,
+        help="League size. Use e.g. 320 for 10x league volume (extra clubs are named X033, X034, ...).",
+    )
+    generate.add_argument("--no-gzip", action="store_true", help="Write plain .csv instead of .csv.gz.")
+
+
+def _run_generate(args: argparse.Namespace) -> None:
+    compress = not args.no_gzip
+    for season in args.seasons:
+        if args.weekly:
+            weeks = args.weeks or list(range(1, REGULAR_SEASON_WEEKS + 1))
+            paths = write_synthetic_weekly(
+                season,
+                weeks,
+                weekly_dir=args.output_dir or WEEKLY_RAW_DATA_DIR,
+                seed=args.seed,
+                num_teams=args.teams,
+                compress=compress,
+            )
+            for path in paths:
+                print(f"Wrote {path}")
+        else:
+            path = write_synthetic_season(
+                season,
+                output_dir=args.output_dir or RAW_DATA_DIR,
+                weeks=args.weeks,
+                seed=args.seed,
+                num_teams=args.teams,
+                compress=compress,
+            )
+            print(f"Wrote {path}")
+
+
+def _add_live_parsers(subparsers: argparse._SubParsersAction) -> None:
+    live = subparsers.add_parser(
+        "live",
+        help="Score plays from a live feed and print running team-game OCCI.",
+        description="Consume JSON play events from file:<path> (tailed) or tcp:<host>:<port> and print one JSON update per play.",
+    )
+    live.add_argument("--source", required=True, help="Feed to consume: file:<path> or tcp:<host>:<port>.")
+    live.add_argument(
+        "--no-follow", action="store_true", help="For file feeds, stop at end of file instead of waiting for more."
+    )
+    live.add_argument("--quiet", action="store_true", help="Only print the final team-game table.")
+
+    replay = subparsers.add_parser(
+        "replay",
+        help="Replay a play-by-play file as a live feed for testing.",
+        description="Stream the plays of a pbp CSV(.gz) in game order to file:<path> or tcp:<host>:<port>.",
+    )
+    replay.add_argument("pbp", type=Path, help="Play-by-play CSV(.gz) to replay.")
+    replay.add_argument("--to", required=True, help="Destination: file:<path> or tcp:<host>:<port> to listen on.")
+    replay.add_argument("--delay", type=float, default=0.0, help="Seconds to wait between plays.")
+
+
+def _run_live(args: argparse.Namespace) -> None:
+    on_update = None if args.quiet else (lambda update: print(json.dumps(update), flush=True))
+    try:
+        live = run_live(open_feed(args.source, follow=not args.no_follow), on_update=on_update)
+    except KeyboardInterrupt:
+        return
+    print(live.snapshot().to_string(index=False))
+
+
+def _run_replay(args: argparse.Namespace) -> None:
+    plays = iter_play_records(pd.read_csv(args.pbp, low_memory=False))
+    kind, _, target = args.to.partition(":")
+    if kind == "file":
+        count = replay_to_file(plays, Path(target), delay=args.delay)
+        print(f"Wrote {count} plays to {target}")
+        return
+    if kind != "tcp":
+        raise SystemExit(f"--to must be file:<path> or tcp:<host>:<port>, got {args.to!r}")
+    host, _, port = target.rpartition(":")
+    server = serve_replay(plays, host=host or "127.0.0.1", port=int(port), delay=args.delay)
+    print(f"Replaying {args.pbp} on tcp:{host or '127.0.0.1'}:{server.server_address[1]} (Ctrl-C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+def _add_train_parser(subparsers: argparse._SubParsersAction) -> None:
+    train = subparsers.add_parser(
+        "train-model",
+        help="Train a learned conflict model on raw seasons.",
+        description=(
+            "Fit a regularised linear model on DEFAULT_SCHEMA features, optionally reporting "
+            "leave-one-season-out cross-validation first. Use the saved model with --model."
+        ),
+    )
+    train.add_argument("--seasons", nargs="+", type=int, required=True, help="Raw seasons to train on.")
+    train.add_argument("--target", choices=TARGETS, default="success", help="Outcome to learn (default: success).")
+    train.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Regularisation strength.")
+    train.add_argument("--cv", action="store_true", help="Run leave-one-season-out cross-validation.")
+    train.add_argument("--n-jobs", type=int, default=1, help="Cross-validation folds to fit in parallel.")
+    train.add_argument(
+        "--cache-dir", type=Path, default=CACHE_DIR / "folds", help="Where encoded season folds are cached."
+    )
+    train.add_argument("--output", type=Path, default=DEFAULT_MODEL_PATH, help="Path for the model JSON.")
+
+
+def _run_train(args: argparse.Namespace) -> None:
+    df_feat = engineer_basic_features(load_raw_multiple_seasons(args.seasons))
+    model = fit_conflict_model(df_feat, target=args.target, alpha=args.alpha)
+    model.metadata["seasons"] = sorted(args.seasons)
+    if args.cv:
+        cv = cross_validate_by_season(
+            df_feat, target=args.target, alpha=args.alpha, n_jobs=args.n_jobs, cache_dir=args.cache_dir
+        )
+        print(cv.to_string(index=False))
+        model.metadata["cv"] = cv.drop(columns=["season", "train_rows", "test_rows"]).mean().round(6).to_dict()
+    model.save(args.output)
+    print(f"Wrote {args.output}")
+
+
+def _add_rescore_parser(subparsers: argparse._SubParsersAction) -> None:
+    rescore = subparsers.add_parser(
+        "rescore",
+        help="Recompute conflict scores and aggregates from persisted features.",
+        description=(
+            "Re-score plays from <processed-dir>/play_features.parquet and rewrite every aggregate, "
+            "without reading raw play-by-play or re-engineering features."
+        ),
+    )
+    # SUPPRESS keeps a top-level --output-dir/--model given before "rescore".
+    rescore.add_argument(
+        "--processed-dir",
+        type=Path,
+        default=argparse.SUPPRESS,
+        help="Directory of a previous pipeline run (default: --output-dir).",
+    )
+    rescore.add_argument(
+        "--model",
+        type=Path,
+        default=argparse.SUPPRESS,
+        help="Score with a model from train-model instead of the heuristic.",
+    )
+
+
+def _run_rescore(args: argparse.Namespace) -> None:
+    processed_dir = getattr(args, "processed_dir", args.output_dir)
+    model = ConflictModel.load(args.model) if args.model else None
+    recorder = PipelineRecorder(
+        profile_dir=processed_dir / "profile" if args.profile else None,
+        log_path=args.log_json,
+    )
+    rescore_from_features(
+        processed_dir, recorder=recorder, model=model, cache_dir=None if args.no_cache else args.cache_dir
+    )
+    print(json.dumps(recorder.to_metadata(), indent=2))
+
+
+def _add_watch_parser(subparsers: argparse._SubParsersAction) -> None:
+    watch = subparsers.add_parser(
+        "watch",
+        help="Append new or changed weekly files to processed outputs as they appear.",
+        description=(
+            "Watch a directory for pbp_<season>_week_<week>.csv(.gz) files and append each new or changed "
+            "file to <processed-dir> once it has stopped changing. Uses filesystem events when watchdog is "
+            "installed and polls otherwise. Appended files are tracked in <processed-dir>/watch_manifest.json."
+        ),
+    )
+    watch.add_argument(
+        "--weekly-dir",
+        type=Path,
+        default=WEEKLY_RAW_DATA_DIR,
+        help=f"Directory to watch (default: {WEEKLY_RAW_DATA_DIR}).",
+    )
+    # Without --processed-dir, the top-level --output-dir is watched into.
+    watch.add_argument(
+        "--processed-dir",
+        type=Path,
+        default=argparse.SUPPRESS,
+        help="Processed outputs to append to (default: --output-dir).",
+    )
+    watch.add_argument(
+        "--settle",
+        type=float,
+        default=DEFAULT_SETTLE_SECONDS,
+        help="Seconds a file must go unmodified before it is read, so partial writes are skipped.",
+    )
+    watch.add_argument(
+        "--poll-interval", type=float, default=DEFAULT_POLL_SECONDS, help="Seconds between scans when polling."
+    )
+    watch.add_argument("--polling", action="store_true", help="Poll even if filesystem events are available.")
+    watch.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="Record the files already present as appended (e.g. after a base build with --latest-weeks).",
+    )
+    watch.add_argument("--once", action="store_true", help="Append whatever has settled and exit.")
+    # SUPPRESS keeps the top-level --model/--arrow when these are not repeated after "watch".
+    watch.add_argument(
+        "--model", type=Path, default=argparse.SUPPRESS, help="Score plays with a model from train-model."
+    )
+    watch.add_argument(
+        "--arrow", action="store_true", default=argparse.SUPPRESS, help="Parse weekly files with pyarrow."
+    )
+
+
+def _run_watch(args: argparse.Namespace) -> None:
+    watcher = WeeklyWatcher(
+        args.weekly_dir,
+        getattr(args, "processed_dir", args.output_dir),
+        settle=args.settle,
+        model=ConflictModel.load(args.model) if args.model else None,
+        arrow=args.arrow,
+        log_path=args.log_json,
+    )
+    if args.skip_existing:
+        print(f"Marked {watcher.mark_current()} existing files as appended")
+
+    def report(batch) -> None:
+        print(json.dumps(batch.to_dict()), flush=True)
+
+    if args.once:
+        for batch in watcher.poll():
+            report(batch)
+        return
+    print(f"Watching {args.weekly_dir} (Ctrl-C to stop)", flush=True)
+    try:
+        watcher.run(on_batch=report, poll_interval=args.poll_interval, use_events=not args.polling)
+    except KeyboardInterrupt:
+        return
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Compute Offensive Conflict Creation Index (OCCI)")
+    subparsers = parser.add_subparsers(dest="command")
+    _add_generate_parser(subparsers)
+    _add_live_parsers(subparsers)
+    _add_train_parser(subparsers)
+    _add_rescore_parser(subparsers)
+    _add_watch_parser(subparsers)
     parser.add_argument(
         "--seasons",
         nargs="+",
@@ -54,23 +327,136 @@ def main() -> None:
             "WEEKS should be a comma-separated list, e.g. 2026 1,2,3"
         ),
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run each stage under cProfile and write <output-dir>/profile/<nn>_<stage>.pstats dumps.",
+    )
+    parser.add_argument(
+        "--log-json",
+        type=Path,
+        help="Append one JSON object per finished stage (plus a run summary) to this file.",
+    )
+    parser.add_argument(
+        "--model",
+        type=Path,
+        help="Score plays with a model from train-model instead of the heuristic conflict score.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=CACHE_DIR / "stages",
+        help="Stage cache; unchanged raw files, code and parameters skip recomputation (default: data/cache/stages).",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every stage without reading the cache.")
+    parser.add_argument(
+        "--arrow",
+        action="store_true",
+        help="Parse raw CSVs with pyarrow and keep text columns Arrow-backed (same outputs, less memory).",
+    )
+    parser.add_argument(
+        "--overlap",
+        action="store_true",
+        help="Fetch, parse and score one raw file at a time in concurrent stages instead of one after another.",
+    )
+    parser.add_argument(
+        "--fetch",
+        action="store_true",
+        help="With --overlap, download raw files that are missing from data/raw from nflverse.",
+    )
     args = parser.parse_args()
+    if args.command == "generate":
+        _run_generate(args)
+        return
+    if args.command == "live":
+        _run_live(args)
+        return
+    if args.command == "replay":
+        _run_replay(args)
+        return
+    if args.command == "train-model":
+        _run_train(args)
+        return
+    if args.command == "rescore":
+        _run_rescore(args)
+        return
+    if args.command == "watch":
+        _run_watch(args)
+        return
+
+    model = ConflictModel.load(args.model) if args.model else None
+    recorder = PipelineRecorder(
+        profile_dir=args.output_dir / "profile" if args.profile else None,
+        log_path=args.log_json,
+    )
+
     if args.weekly_append:
         season = int(args.weekly_append[0])
         weeks = [int(w.strip()) for w in args.weekly_append[1].split(",") if w.strip()]
-        append_weekly_updates(args.output_dir, season=season, weeks=weeks)
+        append_weekly_updates(
+            args.output_dir, season=season, weeks=weeks, recorder=recorder, model=model, arrow=args.arrow
+        )
+        return
+
+    cache_dir = None if args.no_cache else args.cache_dir
+    if args.overlap:
+        if args.seasons:
+            sources = range_sources(args.seasons)
+            metadata = {"explicit_seasons": args.seasons}
+        else:
+            base_seasons = list(range(args.base_start, args.base_end + 1))
+            sources = range_sources(base_seasons, args.latest_season, args.latest_weeks)
+            metadata = {
+                "base_seasons": base_seasons,
+                "latest_season": args.latest_season,
+                "latest_weeks": list(args.latest_weeks or []),
+            }
+        build_overlapped(
+            sources,
+            output_dir=args.output_dir,
+            fetcher=Fetcher() if args.fetch else Fetcher(season_url=None, weekly_url=None),
+            metadata=metadata,
+            recorder=recorder,
+            model=model,
+            cache_dir=cache_dir,
+            arrow=args.arrow,
+        )
         return
 
     if args.seasons:
-        df_raw = load_raw_multiple_seasons(args.seasons)
-        run_pipeline(df_raw, output_dir=args.output_dir, metadata={"explicit_seasons": args.seasons})
+        paths = [season_raw_path(s) for s in args.seasons]
+
+        def load() -> pd.DataFrame:
+            with recorder.stage("load") as stage:
+                stage.bytes_in = file_bytes(paths)
+                df_raw = load_raw_multiple_seasons(args.seasons, arrow=args.arrow)
+                stage.output(df_raw)
+            return df_raw
+
+        run_pipeline(
+            RawFiles(paths, load),
+            output_dir=args.output_dir,
+            metadata={"explicit_seasons": args.seasons},
+            recorder=recorder,
+            model=model,
+            cache_dir=cache_dir,
+        )
         return
 
     base_seasons = range(args.base_start, args.base_end + 1)
     latest_season = args.latest_season
     latest_weeks = args.latest_weeks
 
-    build_from_ranges(base_seasons, latest_season=latest_season, latest_weeks=latest_weeks, output_dir=args.output_dir)
+    build_from_ranges(
+        base_seasons,
+        latest_season=latest_season,
+        latest_weeks=latest_weeks,
+        output_dir=args.output_dir,
+        recorder=recorder,
+        model=model,
+        cache_dir=cache_dir,
+        arrow=args.arrow,
+    )
 
 
 if __name__ == "__main__":
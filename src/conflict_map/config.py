@@ -7,3 +7,6 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 RAW_DATA_DIR = PROJECT_ROOT / "data" / "raw"
 PROCESSED_DATA_DIR = PROJECT_ROOT / "data" / "processed"
 WEEKLY_RAW_DATA_DIR = RAW_DATA_DIR / "weekly"
+CACHE_DIR = PROJECT_ROOT / "data" / "cache"
+MODEL_DIR = PROJECT_ROOT / "models"
+DEFAULT_MODEL_PATH = MODEL_DIR / "conflict_model.json"
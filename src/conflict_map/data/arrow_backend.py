@@ -0,0 +1,107 @@
+"""
+Opt-in Arrow-backed loading of raw play by play.
+
+``read_csv_arrow`` parses a raw CSV with pyarrow's multithreaded reader and
+keeps text columns in Arrow memory: low-cardinality ones (teams, play types,
+game ids, penalty types, ...) as ``ArrowDtype`` dictionaries, the rest (play
+descriptions, player ids) as ``ArrowDtype`` strings. Numeric and boolean
+columns come back as exactly the NumPy dtypes ``pd.read_csv`` would give, NaN
+included, so every computation downstream sees the same numbers and the
+pipeline writes the same outputs as on the default path.
+
+String columns already work through the pipeline's own operations (``isin``,
+``fillna``, factorizing, ``CategoryEncoder``); ``plain_strings`` turns them
+back into object columns where a writer needs plain values.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+# pandas' default ``na_values``, so the same cells are missing on both paths.
+PANDAS_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+# Text columns with at most this share of distinct values are dictionary-encoded.
+DICTIONARY_RATIO = 0.5
+
+
+def _is_text(dtype: pa.DataType) -> bool:
+    return pa.types.is_string(dtype) or pa.types.is_large_string(dtype)
+
+
+def _numpy_column(column: pa.ChunkedArray) -> np.ndarray:
+    """A non-text column as the C parser would type it."""
+    if pa.types.is_null(column.type):
+        return np.full(len(column), np.nan)
+    values = column.to_numpy(zero_copy_only=False)
+    if pa.types.is_boolean(column.type) and column.null_count:
+        # A bool column with gaps is object True/False/NaN in pandas.
+        values = values.astype(object)
+        values[pd.isna(values)] = np.nan
+    elif pa.types.is_floating(column.type):
+        values = values.astype(np.float64, copy=False)
+    return values
+
+
+def _arrow_text(column: pa.ChunkedArray) -> pd.api.extensions.ExtensionArray:
+    if pc.count_distinct(column).as_py() <= DICTIONARY_RATIO * max(len(column), 1):
+        column = pc.dictionary_encode(column)
+    return pd.array(column, dtype=pd.ArrowDtype(column.type))
+
+
+def arrow_frame(table: pa.Table) -> pd.DataFrame:
+    """Text columns as ``ArrowDtype``, everything else as NumPy."""
+    columns = {}
+    for field in table.schema:
+        column = table.column(field.name)
+        columns[field.name] = _arrow_text(column) if _is_text(field.type) else _numpy_column(column)
+    return pd.DataFrame(columns)
+
+
+def read_csv_arrow(path: Path) -> pd.DataFrame:
+    """Read a raw CSV (plain or gzipped) with pyarrow; see the module docstring.
+
+    Dates and times stay text as in ``pd.read_csv``. If pyarrow's type
+    inference on the first block is contradicted later in the file, the file
+    is parsed by pandas instead and only its text columns are converted.
+    """
+    convert = pacsv.ConvertOptions(null_values=PANDAS_NA_VALUES, strings_can_be_null=True)
+    try:
+        table = pacsv.read_csv(path, convert_options=convert)
+        temporal = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+        if temporal:
+            convert.column_types = {col: pa.string() for col in temporal}
+            table = pacsv.read_csv(path, convert_options=convert)
+    except pa.ArrowInvalid:
+        return arrow_strings(pd.read_csv(path))
+    return arrow_frame(table)
+
+
+def arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the text columns of a pandas-parsed frame to ``ArrowDtype``."""
+    converted = {}
+    for col in df.columns:
+        values = df[col]
+        if values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+            array = pa.array(values.to_numpy(dtype=object, na_value=None), from_pandas=True)
+            if _is_text(array.type):
+                converted[col] = _arrow_text(pa.chunked_array([array]))
+    return df.assign(**converted) if converted else df
+
+
+def plain_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Turn ``ArrowDtype`` text columns back into object columns with NaN for missing."""
+    converted = {
+        col: pd.Series(df[col].to_numpy(dtype=object, na_value=np.nan), index=df.index, name=col)
+        for col in df.columns
+        if isinstance(df[col].dtype, pd.ArrowDtype)
+        and (_is_text(df[col].dtype.pyarrow_dtype) or pa.types.is_dictionary(df[col].dtype.pyarrow_dtype))
+    }
+    return df.assign(**converted) if converted else df
@@ -5,9 +5,14 @@ This module defines utilities to place CSV files in ``data/raw``. The default
 ``download_season`` is left as a TODO because the project intentionally avoids
 shipping a brittle or rate-limited source—swap in your preferred public
 endpoint (e.g., nflfastR exports) and keep it fully unauthenticated.
+
+Downloads stream to a hidden temporary file next to the target and are renamed
+into place when complete, so a failed or interrupted download never leaves a
+partial ``pbp_*`` file behind (and the ``watch`` command never sees one).
 """
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Iterable
 import requests
@@ -15,6 +20,9 @@ import requests
 from ..config import RAW_DATA_DIR
 
 DATA_DIR = RAW_DATA_DIR
+SEASON_URL = "https://github.com/nflverse/nflverse-data/releases/download/pbp/pbp_{season}.csv.gz"
+WEEKLY_URL = "https://github.com/nflverse/nflverse-data/releases/download/pbp_weekly/pbp_{season}_{week}.csv.gz"
+_DOWNLOAD_CHUNK = 1 << 20
 
 
 def ensure_data_dir() -> None:
@@ -22,26 +30,41 @@ def ensure_data_dir() -> None:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def download_season(season: int) -> Path:
+def fetch_file(url: str, target: Path, timeout: float = 60) -> Path:
+    """Stream ``url`` to ``target`` through a temporary file and return ``target``."""
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.part")
+    try:
+        with requests.get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            with tmp.open("wb") as handle:
+                for chunk in response.iter_content(_DOWNLOAD_CHUNK):
+                    handle.write(chunk)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return target
+
+
+def download_season(season: int, data_dir: Path | None = None, url: str = SEASON_URL) -> Path:
     """
     Download play by play data for a given season into DATA_DIR.
 
     Returns the local path to the downloaded CSV.
     """
-    ensure_data_dir()
-    url = f"https://github.com/nflverse/nflverse-data/releases/download/pbp/pbp_{season}.csv.gz"
-    response = requests.get(url, timeout=60)
-    response.raise_for_status()
-    target = DATA_DIR / f"pbp_{season}.csv.gz"
-    target.write_bytes(response.content)
-    return target
+    if data_dir is None:
+        ensure_data_dir()
+    target = (data_dir or DATA_DIR) / f"pbp_{season}.csv.gz"
+    return fetch_file(url.format(season=season), target)
 
 
 def download_multiple_seasons(seasons: Iterable[int]) -> list[Path]:
     """
     Download multiple seasons of data.
 
-    Returns a list of CSV paths.
+    Returns a list of CSV paths. To parse and score seasons while later ones
+    are still downloading, use ``conflict_map.pipeline.overlap`` instead.
     """
     paths: list[Path] = []
     for season in seasons:
@@ -49,7 +72,7 @@ def download_multiple_seasons(seasons: Iterable[int]) -> list[Path]:
     return paths
 
 
-def download_weekly(season: int, week: int) -> Path:
+def download_weekly(season: int, week: int, weekly_dir: Path | None = None, url: str = WEEKLY_URL) -> Path:
     """Download a single week of play by play into ``data/raw/weekly``.
 
     This keeps in-progress seasons lightweight while still enabling the
@@ -57,11 +80,5 @@ def download_weekly(season: int, week: int) -> Path:
     convention ``pbp_<season>_<week>.csv.gz`` under the pbp_weekly release.
     """
 
-    weekly_dir = DATA_DIR / "weekly"
-    weekly_dir.mkdir(parents=True, exist_ok=True)
-    url = f"https://github.com/nflverse/nflverse-data/releases/download/pbp_weekly/pbp_{season}_{week}.csv.gz"
-    response = requests.get(url, timeout=60)
-    response.raise_for_status()
-    target = weekly_dir / f"pbp_{season}_week_{week}.csv.gz"
-    target.write_bytes(response.content)
-    return target
+    target = (weekly_dir or DATA_DIR / "weekly") / f"pbp_{season}_week_{week}.csv.gz"
+    return fetch_file(url.format(season=season, week=week), target)
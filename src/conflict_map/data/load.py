@@ -9,6 +9,7 @@ from typing import Iterable, Sequence
 import pandas as pd
 
 from ..config import RAW_DATA_DIR
+from .arrow_backend import read_csv_arrow
 from .download import DATA_DIR
 
 
@@ -20,30 +21,49 @@ def _resolve_raw_path(base_dir: Path, stem: str) -> Path:
     raise FileNotFoundError(f"{base_dir / (stem + '.csv')} does not exist. Download it first.")
 
 
-def load_raw_season(season: int, data_dir: Path | None = None) -> pd.DataFrame:
+def season_raw_path(season: int, data_dir: Path | None = None) -> Path:
+    """Return the CSV (or gzipped CSV) backing ``season``."""
+    return _resolve_raw_path(data_dir or DATA_DIR, f"pbp_{season}")
+
+
+def weekly_raw_paths(season: int, weeks: Sequence[int], weekly_dir: Path | None = None) -> list[Path]:
+    """Return the weekly CSVs backing ``weeks`` of ``season``."""
+    base_dir = weekly_dir or (RAW_DATA_DIR / "weekly")
+    return [_resolve_raw_path(base_dir, f"pbp_{season}_week_{week}") for week in weeks]
+
+
+def read_raw_csv(csv_path: Path, arrow: bool = False) -> pd.DataFrame:
+    """Read one raw CSV, with the pyarrow reader and Arrow-backed text columns if ``arrow``."""
+    return read_csv_arrow(csv_path) if arrow else pd.read_csv(csv_path)
+
+
+def load_raw_season(season: int, data_dir: Path | None = None, arrow: bool = False) -> pd.DataFrame:
     """
     Load a single season of raw play by play data from DATA_DIR.
 
     The function should:
     - Read the corresponding CSV into a DataFrame.
     - Perform minimal cleaning (standardize column names, parse datatypes).
+
+    See ``conflict_map.data.arrow_backend`` for ``arrow``.
     """
-    base_dir = data_dir or DATA_DIR
-    csv_path = _resolve_raw_path(base_dir, f"pbp_{season}")
-    df = pd.read_csv(csv_path)
+    csv_path = season_raw_path(season, data_dir)
+    df = read_raw_csv(csv_path, arrow=arrow)
     return df
 
 
-def load_raw_multiple_seasons(seasons: Iterable[int], data_dir: Path | None = None) -> pd.DataFrame:
+def load_raw_multiple_seasons(
+    seasons: Iterable[int], data_dir: Path | None = None, arrow: bool = False
+) -> pd.DataFrame:
     """
     Load and concatenate multiple seasons of raw play by play data.
     """
-    frames = [load_raw_season(s, data_dir=data_dir) for s in seasons]
+    frames = [load_raw_season(s, data_dir=data_dir, arrow=arrow) for s in seasons]
     return pd.concat(frames, ignore_index=True)
 
 
 def load_weekly_updates(
-    season: int, weeks: Sequence[int], weekly_dir: Path | None = None
+    season: int, weeks: Sequence[int], weekly_dir: Path | None = None, arrow: bool = False
 ) -> pd.DataFrame:
     """Load weekly play-by-play CSVs for an in-progress season.
 
@@ -51,10 +71,8 @@ def load_weekly_updates(
     pattern ``pbp_<season>_week_<week>.csv`` or ``.csv.gz``.
     """
 
-    base_dir = weekly_dir or (RAW_DATA_DIR / "weekly")
     frames: list[pd.DataFrame] = []
-    for week in weeks:
-        csv_path = _resolve_raw_path(base_dir, f"pbp_{season}_week_{week}")
-        frames.append(pd.read_csv(csv_path))
+    for csv_path in weekly_raw_paths(season, weeks, weekly_dir):
+        frames.append(read_raw_csv(csv_path, arrow=arrow))
 
     return pd.concat(frames, ignore_index=True)
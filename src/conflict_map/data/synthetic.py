@@ -0,0 +1,386 @@
+"""
+Synthetic nflverse-style play by play for offline scale and load testing.
+
+Games are simulated drive by drive with a small down-and-distance state
+machine that is vectorized across every game of a week, so the joint
+distributions of the columns used by ``engineer_basic_features`` and the
+legacy ``OCCICalculator`` (down/distance/field position, pass rate, shotgun,
+personnel, air yards, penalties, EPA, drives and series) hang together the way
+they do in real data.
+
+Output is generated one week at a time from a random stream seeded by
+``(seed, season, week)``. A week is therefore identical whether it is written
+into a season file or as a standalone weekly file, and arbitrarily many
+seasons can be streamed to disk without holding more than one week in memory.
+"""
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+NFL_TEAMS = [
+    "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE",
+    "DAL", "DEN", "DET", "GB", "HOU", "IND", "JAX", "KC",
+    "LA", "LAC", "LV", "MIA", "MIN", "NE", "NO", "NYG",
+    "NYJ", "PHI", "PIT", "SEA", "SF", "TB", "TEN", "WAS",
+]
+REGULAR_SEASON_WEEKS = 18
+GAME_SECONDS = 3600
+HALF_SECONDS = 1800
+
+COLUMNS = [
+    "play_id", "game_id", "season", "week", "season_type", "home_team", "away_team",
+    "posteam", "defteam", "play_type", "qtr", "game_seconds_remaining", "drive", "series",
+    "down", "ydstogo", "yardline_100", "posteam_score", "defteam_score", "score_differential",
+    "shotgun", "no_huddle", "qb_dropback", "pass_attempt", "rush_attempt", "air_yards",
+    "yards_gained", "pass_location", "personnel_offense", "motion", "play_action",
+    "penalty", "penalty_type", "first_down", "touchdown", "interception", "fumble_lost",
+    "epa", "success",
+]
+
+PERSONNEL = np.array(
+    ["1 RB, 1 TE, 3 WR", "1 RB, 2 TE, 2 WR", "2 RB, 1 TE, 2 WR", "0 RB, 1 TE, 4 WR", "1 RB, 3 TE, 1 WR", "2 RB, 2 TE, 1 WR"]
+)
+PERSONNEL_CUM_PASS = np.cumsum([0.72, 0.15, 0.03, 0.07, 0.02, 0.01])
+PERSONNEL_CUM_RUN = np.cumsum([0.48, 0.27, 0.12, 0.01, 0.07, 0.05])
+
+DEFENSIVE_PENALTIES_PASS = np.array(["Defensive Pass Interference", "Defensive Holding", "Illegal Contact", "Roughing the Passer"])
+DEFENSIVE_PENALTIES_RUN = np.array(["Defensive Holding", "Defensive Offside", "Unnecessary Roughness"])
+OFFENSIVE_PENALTIES = np.array(["Offensive Holding", "False Start", "Delay of Game"])
+PENALTY_YARDS = {
+    "Defensive Pass Interference": 0,  # spot foul, filled in from air yards
+    "Defensive Holding": 5,
+    "Illegal Contact": 5,
+    "Roughing the Passer": 15,
+    "Defensive Offside": 5,
+    "Unnecessary Roughness": 15,
+    "Offensive Holding": -10,
+    "False Start": -5,
+    "Delay of Game": -5,
+}
+PRE_SNAP_PENALTIES = {"False Start", "Delay of Game", "Defensive Offside"}
+LOCATIONS = np.array(["left", "middle", "right"])
+
+
+def team_abbreviations(num_teams: int = 32) -> list[str]:
+    """Return ``num_teams`` abbreviations: the real 32 clubs, then ``X033``, ``X034``..."""
+    if num_teams < 2 or num_teams % 2:
+        raise ValueError("num_teams must be an even number >= 2")
+    extra = [f"X{i:03d}" for i in range(len(NFL_TEAMS) + 1, num_teams + 1)]
+    return (NFL_TEAMS + extra)[:num_teams]
+
+
+def _expected_points(yardline_100: np.ndarray, down: np.ndarray, ydstogo: np.ndarray) -> np.ndarray:
+    """Crude expected-points curve, good enough to make EPA track success."""
+    return 6.2 - 0.072 * yardline_100 - 0.35 * (down - 1) - 0.04 * (ydstogo - 10)
+
+
+def _pick_rows(rng: np.random.Generator, options: np.ndarray, n: int) -> np.ndarray:
+    return options[rng.integers(0, len(options), size=n)]
+
+
+def simulate_week(
+    season: int,
+    week: int,
+    seed: int = 0,
+    num_teams: int = 32,
+) -> pd.DataFrame:
+    """Simulate every game of one week and return nflverse-style rows.
+
+    The schedule, play calls and outcomes are drawn from a generator seeded by
+    ``(seed, season, week)`` so the same arguments always produce the same frame.
+    """
+    rng = np.random.default_rng([seed, season, week])
+    teams = np.asarray(team_abbreviations(num_teams))
+    pairs = rng.permutation(num_teams).reshape(-1, 2)
+    home, away = teams[pairs[:, 0]], teams[pairs[:, 1]]
+    n_games = len(pairs)
+    game_ids = np.array([f"{season}_{week:02d}_{a}_{h}" for a, h in zip(away, home)])
+
+    # Per-game state.
+    first_receiver_home = rng.random(n_games) < 0.5
+    pos_home = first_receiver_home.copy()
+    kickoff_pending = np.ones(n_games, dtype=bool)
+    second_half = np.zeros(n_games, dtype=bool)
+    down = np.ones(n_games, dtype=int)
+    togo = np.full(n_games, 10)
+    yardline = np.full(n_games, 75)
+    home_score = np.zeros(n_games, dtype=int)
+    away_score = np.zeros(n_games, dtype=int)
+    drive = np.zeros(n_games, dtype=int)
+    series = np.zeros(n_games, dtype=int)
+    elapsed = np.zeros(n_games, dtype=int)
+    play_id = np.ones(n_games, dtype=int)
+
+    chunks: list[dict[str, np.ndarray]] = []
+    step = 0
+    while True:
+        # Second-half kickoff goes to whoever kicked to open the game.
+        halftime = ~second_half & (elapsed >= HALF_SECONDS) & (elapsed < GAME_SECONDS)
+        if halftime.any():
+            second_half |= halftime
+            kickoff_pending |= halftime
+            pos_home = np.where(halftime, ~first_receiver_home, pos_home)
+
+        active = np.flatnonzero(elapsed < GAME_SECONDS)
+        if active.size == 0:
+            break
+
+        g = active
+        n = g.size
+        is_kick = kickoff_pending[g]
+        remaining = GAME_SECONDS - elapsed[g]
+        two_minute = (remaining % HALF_SECONDS <= 120) | (remaining <= 120)
+        off_score = np.where(pos_home[g], home_score[g], away_score[g])
+        def_score = np.where(pos_home[g], away_score[g], home_score[g])
+        score_diff = off_score - def_score
+
+        cur_down, cur_togo, cur_yl = down[g], togo[g], yardline[g]
+        fourth = ~is_kick & (cur_down == 4)
+        field_goal = fourth & (cur_yl <= 37)
+        go_for_it = fourth & ~field_goal & (cur_togo <= 2) & (cur_yl <= 55) & (rng.random(n) < 0.6)
+        punt = fourth & ~field_goal & ~go_for_it
+        scrimmage = ~is_kick & ~field_goal & ~punt
+
+        pass_prob = (
+            0.56
+            - 0.08 * (cur_down == 1)
+            + 0.22 * ((cur_down >= 3) & (cur_togo >= 5))
+            - 0.15 * ((cur_down >= 3) & (cur_togo <= 2))
+            + 0.15 * (two_minute & (score_diff <= 0))
+            + 0.12 * (score_diff <= -9)
+            - 0.12 * ((score_diff >= 9) & (remaining < 900))
+        )
+        is_pass = scrimmage & (rng.random(n) < pass_prob)
+        is_run = scrimmage & ~is_pass
+
+        shotgun = scrimmage & (rng.random(n) < np.where(is_pass, 0.86, 0.42))
+        no_huddle = scrimmage & (rng.random(n) < np.where(two_minute, 0.55, 0.06))
+        scramble = is_pass & (rng.random(n) < 0.035)
+        play_action = is_pass & ~scramble & (rng.random(n) < np.where(shotgun, 0.16, 0.38))
+        motion = scrimmage & (rng.random(n) < np.where(no_huddle, 0.2, 0.48))
+        personnel_idx = (rng.random(n)[:, None] > np.where(is_pass[:, None], PERSONNEL_CUM_PASS, PERSONNEL_CUM_RUN)).sum(axis=1)
+        personnel_idx = np.minimum(personnel_idx, len(PERSONNEL) - 1)
+
+        throw = is_pass & ~scramble
+        depth_boost = np.where((cur_down >= 3) & (cur_togo >= 7), 4.0, 0.0)
+        air_yards = np.where(throw, np.round(rng.gamma(1.5, 5.5, size=n) - 3.0 + depth_boost), np.nan)
+        air_yards = np.minimum(air_yards, cur_yl)
+        complete = throw & (rng.random(n) < np.clip(0.76 - 0.011 * np.nan_to_num(air_yards), 0.3, 0.85))
+        interception = throw & ~complete & (rng.random(n) < 0.06)
+        yac = np.round(rng.gamma(1.2, 4.0, size=n))
+        run_yards = np.round(rng.normal(3.8, 4.2, size=n) + (rng.random(n) < 0.04) * rng.gamma(2.0, 10.0, size=n))
+        gained = np.where(complete, np.nan_to_num(air_yards) + yac, 0.0)
+        gained = np.where(is_run | scramble, np.maximum(run_yards, -6), gained)
+        fumble_lost = (is_run | complete) & (rng.random(n) < 0.007)
+
+        penalty = scrimmage & (rng.random(n) < 0.07)
+        defensive = penalty & (rng.random(n) < 0.55)
+        offensive = penalty & ~defensive
+        penalty_type = np.full(n, None, dtype=object)
+        penalty_type[defensive & is_pass] = _pick_rows(rng, DEFENSIVE_PENALTIES_PASS, int((defensive & is_pass).sum()))
+        penalty_type[defensive & is_run] = _pick_rows(rng, DEFENSIVE_PENALTIES_RUN, int((defensive & is_run).sum()))
+        penalty_type[offensive] = _pick_rows(rng, OFFENSIVE_PENALTIES, int(offensive.sum()))
+        penalty_yards = np.array([PENALTY_YARDS.get(p, 0) if p else 0 for p in penalty_type], dtype=float)
+        dpi = penalty_type == "Defensive Pass Interference"
+        penalty_yards = np.where(dpi, np.maximum(np.nan_to_num(air_yards), 1), penalty_yards)
+        pre_snap = np.isin(penalty_type, list(PRE_SNAP_PENALTIES))
+        automatic_first = defensive & ~pre_snap
+
+        # Penalties replace the play result.
+        gained = np.where(penalty, penalty_yards, gained)
+        complete &= ~penalty
+        interception &= ~penalty
+        fumble_lost &= ~penalty
+        gained = np.minimum(gained, cur_yl)
+        gained = np.maximum(gained, cur_yl - 99)
+
+        new_yl = cur_yl - gained
+        touchdown = scrimmage & ~interception & ~fumble_lost & ~penalty & (new_yl <= 0)
+        converted = scrimmage & ~touchdown & ((gained >= cur_togo) | automatic_first)
+        turnover = interception | fumble_lost
+        downs_turnover = scrimmage & ~touchdown & ~converted & ~turnover & ~penalty & (cur_down == 4)
+
+        fg_good = field_goal & (rng.random(n) < np.clip(1.05 - 0.012 * (cur_yl + 17), 0.35, 0.99))
+        punt_net = np.round(rng.normal(42, 7, size=n))
+        punt_spot = np.where(cur_yl - punt_net <= 0, 80, 100 - (cur_yl - punt_net))
+
+        ep_before = _expected_points(cur_yl, cur_down, cur_togo)
+        next_down = np.where(converted, 1, np.where(penalty & ~automatic_first, cur_down, cur_down + 1))
+        next_togo = np.where(converted, np.minimum(10, np.maximum(new_yl, 1)), cur_togo - gained)
+        next_togo = np.maximum(next_togo, 1)
+        ep_after = _expected_points(np.clip(new_yl, 1, 99), np.minimum(next_down, 4), next_togo)
+        opp_yl_turnover = np.clip(100 - new_yl, 1, 99)
+        epa = ep_after - ep_before
+        epa = np.where(touchdown, 7 - ep_before, epa)
+        epa = np.where(turnover | downs_turnover, -_expected_points(opp_yl_turnover, 1, 10) - ep_before, epa)
+        epa = np.where(punt, -_expected_points(punt_spot, 1, 10) - ep_before, epa)
+        epa = np.where(field_goal & fg_good, 3 - ep_before, epa)
+        epa = np.where(
+            field_goal & ~fg_good, -_expected_points(np.clip(100 - (cur_yl + 7), 1, 80), 1, 10) - ep_before, epa
+        )
+        epa = np.where(is_kick, 0.0, np.round(epa, 3))
+
+        play_type = np.select(
+            [is_kick, field_goal, punt, penalty & pre_snap, is_pass, is_run],
+            ["kickoff", "field_goal", "punt", "no_play", "pass", "run"],
+            default="no_play",
+        )
+        posteam = np.where(pos_home[g], home[g], away[g])
+        defteam = np.where(pos_home[g], away[g], home[g])
+        counted = scrimmage & ~(penalty & pre_snap)
+
+        chunks.append(
+            {
+                "_game": g,
+                "_step": np.full(n, step),
+                "play_id": play_id[g].copy(),
+                "posteam": posteam,
+                "defteam": defteam,
+                "play_type": play_type,
+                "qtr": np.minimum(4, 1 + elapsed[g] // 900),
+                "game_seconds_remaining": remaining,
+                "drive": np.where(is_kick, drive[g] + 1, drive[g]),
+                "series": np.where(is_kick, series[g] + 1, series[g]),
+                "down": np.where(is_kick, np.nan, cur_down.astype(float)),
+                "ydstogo": np.where(is_kick, np.nan, cur_togo.astype(float)),
+                "yardline_100": np.where(is_kick, 35.0, cur_yl.astype(float)),
+                "posteam_score": off_score,
+                "defteam_score": def_score,
+                "score_differential": score_diff,
+                "shotgun": shotgun.astype(int),
+                "no_huddle": no_huddle.astype(int),
+                "qb_dropback": (is_pass & counted).astype(int),
+                "pass_attempt": (throw & counted).astype(int),
+                "rush_attempt": ((is_run | scramble) & counted & ~throw).astype(int),
+                "air_yards": np.where(counted, air_yards, np.nan),
+                "yards_gained": np.where(scrimmage & ~penalty, gained, 0.0),
+                "pass_location": np.where(throw & counted, _pick_rows(rng, LOCATIONS, n), None),
+                "personnel_offense": np.where(scrimmage, PERSONNEL[personnel_idx], None),
+                "motion": motion.astype(int),
+                "play_action": play_action.astype(int),
+                "penalty": penalty.astype(int),
+                "penalty_type": penalty_type,
+                "first_down": converted.astype(int),
+                "touchdown": touchdown.astype(int),
+                "interception": interception.astype(int),
+                "fumble_lost": fumble_lost.astype(int),
+                "epa": epa,
+                "success": (epa > 0).astype(int),
+            }
+        )
+
+        # Advance the state machine.
+        scoring_home = np.where(touchdown, pos_home[g], False)
+        scoring_away = np.where(touchdown, ~pos_home[g], False)
+        home_score[g] += 7 * scoring_home + 3 * (fg_good & pos_home[g])
+        away_score[g] += 7 * scoring_away + 3 * (fg_good & ~pos_home[g])
+
+        possession_change = touchdown | turnover | downs_turnover | punt | field_goal
+        # Kickoffs start a new drive for the receiving team.
+        drive[g] += is_kick
+        series[g] += is_kick | converted
+        down[g] = np.where(is_kick, 1, np.where(scrimmage, next_down, down[g]))
+        togo[g] = np.where(is_kick, 10, np.where(scrimmage, next_togo, togo[g]))
+        yardline[g] = np.where(is_kick, 75, np.where(scrimmage, new_yl, yardline[g]))
+        kickoff_pending[g] = np.where(is_kick, False, touchdown | (field_goal & fg_good))
+
+        flip = possession_change & ~(touchdown | (field_goal & fg_good))
+        new_spot = np.where(punt, punt_spot, np.where(field_goal, np.clip(100 - (cur_yl + 7), 1, 80), opp_yl_turnover))
+        yardline[g] = np.where(flip, new_spot, yardline[g])
+        down[g] = np.where(flip, 1, down[g])
+        togo[g] = np.where(flip, 10, togo[g])
+        drive[g] += flip
+        series[g] += flip
+        pos_home[g] = np.where(possession_change, ~pos_home[g], pos_home[g])
+
+        clock = np.where(is_kick | field_goal | punt, 6, np.where(throw & ~complete, 6, 36))
+        clock = np.where(no_huddle, np.minimum(clock, 16), clock)
+        clock = np.where(penalty & pre_snap, 0, clock) + rng.integers(0, 5, size=n)
+        elapsed[g] += clock
+        play_id[g] += rng.integers(18, 40, size=n)
+        step += 1
+
+    columns = {key: np.concatenate([c[key] for c in chunks]) for key in chunks[0]}
+    order = np.lexsort((columns.pop("_step"), columns["_game"]))
+    game = columns.pop("_game")[order]
+    df = pd.DataFrame({key: values[order] for key, values in columns.items()})
+    df["game_id"] = game_ids[game]
+    df["season"] = season
+    df["week"] = week
+    df["season_type"] = "REG"
+    df["home_team"] = home[game]
+    df["away_team"] = away[game]
+    return df[COLUMNS]
+
+
+def iter_synthetic_weeks(
+    seasons: Iterable[int],
+    weeks: Sequence[int] | None = None,
+    seed: int = 0,
+    num_teams: int = 32,
+) -> Iterator[pd.DataFrame]:
+    """Yield one simulated week at a time for every season and week requested."""
+    week_list = list(weeks) if weeks else list(range(1, REGULAR_SEASON_WEEKS + 1))
+    for season in seasons:
+        for week in week_list:
+            yield simulate_week(season, week, seed=seed, num_teams=num_teams)
+
+
+def generate_season(
+    season: int,
+    weeks: Sequence[int] | None = None,
+    seed: int = 0,
+    num_teams: int = 32,
+) -> pd.DataFrame:
+    """Return a full synthetic season in memory (convenient for tests and fixtures)."""
+    return pd.concat(
+        iter_synthetic_weeks([season], weeks=weeks, seed=seed, num_teams=num_teams), ignore_index=True
+    )
+
+
+def _write_frames(frames: Iterable[pd.DataFrame], path: Path) -> int:
+    """Stream frames into one CSV (gzipped when the name ends in ``.gz``)."""
+    rows = 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    opener = gzip.open(path, "wt", compresslevel=6, newline="") if path.suffix == ".gz" else open(path, "w", newline="")
+    with opener as handle:
+        for i, frame in enumerate(frames):
+            frame.to_csv(handle, header=i == 0, index=False)
+            rows += len(frame)
+    return rows
+
+
+def write_synthetic_season(
+    season: int,
+    output_dir: Path,
+    weeks: Sequence[int] | None = None,
+    seed: int = 0,
+    num_teams: int = 32,
+    compress: bool = True,
+) -> Path:
+    """Write ``pbp_<season>.csv(.gz)`` week by week without materialising the season."""
+    target = output_dir / f"pbp_{season}.csv{'.gz' if compress else ''}"
+    _write_frames(iter_synthetic_weeks([season], weeks=weeks, seed=seed, num_teams=num_teams), target)
+    return target
+
+
+def write_synthetic_weekly(
+    season: int,
+    weeks: Sequence[int],
+    weekly_dir: Path,
+    seed: int = 0,
+    num_teams: int = 32,
+    compress: bool = True,
+) -> list[Path]:
+    """Write ``pbp_<season>_week_<week>.csv(.gz)`` files matching ``load_weekly_updates``."""
+    paths: list[Path] = []
+    for week in weeks:
+        target = weekly_dir / f"pbp_{season}_week_{week}.csv{'.gz' if compress else ''}"
+        _write_frames([simulate_week(season, week, seed=seed, num_teams=num_teams)], target)
+        paths.append(target)
+    return paths
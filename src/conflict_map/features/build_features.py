@@ -3,10 +3,70 @@ Transform raw play by play into model ready features and labels for conflict sco
 """
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from .schema import DEFAULT_SCHEMA, FeatureSchema
 
+PERSONNEL_PATTERN = r"(?P<num_rb>\d) RB, (?P<num_te>\d) TE, (?P<num_wr>\d) WR"
+TARGET_DEPTH_BINS = [-20, 0, 10, 20, 80]
+TARGET_DEPTH_LABELS = ["behind_or_short", "short", "intermediate", "deep"]
+STRESS_PENALTIES = {"Defensive Pass Interference", "Illegal Contact", "Defensive Holding"}
+
+
+def situation_masks(down, ydstogo, yardline_100) -> tuple[np.ndarray, np.ndarray]:
+    """``(red_zone, third_and_medium)`` masks from float arrays; NaN never matches.
+
+    This is the only definition of the two leverage buckets: the feature
+    builder, ``classify_situation`` and the one-pass engine all call it.
+    Red zone wins when both apply.
+    """
+    red_zone = yardline_100 <= 20
+    third_and_medium = ~red_zone & (down == 3) & (ydstogo >= 3) & (ydstogo <= 7)
+    return red_zone, third_and_medium
+
+
+def stress_penalty_flags(df: pd.DataFrame) -> np.ndarray:
+    """True where ``penalty_type`` is one of ``STRESS_PENALTIES``; all False without the column."""
+    if "penalty_type" not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    return df["penalty_type"].isin(STRESS_PENALTIES).to_numpy(dtype=bool)
+
+
+def classify_situation(row) -> str:
+    """Situation bucket for one play (a Series or a plain mapping)."""
+    down, ydstogo, yardline = np.array(
+        [[row.get("down", 0)], [row.get("ydstogo", 0)], [row.get("yardline_100", 100)]], dtype=float
+    )
+    red_zone, third_and_medium = situation_masks(down, ydstogo, yardline)
+    if red_zone[0]:
+        return "red_zone"
+    if third_and_medium[0]:
+        return "third_and_medium"
+    return "normal"
+
+
+def _float_values(df: pd.DataFrame, col: str, default: float) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), default, dtype=float)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+def parse_personnel_counts(personnel: pd.Series) -> pd.DataFrame:
+    """``num_rb``/``num_te``/``num_wr`` ints from personnel strings (0 when unparsable).
+
+    There are only a few dozen distinct personnel strings, so the regex runs
+    on the unique values and the counts are gathered back by code.
+    """
+    codes, uniques = pd.factorize(personnel)
+    parts = pd.Series(uniques, dtype=object).str.extract(PERSONNEL_PATTERN)
+    counts = {}
+    for col in ["num_rb", "num_te", "num_wr"]:
+        per_label = pd.to_numeric(parts[col], errors="coerce").fillna(0).astype(int).to_numpy()
+        # Append a 0 for code -1 (missing personnel).
+        counts[col] = np.append(per_label, 0)[codes]
+    return pd.DataFrame(counts, index=personnel.index)
+
 
 def engineer_basic_features(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -23,11 +83,9 @@ def engineer_basic_features(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
 
     if "personnel_offense" in df.columns:
-        parts = df["personnel_offense"].str.extract(
-            r"(?P<num_rb>\d) RB, (?P<num_te>\d) TE, (?P<num_wr>\d) WR"
-        )
+        counts = parse_personnel_counts(df["personnel_offense"])
         for col in ["num_rb", "num_te", "num_wr"]:
-            df[col] = pd.to_numeric(parts[col], errors="coerce").fillna(0).astype(int)
+            df[col] = counts[col]
     else:
         df["num_rb"] = 0
         df["num_te"] = 0
@@ -48,8 +106,8 @@ def engineer_basic_features(df: pd.DataFrame) -> pd.DataFrame:
         df["target_air_yards"] = df["air_yards"].fillna(0)
         df["target_depth_bucket"] = pd.cut(
             df["target_air_yards"],
-            bins=[-20, 0, 10, 20, 80],
-            labels=["behind_or_short", "short", "intermediate", "deep"],
+            bins=TARGET_DEPTH_BINS,
+            labels=TARGET_DEPTH_LABELS,
         )
     else:
         df["target_air_yards"] = 0.0
@@ -65,23 +123,14 @@ def engineer_basic_features(df: pd.DataFrame) -> pd.DataFrame:
     else:
         df["score_diff"] = 0
 
-    def classify_situation(row: pd.Series) -> str:
-        down = row.get("down", 0)
-        ydstogo = row.get("ydstogo", 0)
-        yardline = row.get("yardline_100", 100)
-        if yardline <= 20:
-            return "red_zone"
-        if down == 3 and 3 <= ydstogo <= 7:
-            return "third_and_medium"
-        return "normal"
-
-    df["situation_bucket"] = df.apply(classify_situation, axis=1)
-
-    stress_penalties = {"Defensive Pass Interference", "Illegal Contact", "Defensive Holding"}
-    if "penalty_type" in df.columns:
-        df["defensive_stress_penalty"] = df["penalty_type"].isin(stress_penalties)
-    else:
-        df["defensive_stress_penalty"] = False
+    red_zone, third_and_medium = situation_masks(
+        _float_values(df, "down", 0), _float_values(df, "ydstogo", 0), _float_values(df, "yardline_100", 100)
+    )
+    df["situation_bucket"] = np.select(
+        [red_zone, third_and_medium], ["red_zone", "third_and_medium"], "normal"
+    ).astype(object)
+
+    df["defensive_stress_penalty"] = stress_penalty_flags(df)
 
     df["personnel_group"] = (
         df["num_rb"].astype(str)
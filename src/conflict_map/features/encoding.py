@@ -0,0 +1,149 @@
+"""
+Stable categorical codes for team, game and bucket columns.
+
+Team abbreviations, game ids and the engineered buckets are repeated
+strings. ``CategoryEncoder`` converts them to pandas categoricals once, at
+load time, against a persisted append-only dictionary per column. New labels
+get the next codes (sorted among themselves), so a label's code never changes
+between runs or weekly appends. Everything downstream then groups and merges
+on small integer codes instead of hashing Python strings, and the columns
+take a fraction of the memory.
+
+Aggregations group on a single combined int64 code (``group_codes``) or with
+``observed=True, sort=False``, and keep their outputs identical by sorting
+the (small) result by label.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_COLUMNS = ("posteam", "defteam", "game_id", "situation_bucket", "pass_location_bucket", "personnel_group")
+CATEGORY_FILE = "category_dictionaries.json"
+
+
+def plain_labels(df: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    """Turn categorical ``columns`` of a (small) result frame back into plain values."""
+    converted = {
+        col: df[col].astype(object)
+        for col in columns
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+    return df.assign(**converted) if converted else df
+
+
+def sorted_result(df: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    """Sort an aggregate by label the way ``groupby(sort=True)`` on strings would."""
+    df = plain_labels(df, keys)
+    return df.sort_values(list(keys), kind="stable").reset_index(drop=True)
+
+
+def lexical_codes(values: pd.Series) -> np.ndarray:
+    """Codes that order like the sorted labels, as ``pd.factorize(sort=True)`` gives.
+
+    For a categorical only its categories are sorted, not the rows.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        rank = np.argsort(np.argsort(values.cat.categories.astype(str), kind="stable"))
+        codes = values.cat.codes.to_numpy()
+        return np.where(codes >= 0, rank[codes], -1)
+    return pd.factorize(values, sort=True)[0]
+
+
+def group_codes(df: pd.DataFrame, keys: Sequence[str]) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Combine ``keys`` into one int64 code per row, -1 where any key is null.
+
+    Categorical columns contribute their codes directly, so no strings are
+    hashed; other columns are factorized. Also returns each key's labels for
+    ``decode_group_codes``.
+    """
+    codes = np.zeros(len(df), dtype=np.int64)
+    valid = np.ones(len(df), dtype=bool)
+    labels: list[np.ndarray] = []
+    for key in keys:
+        values = df[key]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            key_codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            key_codes, uniques = pd.factorize(values)
+        valid &= key_codes >= 0
+        codes = codes * len(uniques) + key_codes
+        labels.append(np.asarray(uniques))
+    return np.where(valid, codes, -1), labels
+
+
+def decode_group_codes(codes: np.ndarray, labels: list[np.ndarray]) -> list[np.ndarray]:
+    """Per-key label arrays for combined codes from ``group_codes``."""
+    columns = []
+    for uniques in reversed(labels):
+        codes, local = np.divmod(codes, len(uniques))
+        columns.append(uniques[local])
+    return columns[::-1]
+
+
+class CategoryEncoder:
+    """Per-column label dictionaries that only ever grow."""
+
+    def __init__(self, dictionaries: dict[str, list] | None = None, columns: Sequence[str] = CATEGORY_COLUMNS):
+        self.columns = tuple(columns)
+        self.dictionaries: dict[str, list] = {col: [] for col in self.columns}
+        for col, labels in (dictionaries or {}).items():
+            self.dictionaries[col] = list(labels)
+
+    def _grow(self, col: str, values: pd.Series) -> list:
+        labels = self.dictionaries.setdefault(col, [])
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            uniques = values.cat.categories[values.cat.categories.isin(values.dropna().unique())]
+        else:
+            uniques = pd.unique(values.dropna())
+        known = set(labels)
+        labels.extend(sorted({label for label in uniques if label not in known}, key=str))
+        return labels
+
+    def fit(self, df: pd.DataFrame, columns: Sequence[str] | None = None) -> "CategoryEncoder":
+        """Add the labels in ``df`` to the dictionaries without converting anything."""
+        for col in columns or self.columns:
+            if col in df.columns:
+                self._grow(col, df[col])
+        return self
+
+    def encode(self, df: pd.DataFrame, columns: Sequence[str] | None = None) -> pd.DataFrame:
+        """Return ``df`` with each present column as a categorical over its dictionary."""
+        converted = {}
+        for col in columns or self.columns:
+            if col not in df.columns:
+                continue
+            values = df[col]
+            labels = self._grow(col, values)
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                if list(values.cat.categories) == labels:
+                    continue
+                converted[col] = values.cat.set_categories(labels)
+            else:
+                converted[col] = pd.Categorical(values, categories=labels)
+        return df.assign(**converted) if converted else df
+
+    def decode(self, df: pd.DataFrame, columns: Sequence[str] | None = None) -> pd.DataFrame:
+        return plain_labels(df, columns or self.columns)
+
+    def to_dict(self) -> dict:
+        """Dictionaries with labels as native JSON values, so ints load back as ints."""
+        return {
+            col: [label.item() if isinstance(label, np.generic) else label for label in labels]
+            for col, labels in self.dictionaries.items()
+        }
+
+    def save(self, path: Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def load(cls, path: Path) -> "CategoryEncoder":
+        """Load saved dictionaries; a missing or unreadable file gives an empty encoder."""
+        try:
+            return cls(json.loads(Path(path).read_text()))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls()
@@ -0,0 +1,179 @@
+"""
+Sparse design matrices from a ``FeatureSchema``.
+
+``DesignMatrixBuilder`` turns engineered play frames into ``scipy.sparse`` CSR
+matrices: numeric schema columns become a float32 block (NaN as 0) and each
+categorical column is one-hot encoded against a persisted vocabulary.
+
+Column indices are assigned in order of first appearance and never change:
+the numeric block comes first, then every (feature, category) pair gets the
+next free index when it is first seen. A matrix built from an early chunk is
+therefore a column prefix of one built later, so chunks or seasons can be
+encoded one at a time and joined with ``stack`` (which pads the narrower
+ones) without ever holding a dense multi-season frame in memory.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from ..metrics.splits import MISSING_LABEL
+from .schema import DEFAULT_SCHEMA, FeatureSchema
+
+
+def _category_labels(values: pd.Series) -> tuple[np.ndarray, list[str]]:
+    """Factorize a column into codes and string labels, with nulls as ``MISSING_LABEL``."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    labels = [str(v) for v in uniques]
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(labels), codes)
+        labels.append(MISSING_LABEL)
+    return codes, labels
+
+
+class DesignMatrixBuilder:
+    """Encode schema columns into CSR matrices with a growing, persisted vocabulary."""
+
+    def __init__(self, schema: FeatureSchema = DEFAULT_SCHEMA):
+        self.schema = schema
+        self.numeric_features = list(schema.numeric_features)
+        self.categorical_features = list(schema.categorical_features)
+        self.vocabulary: dict[str, dict[str, int]] = {col: {} for col in self.categorical_features}
+        self.n_features = len(self.numeric_features)
+
+    @property
+    def feature_names(self) -> list[str]:
+        names = list(self.numeric_features) + [""] * (self.n_features - len(self.numeric_features))
+        for col, categories in self.vocabulary.items():
+            for category, index in categories.items():
+                names[index] = f"{col}={category}"
+        return names
+
+    def fit(self, df: pd.DataFrame) -> "DesignMatrixBuilder":
+        """Add any categories in ``df`` to the vocabulary without building a matrix."""
+        for col in self.categorical_features:
+            if col in df.columns:
+                self._lookup(col, _category_labels(df[col])[1], grow=True)
+        return self
+
+    def _lookup(self, col: str, labels: list[str], grow: bool) -> np.ndarray:
+        """Global column index per label (-1 for labels not in a frozen vocabulary)."""
+        categories = self.vocabulary[col]
+        indices = np.empty(len(labels), dtype=np.int64)
+        for i, label in enumerate(labels):
+            index = categories.get(label)
+            if index is None and grow:
+                index = categories[label] = self.n_features
+                self.n_features += 1
+            indices[i] = -1 if index is None else index
+        return indices
+
+    def transform(self, df: pd.DataFrame, grow: bool = True) -> sparse.csr_matrix:
+        """Encode ``df`` as a float32 CSR matrix of shape ``(len(df), n_features)``.
+
+        With ``grow=False`` the vocabulary is frozen: unseen categories encode
+        as all-zero for that feature, so the width matches a trained model.
+        Missing schema columns encode as zeros.
+        """
+        n_rows = len(df)
+        row_blocks: list[np.ndarray] = []
+        col_blocks: list[np.ndarray] = []
+        data_blocks: list[np.ndarray] = []
+        rows = np.arange(n_rows, dtype=np.int64)
+
+        for j, col in enumerate(self.numeric_features):
+            if col not in df.columns:
+                continue
+            values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+            keep = np.flatnonzero(np.nan_to_num(values) != 0)
+            row_blocks.append(keep)
+            col_blocks.append(np.full(len(keep), j, dtype=np.int64))
+            data_blocks.append(values[keep])
+
+        for col in self.categorical_features:
+            if col not in df.columns:
+                continue
+            codes, labels = _category_labels(df[col])
+            columns = self._lookup(col, labels, grow)[codes]
+            keep = columns >= 0
+            row_blocks.append(rows[keep])
+            col_blocks.append(columns[keep])
+            data_blocks.append(np.ones(int(keep.sum()), dtype=np.float32))
+
+        if not row_blocks:
+            return sparse.csr_matrix((n_rows, self.n_features), dtype=np.float32)
+        return sparse.csr_matrix(
+            (np.concatenate(data_blocks), (np.concatenate(row_blocks), np.concatenate(col_blocks))),
+            shape=(n_rows, self.n_features),
+            dtype=np.float32,
+        )
+
+    def iter_transform(self, frames: Iterable[pd.DataFrame], grow: bool = True) -> Iterator[sparse.csr_matrix]:
+        """Encode frames (chunks, seasons) one at a time."""
+        for frame in frames:
+            yield self.transform(frame, grow=grow)
+
+    def stack(self, matrices: Iterable[sparse.spmatrix]) -> sparse.csr_matrix:
+        """Vertically stack chunk matrices, padding early ones to the current width."""
+        # Materialize first: with a lazy ``iter_transform`` the width is only
+        # final once every chunk has been encoded.
+        padded = [sparse.csr_matrix(matrix) for matrix in matrices]
+        for matrix in padded:
+            if matrix.shape[1] < self.n_features:
+                matrix.resize((matrix.shape[0], self.n_features))
+        if not padded:
+            return sparse.csr_matrix((0, self.n_features), dtype=np.float32)
+        return sparse.vstack(padded, format="csr", dtype=np.float32)
+
+    def to_dict(self) -> dict:
+        return {
+            "numeric_features": self.numeric_features,
+            "categorical_features": self.categorical_features,
+            "vocabulary": self.vocabulary,
+            "n_features": self.n_features,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DesignMatrixBuilder":
+        builder = cls(FeatureSchema(list(data["numeric_features"]), list(data["categorical_features"])))
+        builder.vocabulary = {col: {k: int(v) for k, v in cats.items()} for col, cats in data["vocabulary"].items()}
+        builder.n_features = int(data["n_features"])
+        return builder
+
+    def save(self, path: Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def load(cls, path: Path) -> "DesignMatrixBuilder":
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+def build_design_matrix(
+    frames: Iterable[pd.DataFrame] | pd.DataFrame,
+    builder: DesignMatrixBuilder | None = None,
+    grow: bool = True,
+) -> tuple[sparse.csr_matrix, DesignMatrixBuilder]:
+    """Encode one frame or an iterable of chunks/seasons into a single CSR matrix."""
+    builder = builder or DesignMatrixBuilder()
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+    return builder.stack(builder.iter_transform(frames, grow=grow)), builder
+
+
+def build_season_matrices(
+    df: pd.DataFrame,
+    builder: DesignMatrixBuilder | None = None,
+    season_col: str = "season",
+) -> tuple[dict[int, sparse.csr_matrix], DesignMatrixBuilder]:
+    """One CSR matrix per season, all padded to the final vocabulary width."""
+    builder = builder or DesignMatrixBuilder()
+    seasons = sorted(df[season_col].dropna().unique())
+    matrices = {int(s): builder.transform(df[df[season_col] == s]) for s in seasons}
+    for matrix in matrices.values():
+        matrix.resize((matrix.shape[0], builder.n_features))
+    return matrices, builder
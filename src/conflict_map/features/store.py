@@ -0,0 +1,81 @@
+"""
+Compact columnar store of the engineered play features.
+
+The pipeline writes the columns that scoring and the downstream aggregates
+read (play keys, the heuristic's inputs, ``DEFAULT_SCHEMA`` for learned models,
+and outcome labels) to a zstd-compressed parquet file next to its CSV outputs.
+``conflict_map.cli rescore`` rebuilds scores and aggregates from that file
+alone, without re-reading raw play-by-play or re-running
+``engineer_basic_features``.
+
+Low-cardinality strings are stored as dictionary-encoded categoricals and
+integer columns without nulls are downcast; floats are kept as float64 so
+rescored plays match a full run exactly.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Sequence
+
+import pandas as pd
+
+from ..data.arrow_backend import plain_strings
+from ..model.conflict_score import SCORING_COLUMNS
+from .schema import DEFAULT_SCHEMA, FeatureSchema
+
+FEATURES_FILE = "play_features.parquet"
+KEY_COLUMNS = ("season", "week", "game_id", "play_id", "posteam", "defteam", "drive", "series")
+LABEL_COLUMNS = ("success",)
+# Strings with at most this share of distinct values become categoricals.
+CATEGORY_RATIO = 0.5
+
+
+def feature_store_columns(df: pd.DataFrame, schema: FeatureSchema = DEFAULT_SCHEMA) -> list[str]:
+    """Columns of ``df`` that belong in the store, in a stable order without duplicates."""
+    wanted = [
+        *KEY_COLUMNS,
+        *SCORING_COLUMNS,
+        *schema.numeric_features,
+        *schema.categorical_features,
+        *LABEL_COLUMNS,
+    ]
+    return [c for c in dict.fromkeys(wanted) if c in df.columns]
+
+
+def _compact(series: pd.Series) -> pd.Series:
+    if isinstance(series.dtype, pd.ArrowDtype):
+        series = plain_strings(series.to_frame())[series.name]
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_float_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    if series.dtype == object and series.nunique(dropna=True) <= CATEGORY_RATIO * max(len(series), 1):
+        return series.astype("category")
+    return series
+
+
+def write_feature_store(df: pd.DataFrame, path: Path, schema: FeatureSchema = DEFAULT_SCHEMA) -> Path:
+    """Write the store columns of an engineered (or scored) play frame to ``path``."""
+    columns = feature_store_columns(df, schema)
+    compact = pd.DataFrame({col: _compact(df[col]) for col in columns})
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    compact.to_parquet(path, index=False, compression="zstd")
+    return path
+
+
+def read_feature_store(
+    path: Path, columns: Sequence[str] | None = None, categorical: bool = False
+) -> pd.DataFrame:
+    """Load the store, optionally only ``columns``.
+
+    Dictionary-encoded columns come back as plain strings unless
+    ``categorical`` is set, in which case they stay pandas categoricals.
+    """
+    df = pd.read_parquet(path, columns=list(columns) if columns is not None else None)
+    if categorical:
+        return df
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    return df
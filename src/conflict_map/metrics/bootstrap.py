@@ -0,0 +1,176 @@
+"""
+Bootstrap confidence intervals and rank probabilities for team OCCI.
+
+Units (team-games or plays) are resampled with replacement within each team
+(and season). Instead of one groupby per resample, a block of resamples is
+drawn as a single ``(block, units)`` index array. Units are laid out sorted by
+group, so each group is one contiguous run of columns and ``np.add.reduceat``
+produces every (resample, group) sum at once; rank counts use ``np.bincount``.
+Blocks have their own ``SeedSequence`` child, so results depend only on
+``seed`` and not on whether blocks run in-process or across a process pool.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_RESAMPLES = 10_000
+DEFAULT_LEVEL = 0.95
+# Upper bound on index draws held in memory per block.
+BLOCK_DRAWS = 1 << 22
+
+
+def _resample_block(
+    values: np.ndarray,
+    slot_groups: np.ndarray,
+    starts: np.ndarray,
+    sizes: np.ndarray,
+    seed: np.random.SeedSequence,
+    n_resamples: int,
+) -> np.ndarray:
+    """Return ``(n_resamples, n_groups)`` resampled group means for one block."""
+    rng = np.random.default_rng(seed)
+    slot_sizes = sizes[slot_groups]
+    # float32 uniforms halve the cost of drawing; the clip guards the rare
+    # round-up to ``size`` itself.
+    draws = (rng.random((n_resamples, len(values)), dtype=np.float32) * slot_sizes.astype(np.float32)).astype(np.int64)
+    np.minimum(draws, slot_sizes - 1, out=draws)
+    draws += starts[slot_groups]
+    return np.add.reduceat(values[draws], starts, axis=1) / sizes
+
+
+def bootstrap_group_means(
+    values: np.ndarray,
+    codes: np.ndarray,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    seed: int = 0,
+    n_jobs: int = 1,
+) -> np.ndarray:
+    """Bootstrap the mean of ``values`` within each integer group code.
+
+    ``codes`` must be in ``0..n_groups-1`` with every group present. Returns
+    an ``(n_resamples, n_groups)`` array.
+    """
+    order = np.argsort(codes, kind="stable")
+    values = np.asarray(values, dtype=float)[order]
+    slot_groups = np.asarray(codes)[order]
+    sizes = np.bincount(slot_groups)
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+
+    block = max(1, min(n_resamples, BLOCK_DRAWS // max(len(values), 1)))
+    counts = [block] * (n_resamples // block) + ([n_resamples % block] if n_resamples % block else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    args = [(values, slot_groups, starts, sizes, s, n) for s, n in zip(seeds, counts)]
+
+    if n_jobs > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            blocks = list(pool.map(_resample_block, *zip(*args)))
+    else:
+        blocks = [_resample_block(*a) for a in args]
+    return np.vstack(blocks)
+
+
+def _rank_within(samples: np.ndarray, rank_codes: np.ndarray) -> np.ndarray:
+    """1-based descending rank of each column within its ``rank_codes`` block, per row."""
+    n_groups = samples.shape[1]
+    order = np.lexsort((-samples, np.broadcast_to(rank_codes, samples.shape)), axis=-1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.broadcast_to(np.arange(n_groups), order.shape), axis=-1)
+    block_start = np.searchsorted(np.sort(rank_codes), rank_codes)
+    return positions - block_start + 1
+
+
+@dataclass
+class BootstrapResult:
+    """Bootstrap draws of team OCCI plus the observed estimates."""
+
+    keys: pd.DataFrame
+    units: np.ndarray
+    estimates: np.ndarray
+    samples: np.ndarray
+    rank_codes: np.ndarray
+
+    def ranks(self) -> np.ndarray:
+        return _rank_within(self.samples, self.rank_codes)
+
+    def intervals(self, level: float = DEFAULT_LEVEL) -> pd.DataFrame:
+        """Percentile CIs for OCCI and rank, one row per team.
+
+        Columns: the key columns, units, occi, std_error, ci_low, ci_high,
+        rank (observed), rank_ci_low, rank_ci_high.
+        """
+        tail = (1 - level) / 2
+        ranks = self.ranks()
+        observed = _rank_within(self.estimates[None, :], self.rank_codes)[0]
+        low, high = np.quantile(self.samples, [tail, 1 - tail], axis=0)
+        rank_low, rank_high = np.quantile(ranks, [tail, 1 - tail], axis=0, method="nearest")
+        result = self.keys.copy()
+        result["units"] = self.units
+        result["occi"] = self.estimates
+        result["std_error"] = self.samples.std(axis=0, ddof=1)
+        result["ci_low"] = low
+        result["ci_high"] = high
+        result["rank"] = observed
+        result["rank_ci_low"] = rank_low.astype(int)
+        result["rank_ci_high"] = rank_high.astype(int)
+        return result.sort_values([*self.keys.columns[:-1], "rank"]).reset_index(drop=True)
+
+    def rank_probabilities(self) -> pd.DataFrame:
+        """Wide matrix of P(rank = r) per team, with columns ``rank_1..rank_n``."""
+        ranks = self.ranks()
+        n_rows, n_groups = ranks.shape
+        max_rank = int(ranks.max())
+        keys = (np.arange(n_groups)[None, :] * max_rank + ranks - 1).ravel()
+        probs = np.bincount(keys, minlength=n_groups * max_rank).reshape(n_groups, max_rank) / n_rows
+        matrix = pd.DataFrame(probs, columns=[f"rank_{r}" for r in range(1, max_rank + 1)])
+        return pd.concat([self.keys.reset_index(drop=True), matrix], axis=1)
+
+
+def bootstrap_team_occi(
+    df: pd.DataFrame,
+    value_col: str = "occi_mean",
+    team_col: str = "team",
+    season_col: str | None = "season",
+    n_resamples: int = DEFAULT_RESAMPLES,
+    seed: int = 0,
+    n_jobs: int = 1,
+) -> BootstrapResult:
+    """Bootstrap team OCCI by resampling the rows of ``df`` within each team.
+
+    Pass team-game rows (``occi_mean``) to bootstrap ``season_occi_mean`` from
+    ``compute_team_season_occi``, or play rows (``conflict_score`` with
+    ``team_col="posteam"``) to bootstrap play-level means. Teams are ranked
+    within season when ``season_col`` is present, highest OCCI first.
+    """
+    group_cols = [c for c in (season_col, team_col) if c is not None and c in df.columns]
+    df = df.dropna(subset=[*group_cols, value_col])
+    if df.empty:
+        raise ValueError("no rows with both a team and a value to resample")
+
+    grouped = df.groupby(group_cols, observed=True, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    stats = grouped[value_col].agg(["count", "mean"])
+    keys = stats.index.to_frame(index=False).rename(columns={team_col: "team"})
+    rank_codes = (
+        pd.factorize(keys[season_col])[0] if season_col in keys.columns else np.zeros(len(keys), dtype=np.int64)
+    )
+
+    samples = bootstrap_group_means(df[value_col].to_numpy(), codes, n_resamples, seed, n_jobs)
+    return BootstrapResult(
+        keys=keys,
+        units=stats["count"].to_numpy(),
+        estimates=stats["mean"].to_numpy(),
+        samples=samples,
+        rank_codes=rank_codes,
+    )
+
+
+def rank_probability_matrix(result: BootstrapResult, season: int | None = None) -> pd.DataFrame:
+    """Team x rank probability matrix for one season (or the only ranking pool)."""
+    probs = result.rank_probabilities()
+    if season is not None and "season" in probs.columns:
+        probs = probs[probs["season"] == season].drop(columns="season")
+    return probs.set_index("team").loc[:, lambda frame: (frame > 0).any()]
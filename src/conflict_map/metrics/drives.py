@@ -0,0 +1,137 @@
+"""
+Drive- and series-level OCCI.
+
+Plays are sorted once by (game, drive or series, play order) so that every
+drive is a contiguous segment. Per-drive totals then come from
+``np.add.reduceat``/``np.maximum.reduceat`` over the segment starts, and the
+within-drive running values from one global ``cumsum`` minus each segment's
+starting offset, so no per-drive groupby is needed.
+
+``compute_drive_occi`` returns one row per drive (or series) with:
+- season (when available), game_id, drive / series
+- team, opponent (first ``posteam``/``defteam`` in the segment)
+- plays
+- occi_sum, occi_mean, occi_max
+- high_conflict_plays (plays with a score of at least ``threshold``)
+- longest_high_conflict_streak (most consecutive such plays)
+
+``compute_cumulative_drive_occi`` returns one row per play with its position
+in the drive, the running OCCI sum and mean, and the current high-conflict
+streak.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from ..features.encoding import lexical_codes
+
+DRIVE_UNITS = ("drive", "series")
+DEFAULT_HIGH_CONFLICT = 0.4
+
+
+def _sorted_segments(
+    df_conflict: pd.DataFrame, unit: str, game_id_col: str, score_col: str
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """Return plays sorted into contiguous segments and the segment start offsets."""
+    if unit not in DRIVE_UNITS:
+        raise ValueError(f"unit must be one of {DRIVE_UNITS}, got {unit!r}")
+    df = df_conflict.dropna(subset=[game_id_col, unit, score_col])
+    game_codes = lexical_codes(df[game_id_col])
+    unit_values = df[unit].to_numpy()
+    order_keys = [df["play_id"].to_numpy()] if "play_id" in df.columns else []
+    order = np.lexsort((*order_keys, unit_values, game_codes)) if len(df) else np.zeros(0, dtype=np.int64)
+    df = df.iloc[order].reset_index(drop=True)
+
+    games, units = game_codes[order], unit_values[order]
+    boundary = np.r_[True, (games[1:] != games[:-1]) | (units[1:] != units[:-1])] if len(df) else np.zeros(0, bool)
+    return df, np.flatnonzero(boundary)
+
+
+def _segment_ids(starts: np.ndarray, n: int) -> np.ndarray:
+    return np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+
+
+def _high_conflict_streaks(high: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Length of the run of consecutive high-conflict plays ending at each play."""
+    if len(high) == 0:
+        return np.zeros(0, dtype=np.int64)
+    counts = np.cumsum(high)
+    resets = ~high
+    resets[starts] = True
+    # Count of high plays before the most recent reset point (a low play or a new drive).
+    base = np.maximum.accumulate(np.where(resets, counts - high, 0))
+    return counts - base
+
+
+def compute_drive_occi(
+    df_conflict: pd.DataFrame,
+    unit: str = "drive",
+    threshold: float = DEFAULT_HIGH_CONFLICT,
+    game_id_col: str = "game_id",
+    score_col: str = "conflict_score",
+) -> pd.DataFrame:
+    """Aggregate play conflict scores per drive (``unit="drive"``) or series.
+
+    Returns an empty frame with the usual columns when ``unit`` is missing.
+    """
+    key_cols = [c for c in ("season",) if c in df_conflict.columns] + [game_id_col, unit]
+    columns = [
+        *key_cols, "team", "opponent", "plays", "occi_sum", "occi_mean", "occi_max",
+        "high_conflict_plays", "longest_high_conflict_streak",
+    ]
+    if unit not in df_conflict.columns:
+        return pd.DataFrame(columns=columns)
+    df, starts = _sorted_segments(df_conflict, unit, game_id_col, score_col)
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+
+    scores = df[score_col].to_numpy(dtype=float)
+    high = scores >= threshold
+    plays = np.diff(np.r_[starts, len(df)])
+    sums = np.add.reduceat(scores, starts)
+    streaks = _high_conflict_streaks(high, starts)
+
+    result = {col: df[col].to_numpy()[starts] for col in key_cols}
+    result["team"] = df["posteam"].to_numpy()[starts] if "posteam" in df.columns else None
+    result["opponent"] = df["defteam"].to_numpy()[starts] if "defteam" in df.columns else None
+    result["plays"] = plays
+    result["occi_sum"] = sums
+    result["occi_mean"] = sums / plays
+    result["occi_max"] = np.maximum.reduceat(scores, starts)
+    result["high_conflict_plays"] = np.add.reduceat(high.astype(np.int64), starts)
+    result["longest_high_conflict_streak"] = np.maximum.reduceat(streaks, starts)
+    return pd.DataFrame(result, columns=columns)
+
+
+def compute_cumulative_drive_occi(
+    df_conflict: pd.DataFrame,
+    unit: str = "drive",
+    threshold: float = DEFAULT_HIGH_CONFLICT,
+    game_id_col: str = "game_id",
+    score_col: str = "conflict_score",
+) -> pd.DataFrame:
+    """Per-play running OCCI within each drive (or series), in play order.
+
+    Adds ``play_in_drive`` (1-based), ``cumulative_occi``,
+    ``cumulative_occi_mean`` and ``high_conflict_streak`` to the key columns,
+    ``play_id`` (when available), ``posteam`` and the play score.
+    """
+    df, starts = _sorted_segments(df_conflict, unit, game_id_col, score_col)
+    keep = [c for c in ("season", game_id_col, unit, "play_id", "posteam", score_col) if c in df.columns]
+    result = df[keep].copy()
+    if df.empty:
+        return result.assign(play_in_drive=[], cumulative_occi=[], cumulative_occi_mean=[], high_conflict_streak=[])
+
+    scores = df[score_col].to_numpy(dtype=float)
+    segment = _segment_ids(starts, len(df))
+    position = np.arange(len(df)) - starts[segment] + 1
+    running = np.cumsum(scores)
+    offsets = (running - scores)[starts]
+    cumulative = running - offsets[segment]
+
+    result["play_in_drive"] = position
+    result["cumulative_occi"] = cumulative
+    result["cumulative_occi_mean"] = cumulative / position
+    result["high_conflict_streak"] = _high_conflict_streaks(scores >= threshold, starts)
+    return result
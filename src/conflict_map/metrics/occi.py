@@ -4,12 +4,30 @@ Offensive Conflict Creation Index (OCCI) computation.
 This module aggregates play level conflict scores into:
 - team season level OCCI
 - team game level OCCI
-- optionally, split by situation or opponent.
+- optionally, split by situation or opponent (see ``metrics.splits``).
 """
 from __future__ import annotations
 
 import pandas as pd
 
+from ..features.encoding import decode_group_codes, group_codes, sorted_result
+
+
+def _grouped_occi(df: pd.DataFrame, keys: list[str], value_col: str, names: list[str]) -> pd.DataFrame:
+    """Count/mean/std of ``value_col`` per combination of ``keys``, sorted by key.
+
+    Groups on one combined integer code rather than on the key columns, which
+    avoids hashing strings; the statistics come from the same pandas kernels,
+    so they match ``df.groupby(keys)`` exactly.
+    """
+    codes, labels = group_codes(df, keys)
+    valid = codes >= 0
+    stats = df[value_col][valid].groupby(codes[valid], sort=False).agg(["count", "mean", "std"])
+    result = pd.DataFrame(dict(zip(keys, decode_group_codes(stats.index.to_numpy(), labels))))
+    for name, stat in zip(names, ("count", "mean", "std")):
+        result[name] = stats[stat].to_numpy()
+    return sorted_result(result, keys)
+
 
 def compute_team_game_occi(
     df_conflict: pd.DataFrame,
@@ -27,14 +45,9 @@ def compute_team_game_occi(
     - occi_mean
     - occi_std
     """
-    grouped = df_conflict.groupby([game_id_col, team_col])
-
-    result = grouped[score_col].agg(
-        plays="count",
-        occi_mean="mean",
-        occi_std="std",
-    ).reset_index().rename(columns={team_col: "team"})
-    return result
+    return _grouped_occi(df_conflict, [game_id_col, team_col], score_col, ["plays", "occi_mean", "occi_std"]).rename(
+        columns={team_col: "team"}
+    )
 
 
 def compute_team_season_occi(
@@ -56,10 +69,4 @@ def compute_team_season_occi(
             "season column not found - provide a season_lookup or include season in df_game_occi"
         )
 
-    grouped = df.groupby(["season", "team"])
-    result = grouped["occi_mean"].agg(
-        games="count",
-        season_occi_mean="mean",
-        season_occi_std="std",
-    ).reset_index()
-    return result
+    return _grouped_occi(df, ["season", "team"], "occi_mean", ["games", "season_occi_mean", "season_occi_std"])
@@ -0,0 +1,176 @@
+"""
+Rolling and exponentially-weighted team OCCI.
+
+``compute_team_rolling_occi`` builds the series from scratch with pandas.
+``RollingOCCIState`` keeps, per team, the last ``window`` game means plus the
+current exponentially-weighted value, so new weeks can be folded in by
+touching only the games that were added. Both produce the same columns:
+
+- season, week, game_id (whichever are available for ordering)
+- team
+- occi_mean
+- games_played
+- rolling_occi_mean (mean of the last ``window`` games, including this one)
+- ewm_occi (``y_t = alpha * x_t + (1 - alpha) * y_{t-1}``, seeded with the first game)
+"""
+from __future__ import annotations
+
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+ORDER_COLUMNS = ("season", "week", "game_id")
+DEFAULT_WINDOW = 4
+DEFAULT_ALPHA = 0.3
+
+
+def attach_game_order(df_game: pd.DataFrame, df_conflict: pd.DataFrame) -> pd.DataFrame:
+    """Add the season/week of each game from the play-level frame, if present."""
+    cols = [c for c in ("season", "week") if c in df_conflict.columns and c not in df_game.columns]
+    if not cols:
+        return df_game
+    lookup = df_conflict[["game_id", *cols]].drop_duplicates("game_id")
+    return df_game.merge(lookup, on="game_id", how="left")
+
+
+def _order_columns(df: pd.DataFrame) -> list[str]:
+    return [c for c in ORDER_COLUMNS if c in df.columns]
+
+
+def _game_key(row: pd.Series, order_cols: list[str]) -> list:
+    key = []
+    for col in order_cols:
+        value = row[col]
+        key.append(value.item() if hasattr(value, "item") else value)
+    return key
+
+
+def compute_team_rolling_occi(
+    df_game: pd.DataFrame,
+    window: int = DEFAULT_WINDOW,
+    alpha: float = DEFAULT_ALPHA,
+) -> pd.DataFrame:
+    """Compute rolling and exponentially-weighted OCCI per team from all games."""
+    order_cols = _order_columns(df_game)
+    df = df_game[[*order_cols, "team", "occi_mean"]].sort_values(["team", *order_cols], kind="stable")
+    df = df.reset_index(drop=True)
+    grouped = df.groupby("team", sort=False)["occi_mean"]
+
+    df["games_played"] = grouped.cumcount() + 1
+    df["rolling_occi_mean"] = (
+        grouped.rolling(window, min_periods=1).mean().reset_index(level=0, drop=True)
+    )
+    df["ewm_occi"] = grouped.transform(lambda s: s.ewm(alpha=alpha, adjust=False).mean())
+    return df
+
+
+@dataclass
+class TeamWindow:
+    """Running state for one team."""
+
+    values: deque = field(default_factory=deque)
+    ewm: float | None = None
+    games: int = 0
+    last_key: list | None = None
+
+
+class RollingOCCIState:
+    """Per-team rolling window and EWM state that can be updated week by week."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA):
+        self.window = window
+        self.alpha = alpha
+        self.teams: dict[str, TeamWindow] = {}
+
+    def can_append(self, df_new_games: pd.DataFrame) -> bool:
+        """True when every new game sorts strictly after its team's last seen game."""
+        order_cols = _order_columns(df_new_games)
+        for _, row in df_new_games.iterrows():
+            state = self.teams.get(row["team"])
+            if state is not None and state.last_key is not None and _game_key(row, order_cols) <= state.last_key:
+                return False
+        return True
+
+    def update(self, df_new_games: pd.DataFrame) -> pd.DataFrame:
+        """Fold new team-games into the state and return their rolling rows.
+
+        Work is proportional to the number of games passed in. Callers should
+        check :meth:`can_append` first; games that replace or precede ones
+        already seen need a rebuild from scratch.
+        """
+        order_cols = _order_columns(df_new_games)
+        df = df_new_games[[*order_cols, "team", "occi_mean"]].sort_values(["team", *order_cols], kind="stable")
+        rows = []
+        for _, row in df.iterrows():
+            state = self.teams.setdefault(row["team"], TeamWindow(values=deque(maxlen=self.window)))
+            value = float(row["occi_mean"])
+            state.values.append(value)
+            state.ewm = value if state.ewm is None else self.alpha * value + (1 - self.alpha) * state.ewm
+            state.games += 1
+            state.last_key = _game_key(row, order_cols)
+            rows.append(
+                {
+                    **{col: row[col] for col in order_cols},
+                    "team": row["team"],
+                    "occi_mean": value,
+                    "games_played": state.games,
+                    "rolling_occi_mean": sum(state.values) / len(state.values),
+                    "ewm_occi": state.ewm,
+                }
+            )
+        return pd.DataFrame(rows, columns=[*order_cols, "team", "occi_mean", "games_played", "rolling_occi_mean", "ewm_occi"])
+
+    @classmethod
+    def from_games(
+        cls, df_game: pd.DataFrame, window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA
+    ) -> tuple["RollingOCCIState", pd.DataFrame]:
+        """Build state and the full rolling frame from every game."""
+        state = cls(window=window, alpha=alpha)
+        df_rolling = compute_team_rolling_occi(df_game, window=window, alpha=alpha)
+        order_cols = _order_columns(df_rolling)
+        for team, team_df in df_rolling.groupby("team", sort=False):
+            last = team_df.iloc[-1]
+            state.teams[team] = TeamWindow(
+                values=deque(team_df["occi_mean"].tail(window).astype(float).tolist(), maxlen=window),
+                ewm=float(last["ewm_occi"]),
+                games=int(last["games_played"]),
+                last_key=_game_key(last, order_cols),
+            )
+        return state, df_rolling
+
+    def to_dict(self) -> dict:
+        return {
+            "window": self.window,
+            "alpha": self.alpha,
+            "teams": {
+                team: {"values": list(s.values), "ewm": s.ewm, "games": s.games, "last_key": s.last_key}
+                for team, s in self.teams.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RollingOCCIState":
+        state = cls(window=int(data["window"]), alpha=float(data["alpha"]))
+        for team, s in data["teams"].items():
+            state.teams[team] = TeamWindow(
+                values=deque(s["values"], maxlen=state.window),
+                ewm=s["ewm"],
+                games=int(s["games"]),
+                last_key=s["last_key"],
+            )
+        return state
+
+    def save(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path: Path) -> "RollingOCCIState | None":
+        if not path.exists():
+            return None
+        try:
+            return cls.from_dict(json.loads(path.read_text()))
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return None
@@ -0,0 +1,163 @@
+"""
+Nearest-neighbour search over team-game and team-season OCCI profiles.
+
+Profiles are one row per team-game or team-season. They come either from the
+six ``OCCICalculator`` component scores (``component_profiles``) or from the
+wide form of ``compute_team_occi_splits`` (``split_profiles``).
+``SimilarityIndex`` z-scores every feature, L2-normalises each row and answers
+top-k cosine-similarity queries with one matrix-vector product and
+``np.argpartition``, which stays in the low milliseconds for tens of thousands
+of profiles.
+"""
+from __future__ import annotations
+
+from typing import Hashable, Sequence
+
+import numpy as np
+import pandas as pd
+
+COMPONENT_COLUMNS = (
+    "motion_score",
+    "formation_score",
+    "target_depth_score",
+    "play_action_score",
+    "personnel_score",
+    "situational_score",
+)
+# Opponent splits describe the schedule rather than the offense, so they are left out.
+PROFILE_SPLITS = ("situation_bucket", "personnel_group", "down", "target_depth_bucket")
+DEFAULT_K = 5
+
+
+def component_profiles(
+    df_plays: pd.DataFrame,
+    level: str = "season",
+    team_col: str = "posteam",
+    columns: Sequence[str] = COMPONENT_COLUMNS,
+) -> pd.DataFrame:
+    """Mean component scores per team-season (``level="season"``) or team-game (``"game"``).
+
+    Key columns are ``season`` (when present), ``game_id`` for game level,
+    and ``team``; feature columns are the components found in ``df_plays``
+    plus ``plays``.
+    """
+    if level not in ("season", "game"):
+        raise ValueError(f"level must be 'season' or 'game', got {level!r}")
+    keys = [c for c in ("season", "game_id")[: 2 if level == "game" else 1] if c in df_plays.columns]
+    features = [c for c in columns if c in df_plays.columns]
+    if not features:
+        raise ValueError("none of the component columns are present")
+    grouped = df_plays.dropna(subset=[team_col]).groupby([*keys, team_col], observed=True, sort=True)
+    profiles = grouped[features].mean()
+    profiles["plays"] = grouped.size()
+    return profiles.reset_index().rename(columns={team_col: "team"})
+
+
+def split_profiles(
+    df_splits: pd.DataFrame,
+    dimensions: Sequence[str] = PROFILE_SPLITS,
+    min_share: float = 0.02,
+) -> pd.DataFrame:
+    """Widen ``team_occi_splits.csv`` into one row per team-season.
+
+    Each split value contributes two features, ``<split>=<value>:share`` (its
+    fraction of the team's plays) and ``<split>=<value>:occi``. Values that
+    never reach ``min_share`` of any team's plays are dropped; missing OCCI is
+    filled with the column mean so it does not pull teams together or apart.
+    """
+    keys = [c for c in ("season", "team") if c in df_splits.columns]
+    df = df_splits[df_splits["split"].isin(dimensions)].copy()
+    totals = df.groupby([*keys, "split"])["plays"].transform("sum")
+    df["share"] = df["plays"] / totals
+    df["feature"] = df["split"] + "=" + df["value"].astype(str)
+
+    wide = df.pivot_table(index=keys, columns="feature", values=["share", "occi_mean"], aggfunc="first")
+    shares = wide["share"].fillna(0.0)
+    kept = shares.columns[shares.max() >= min_share]
+    occi = wide["occi_mean"].reindex(columns=kept)
+    occi = occi.fillna(occi.mean())
+    profiles = pd.concat(
+        [shares[kept].add_suffix(":share"), occi.add_suffix(":occi")], axis=1
+    )
+    profiles.columns.name = None
+    return profiles.reset_index()
+
+
+class SimilarityIndex:
+    """Top-k cosine similarity over standardized profile vectors."""
+
+    def __init__(
+        self,
+        profiles: pd.DataFrame,
+        key_columns: Sequence[str] | None = None,
+        feature_columns: Sequence[str] | None = None,
+    ):
+        if key_columns is None:
+            key_columns = [c for c in ("season", "game_id", "team") if c in profiles.columns]
+        if feature_columns is None:
+            feature_columns = [
+                c for c in profiles.columns
+                if c not in key_columns and c != "plays" and pd.api.types.is_numeric_dtype(profiles[c])
+            ]
+        self.key_columns = list(key_columns)
+        self.feature_columns = list(feature_columns)
+        self.keys = profiles[self.key_columns].reset_index(drop=True)
+
+        values = profiles[self.feature_columns].to_numpy(dtype=float)
+        self.center = np.nanmean(values, axis=0)
+        scale = np.nanstd(values, axis=0)
+        self.scale = np.where(scale > 0, scale, 1.0)
+        self.matrix = self._normalize(values)
+        self._positions = {self._key(row): i for i, row in enumerate(self.keys.itertuples(index=False))}
+
+    @staticmethod
+    def _key(values) -> tuple:
+        return tuple(v.item() if hasattr(v, "item") else v for v in values)
+
+    def _normalize(self, values: np.ndarray) -> np.ndarray:
+        z = np.nan_to_num((np.atleast_2d(values) - self.center) / self.scale)
+        norms = np.linalg.norm(z, axis=1, keepdims=True)
+        return z / np.where(norms > 0, norms, 1.0)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def position(self, key: Hashable | Sequence | dict) -> int:
+        """Row of ``key`` given as a dict, a tuple in ``key_columns`` order, or a team name."""
+        if isinstance(key, dict):
+            key = tuple(key[c] for c in self.key_columns)
+        elif not isinstance(key, tuple):
+            key = (key,)
+        try:
+            return self._positions[key]
+        except KeyError:
+            raise KeyError(f"{key!r} is not in the index (keys are {self.key_columns})") from None
+
+    def query_vector(self, vector: Sequence[float], k: int = DEFAULT_K, exclude: Sequence[int] = ()) -> pd.DataFrame:
+        """Top-k profiles most similar to a raw (unstandardized) feature vector."""
+        return self._top_k(self._normalize(np.asarray(vector, dtype=float))[0], k, exclude)
+
+    def query(
+        self,
+        key: Hashable | Sequence | dict,
+        k: int = DEFAULT_K,
+        exclude_same_team: bool = False,
+    ) -> pd.DataFrame:
+        """Top-k profiles most similar to the indexed profile ``key`` (itself excluded)."""
+        pos = self.position(key)
+        exclude = [pos]
+        if exclude_same_team and "team" in self.keys.columns:
+            exclude = np.flatnonzero(self.keys["team"].to_numpy() == self.keys.at[pos, "team"])
+        return self._top_k(self.matrix[pos], k, exclude)
+
+    def _top_k(self, unit: np.ndarray, k: int, exclude: Sequence[int]) -> pd.DataFrame:
+        scores = self.matrix @ unit
+        scores[np.asarray(exclude, dtype=int)] = -np.inf
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return self.keys.iloc[:0].assign(similarity=pd.Series(dtype=float))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        result = self.keys.iloc[top].reset_index(drop=True)
+        result["similarity"] = scores[top]
+        return result
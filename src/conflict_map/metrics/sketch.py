@@ -0,0 +1,217 @@
+"""
+Mergeable quantile sketches (t-digest) for team OCCI medians and percentiles.
+
+Exact medians need every play in memory at once, so they cannot be combined
+across chunks, seasons or weekly updates. A t-digest summarises a
+distribution with a bounded number of weighted centroids that can be merged
+and serialised; quantile error is smallest in the tails and stays within a
+small fraction of a rank in the middle.
+
+Digests for every group are built in one vectorized pass: values are sorted
+once by (group, value), each value is assigned to a centroid by the k1 scale
+function of its within-group quantile, and centroid weights and means are
+accumulated with ``np.bincount``.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Hashable, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_COMPRESSION = 100.0
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+
+def _compress(
+    groups: np.ndarray, means: np.ndarray, weights: np.ndarray, compression: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Collapse (group, mean, weight) points sorted by group then mean into centroids."""
+    totals = np.bincount(groups, weights=weights)
+    cumulative = np.cumsum(weights)
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    offset = np.repeat(cumulative[starts] - weights[starts], np.diff(np.r_[starts, len(groups)]))
+    q = (cumulative - offset - weights / 2) / totals[groups]
+    k = np.floor(compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1)))
+
+    boundary = np.r_[True, (groups[1:] != groups[:-1]) | (k[1:] != k[:-1])]
+    centroid = np.cumsum(boundary) - 1
+    new_weights = np.bincount(centroid, weights=weights)
+    new_means = np.bincount(centroid, weights=weights * means) / new_weights
+    return groups[boundary], new_means, new_weights
+
+
+@dataclass
+class TDigest:
+    """Centroid summary of one distribution."""
+
+    means: np.ndarray
+    weights: np.ndarray
+    min: float
+    max: float
+    compression: float = DEFAULT_COMPRESSION
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    @classmethod
+    def from_values(cls, values: Iterable[float], compression: float = DEFAULT_COMPRESSION) -> "TDigest":
+        digests = build_group_digests(np.zeros(0), np.asarray(list(values), dtype=float), compression)
+        return digests.get(0) or cls(np.zeros(0), np.zeros(0), np.nan, np.nan, compression)
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Return a digest summarising both inputs."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+        means = np.concatenate([self.means, other.means])
+        weights = np.concatenate([self.weights, other.weights])
+        order = np.argsort(means, kind="stable")
+        _, new_means, new_weights = _compress(
+            np.zeros(len(means), dtype=np.int64), means[order], weights[order], self.compression
+        )
+        return TDigest(new_means, new_weights, min(self.min, other.min), max(self.max, other.max), self.compression)
+
+    def quantile(self, q: float | Sequence[float]) -> float | np.ndarray:
+        """Interpolated quantile(s) for ``q`` in [0, 1]."""
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        centers = np.cumsum(self.weights) - self.weights / 2
+        xp = np.r_[0.0, centers, self.count]
+        fp = np.r_[self.min, self.means, self.max]
+        result = np.interp(np.asarray(q, dtype=float) * self.count, xp, fp)
+        return float(result) if np.ndim(result) == 0 else result
+
+    def to_dict(self) -> dict:
+        return {
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+            "min": self.min,
+            "max": self.max,
+            "compression": self.compression,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TDigest":
+        return cls(
+            np.asarray(data["means"], dtype=float),
+            np.asarray(data["weights"], dtype=float),
+            float(data["min"]),
+            float(data["max"]),
+            float(data.get("compression", DEFAULT_COMPRESSION)),
+        )
+
+
+def build_group_digests(
+    keys: np.ndarray | pd.Series | Sequence,
+    values: np.ndarray | pd.Series,
+    compression: float = DEFAULT_COMPRESSION,
+) -> dict[Hashable, TDigest]:
+    """Build one digest per distinct key in a single vectorized pass.
+
+    ``keys`` may be empty, in which case all values go into key ``0``. NaN
+    values are ignored.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(keys) == 0:
+        codes, uniques = np.zeros(len(values), dtype=np.int64), np.array([0])
+    else:
+        codes, uniques = pd.factorize(pd.Series(keys) if not isinstance(keys, pd.Series) else keys)
+    valid = ~np.isnan(values) & (codes >= 0)
+    codes, values = codes[valid], values[valid]
+    if len(values) == 0:
+        return {}
+
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)] - 1
+
+    groups, means, weights = _compress(codes, values, np.ones(len(values)), compression)
+    splits = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    bounds = np.r_[splits, len(groups)]
+    digests: dict[Hashable, TDigest] = {}
+    for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+        key = uniques[groups[lo]]
+        digests[key] = TDigest(
+            means[lo:hi], weights[lo:hi], float(values[starts[i]]), float(values[ends[i]]), compression
+        )
+    return digests
+
+
+def merge_digests(*collections: dict[Hashable, TDigest]) -> dict[Hashable, TDigest]:
+    """Merge several ``{key: digest}`` maps key by key."""
+    merged: dict[Hashable, TDigest] = {}
+    for collection in collections:
+        for key, digest in collection.items():
+            merged[key] = merged[key].merge(digest) if key in merged else digest
+    return merged
+
+
+def digest_quantiles(
+    digests: dict[Hashable, TDigest],
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    key_name: str = "key",
+) -> pd.DataFrame:
+    """Tabulate quantiles per key, with columns ``p10``/``p50``/``p90`` style names."""
+    names = [f"p{round(q * 100):02d}" for q in quantiles]
+    rows = [[key, *np.atleast_1d(d.quantile(quantiles))] for key, d in digests.items()]
+    return pd.DataFrame(rows, columns=[key_name, *names])
+
+
+def save_digests(digests: dict[str, TDigest], path: Path) -> None:
+    path.write_text(json.dumps({str(k): d.to_dict() for k, d in digests.items()}))
+
+
+def load_digests(path: Path) -> dict[str, TDigest] | None:
+    if not path.exists():
+        return None
+    try:
+        return {k: TDigest.from_dict(v) for k, v in json.loads(path.read_text()).items()}
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def team_occi_digests(
+    df_conflict: pd.DataFrame,
+    team_col: str = "posteam",
+    score_col: str = "conflict_score",
+    compression: float = DEFAULT_COMPRESSION,
+) -> dict[str, TDigest]:
+    """Digest play-level scores per team (per ``season|team`` when a season column exists).
+
+    Plays without a team (or season) are dropped, as in the game and season aggregates.
+    """
+    keys = [team_col, "season"] if "season" in df_conflict.columns else [team_col]
+    df = df_conflict[df_conflict[keys].notna().all(axis=1)]
+    # Combine integer codes and build each "season|team" label once per group,
+    # not once per play.
+    team_codes, teams = pd.factorize(df[team_col])
+    labels = np.asarray(teams, dtype=object).astype(str)
+    if "season" in df.columns:
+        season_codes, seasons = pd.factorize(df["season"])
+        season_labels = pd.Series(seasons).astype("Int64").astype(str).to_numpy()
+        pair_codes, pairs = pd.factorize(season_codes * len(teams) + team_codes)
+        labels = np.array([f"{season_labels[p // len(teams)]}|{labels[p % len(teams)]}" for p in pairs], dtype=object)
+        team_codes = pair_codes
+    digests = build_group_digests(team_codes, df[score_col], compression)
+    return {labels[code]: digest for code, digest in digests.items()}
+
+
+def team_occi_quantiles(digests: dict[str, TDigest]) -> pd.DataFrame:
+    """Return season, team, occi_p10, occi_median and occi_p90 from team digests."""
+    table = digest_quantiles(digests, DEFAULT_QUANTILES).rename(
+        columns={"p10": "occi_p10", "p50": "occi_median", "p90": "occi_p90"}
+    )
+    parts = table.pop("key").str.rsplit("|", n=1, expand=True)
+    if parts.shape[1] == 2:
+        table.insert(0, "season", pd.to_numeric(parts[0]))
+        table.insert(1, "team", parts[1])
+    else:
+        table.insert(0, "team", parts[0])
+    return table
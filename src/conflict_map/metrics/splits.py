@@ -0,0 +1,107 @@
+"""
+Team OCCI splits by situation, opponent, personnel, down and target depth.
+
+Rather than running one groupby per split, every grouping set is computed in
+a single pass: the team key and each split column are factorized to integer
+codes once, each (grouping set, team, value) triple is mapped to a slot in one
+flat key space, and counts, sums and squared deviations are accumulated with
+``np.bincount``.
+
+The result is a compact long-format table with columns:
+- season (when available)
+- team
+- split (the dimension name, e.g. ``situation_bucket``)
+- value (the dimension value as a string, ``missing`` for nulls)
+- plays
+- occi_mean
+- occi_std (sample standard deviation, NaN for single plays)
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+SPLIT_DIMENSIONS = ("situation_bucket", "defteam", "personnel_group", "down", "target_depth_bucket")
+MISSING_LABEL = "missing"
+
+
+def _label(value) -> str:
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def compute_team_occi_splits(
+    df_conflict: pd.DataFrame,
+    dimensions: Sequence[str] = SPLIT_DIMENSIONS,
+    team_col: str = "posteam",
+    score_col: str = "conflict_score",
+) -> pd.DataFrame:
+    """Compute OCCI count/mean/std for team x each split dimension in one pass.
+
+    Dimensions missing from ``df_conflict`` are skipped. When a ``season``
+    column is present the team key is (season, team).
+    """
+    dims = [d for d in dimensions if d in df_conflict.columns]
+    group_cols = [c for c in ("season", team_col) if c in df_conflict.columns]
+    columns = [*group_cols, "split", "value", "plays", "occi_mean", "occi_std"]
+    if not dims or team_col not in df_conflict.columns or df_conflict.empty:
+        return pd.DataFrame(columns=columns).rename(columns={team_col: "team"})
+
+    scores = df_conflict[score_col].to_numpy(dtype=float)
+    valid = ~np.isnan(scores)
+
+    # Integer-code the team key once, then compact it to 0..n_groups-1.
+    group_codes = np.zeros(len(df_conflict), dtype=np.int64)
+    for col in group_cols:
+        codes, uniques = pd.factorize(df_conflict[col])
+        valid &= codes >= 0
+        group_codes = group_codes * (len(uniques) + 1) + codes + 1
+    group_codes, group_uniques = pd.factorize(group_codes)
+    n_groups = len(group_uniques)
+
+    # Lay every (dimension, group, value) out in one flat key space.
+    keys: list[np.ndarray] = []
+    labels: list[list[str]] = []
+    offsets = [0]
+    for dim in dims:
+        codes, uniques = pd.factorize(df_conflict[dim], use_na_sentinel=True)
+        n_values = len(uniques) + 1  # trailing slot for nulls
+        codes = np.where(codes < 0, n_values - 1, codes)
+        keys.append(offsets[-1] + group_codes * n_values + codes)
+        labels.append([_label(v) for v in uniques] + [MISSING_LABEL])
+        offsets.append(offsets[-1] + n_groups * n_values)
+
+    flat_keys = np.concatenate(keys)
+    flat_scores = np.tile(scores, len(dims))
+    flat_valid = np.tile(valid, len(dims))
+    flat_keys, flat_scores = flat_keys[flat_valid], flat_scores[flat_valid]
+
+    size = offsets[-1]
+    counts = np.bincount(flat_keys, minlength=size)
+    sums = np.bincount(flat_keys, weights=flat_scores, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+        squared = np.bincount(flat_keys, weights=(flat_scores - means[flat_keys]) ** 2, minlength=size)
+        stds = np.sqrt(np.where(counts > 1, squared / (counts - 1), np.nan))
+
+    # Decode occupied slots back into (dimension, group, value).
+    slots = np.flatnonzero(counts)
+    dim_idx = np.searchsorted(offsets, slots, side="right") - 1
+    local = slots - np.asarray(offsets)[dim_idx]
+    n_values = np.array([len(l) for l in labels])[dim_idx]
+    group_idx, value_idx = np.divmod(local, n_values)
+
+    # Recover the original (season, team) values for each group code.
+    first_row = np.unique(group_codes, return_index=True)[1]
+    result = {
+        col: df_conflict[col].to_numpy()[first_row[group_idx]] for col in group_cols
+    }
+    result["split"] = np.asarray(dims, dtype=object)[dim_idx]
+    result["value"] = [labels[d][v] for d, v in zip(dim_idx, value_idx)]
+    result["plays"] = counts[slots]
+    result["occi_mean"] = means[slots]
+    result["occi_std"] = stds[slots]
+    return pd.DataFrame(result, columns=columns).rename(columns={team_col: "team"})
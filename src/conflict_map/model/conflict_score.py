@@ -4,12 +4,26 @@ Computation of play level conflict scores.
 This module exposes:
 - compute_conflict_score_row: pure function from row -> float.
 - compute_conflict_scores: vectorized function over a DataFrame.
+- heuristic_scores: the vectorized kernel on plain arrays. It holds the
+  weights; the two functions above and the one-pass engine in
+  ``model.unified`` all score through it.
 """
 from __future__ import annotations
 
 import numpy as np
 import pandas as pd
 
+# Engineered columns read by the heuristic; everything else is ignored.
+SCORING_COLUMNS = (
+    "has_motion",
+    "has_play_action",
+    "num_te",
+    "num_wr",
+    "situation_bucket",
+    "defensive_stress_penalty",
+    "epa",
+)
+
 
 def compute_conflict_score_row(row: pd.Series) -> float:
     """
@@ -21,32 +35,51 @@ def compute_conflict_score_row(row: pd.Series) -> float:
     - Defensive stress hints (penalties).
     - Offensive success proxy (epa or first down).
 
-    This is a heuristic on public data, not a ground truth measurement.
+    This is a heuristic on public data, not a ground truth measurement. The
+    weights live in ``heuristic_scores``; this runs it on a one-play batch so
+    live, batch and service scores cannot drift apart.
     """
-    score = 0.0
-
-    if bool(row.get("has_motion", False)):
-        score += 0.15
-    if bool(row.get("has_play_action", False)):
-        score += 0.15
-
-    num_receivers = float(row.get("num_te", 0)) + float(row.get("num_wr", 0))
-    score += min(num_receivers * 0.03, 0.18)
-
     situation = row.get("situation_bucket", "normal")
-    if situation == "third_and_medium":
-        score += 0.15
-    elif situation == "red_zone":
-        score += 0.10
-
-    if bool(row.get("defensive_stress_penalty", False)):
-        score += 0.2
-
     epa = row.get("epa", 0.0)
-    if pd.notnull(epa):
-        score += max(min(epa, 1.0), -0.5) * 0.25
+    scores = heuristic_scores(
+        np.array([bool(row.get("has_motion", False))]),
+        np.array([bool(row.get("has_play_action", False))]),
+        np.array([float(row.get("num_te", 0)) + float(row.get("num_wr", 0))]),
+        np.array([situation == "third_and_medium"]),
+        np.array([situation == "red_zone"]),
+        np.array([bool(row.get("defensive_stress_penalty", False))]),
+        np.array([float(epa) if pd.notnull(epa) else np.nan]),
+    )
+    return float(scores[0])
+
+
+def heuristic_scores(
+    has_motion: np.ndarray,
+    has_play_action: np.ndarray,
+    num_receivers: np.ndarray,
+    third_and_medium: np.ndarray,
+    red_zone: np.ndarray,
+    stress_penalty: np.ndarray,
+    epa: np.ndarray,
+) -> np.ndarray:
+    """Conflict scores from per-play arrays (booleans, float counts and EPA).
+
+    This is the only implementation of the heuristic: ``compute_conflict_scores``,
+    ``compute_conflict_score_row`` and the one-pass engine all call it.
+    Missing EPA (NaN) adds nothing.
+    """
+    score = np.zeros(len(epa))
+    score = score + np.where(has_motion, 0.15, 0.0)
+    score = score + np.where(has_play_action, 0.15, 0.0)
+    score = score + np.minimum(num_receivers * 0.03, 0.18)
+    score = score + np.select([third_and_medium, red_zone], [0.15, 0.10], 0.0)
+    score = score + np.where(stress_penalty, 0.2, 0.0)
+    score = np.where(np.isnan(epa), score, score + np.clip(epa, -0.5, 1.0) * 0.25)
+    return np.clip(score, 0.0, 1.0)
+
 
-    return float(max(0.0, min(1.0, score)))
+def _column(df: pd.DataFrame, name: str, default) -> pd.Series:
+    return df[name] if name in df.columns else pd.Series(default, index=df.index)
 
 
 def compute_conflict_scores(df: pd.DataFrame, score_col: str = "conflict_score") -> pd.DataFrame:
@@ -55,8 +88,21 @@ def compute_conflict_scores(df: pd.DataFrame, score_col: str = "conflict_score")
 
     Adds a new column `score_col` with values in [0, 1].
 
-    The input DataFrame must already contain engineered features.
+    The input DataFrame must already contain engineered features. Scores are
+    identical to applying ``compute_conflict_score_row`` to every row, since
+    both call ``heuristic_scores``.
     """
     df = df.copy()
-    df[score_col] = df.apply(compute_conflict_score_row, axis=1)
+    num_receivers = _column(df, "num_te", 0).astype(float) + _column(df, "num_wr", 0).astype(float)
+    situation = _column(df, "situation_bucket", "normal")
+    scores = heuristic_scores(
+        _column(df, "has_motion", False).astype(bool).to_numpy(),
+        _column(df, "has_play_action", False).astype(bool).to_numpy(),
+        num_receivers.to_numpy(),
+        (situation == "third_and_medium").to_numpy(),
+        (situation == "red_zone").to_numpy(),
+        _column(df, "defensive_stress_penalty", False).astype(bool).to_numpy(),
+        _column(df, "epa", 0.0).astype(float).to_numpy(),
+    )
+    df[score_col] = scores
     return df
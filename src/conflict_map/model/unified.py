@@ -0,0 +1,219 @@
+"""
+One-pass engine for both conflict indices.
+
+The legacy ``occi.OCCICalculator`` (0-100 ``occi`` from six component scores)
+and ``compute_conflict_scores`` (0-1 ``conflict_score`` from engineered
+features) read overlapping raw columns, but each copies the whole play frame
+and scans it on its own. ``compute_play_indices`` reads every column either
+index needs (``ENGINE_COLUMNS``) into a numpy array once, derives the OCCI
+components and the conflict heuristic's inputs from those shared arrays and
+returns one narrow frame with both indices. ``compute_unified_indices`` adds
+the aggregates a dashboard shows: the team table from
+``OCCICalculator.calculate_team_occi`` extended with conflict score columns,
+and ``compute_team_game_occi`` on the conflict score.
+
+``OCCICalculator`` and ``compute_conflict_scores`` keep their interfaces and
+call the same kernels (``occi_components``/``occi_index`` and
+``heuristic_scores``), so all three paths produce identical numbers.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from ..features.build_features import parse_personnel_counts, situation_masks, stress_penalty_flags
+from ..metrics.occi import compute_team_game_occi
+from .conflict_score import heuristic_scores
+
+OCCI_WEIGHTS = {
+    "motion": 0.15,
+    "formation": 0.20,
+    "target_depth": 0.20,
+    "play_action": 0.15,
+    "personnel": 0.15,
+    "situational": 0.15,
+}
+# Maximum meaningful passing depth in yards for normalization.
+MAX_TARGET_DEPTH = 50.0
+
+# Raw columns the OCCI components require.
+OCCI_COLUMNS = (
+    "no_huddle",
+    "shotgun",
+    "pass_attempt",
+    "rush_attempt",
+    "qb_dropback",
+    "air_yards",
+    "down",
+    "ydstogo",
+    "yardline_100",
+    "score_differential",
+)
+# Raw columns the conflict heuristic reads when present.
+CONFLICT_COLUMNS = ("motion", "play_action", "personnel_offense", "penalty_type", "epa")
+# Identifiers carried through to the output frame when present.
+KEY_COLUMNS = ("season", "week", "game_id", "play_id", "posteam", "defteam", "drive", "series")
+ENGINE_COLUMNS = KEY_COLUMNS + OCCI_COLUMNS + CONFLICT_COLUMNS
+
+
+def _values(df: pd.DataFrame, col: str, default: float | None = None) -> np.ndarray:
+    """Column as float64 with NaN for nulls; ``default`` fills a missing column."""
+    if col not in df.columns:
+        if default is None:
+            raise KeyError(col)
+        return np.full(len(df), default, dtype=float)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+def _flags(df: pd.DataFrame, col: str) -> np.ndarray:
+    """``astype(bool)`` of a column, as ``engineer_basic_features`` does; False when missing."""
+    return df[col].astype(bool).to_numpy() if col in df.columns else np.zeros(len(df), dtype=bool)
+
+
+def occi_components(
+    df: pd.DataFrame,
+    max_target_depth: float = MAX_TARGET_DEPTH,
+    arrays: Mapping[str, np.ndarray] | None = None,
+) -> dict[str, np.ndarray]:
+    """The six OCCI component scores, keyed ``<component>_score``.
+
+    ``arrays`` can supply already-loaded columns from ``OCCI_COLUMNS``.
+    """
+    arrays = arrays if arrays is not None else {col: _values(df, col) for col in OCCI_COLUMNS}
+    no_huddle = arrays["no_huddle"] == 1
+    shotgun = arrays["shotgun"] == 1
+    is_pass = arrays["pass_attempt"] == 1
+    is_rush = arrays["rush_attempt"] == 1
+    down = np.nan_to_num(arrays["down"], nan=1)
+
+    # Motion: no huddle or shotgun as a proxy for pre-snap movement.
+    motion = np.where(no_huddle, 1.0, np.where(shotgun, 0.6, 0.3))
+
+    # Formation: shotgun is more spread than under center; no huddle adds complexity.
+    formation = np.clip(np.where(shotgun, 0.7, 0.4) + np.where(no_huddle, 0.3, 0.0), 0, 1)
+
+    # Target depth: deeper targets create more conflict; runs get a fixed score.
+    depth = np.clip(np.nan_to_num(arrays["air_yards"], nan=0) / max_target_depth, 0, 1)
+    target_depth = np.where(is_pass, depth, 0.4)
+
+    play_action = np.where(is_pass, np.where(arrays["qb_dropback"] == 1, 0.7, 0.3), 0.5)
+
+    # Personnel: unexpected calls (pass on early downs, run on 3rd+ and long).
+    ydstogo = np.nan_to_num(arrays["ydstogo"], nan=10)
+    unexpected = ((down <= 2) & is_pass) | ((down >= 3) & (ydstogo >= 7) & is_rush)
+    personnel = np.clip(np.where(is_pass, 0.6, 0.4) + np.where(unexpected, 0.2, 0.0), 0, 1)
+
+    # Situational: scoring position, late downs and close games.
+    situational = np.ones(len(down)) * 0.5
+    situational += np.where(np.nan_to_num(arrays["yardline_100"], nan=50) <= 20, 0.2, 0)
+    situational += np.where(down >= 3, 0.2, 0)
+    situational += np.where(np.abs(np.nan_to_num(arrays["score_differential"], nan=0)) <= 7, 0.1, 0)
+    situational = np.clip(situational, 0, 1)
+
+    return {
+        "motion_score": motion,
+        "formation_score": formation,
+        "target_depth_score": target_depth,
+        "play_action_score": play_action,
+        "personnel_score": personnel,
+        "situational_score": situational,
+    }
+
+
+def occi_index(components: Mapping[str, np.ndarray], weights: Mapping[str, float] = OCCI_WEIGHTS) -> np.ndarray:
+    """Weighted sum of the components on a 0-100 scale."""
+    occi = (
+        components["motion_score"] * weights["motion"]
+        + components["formation_score"] * weights["formation"]
+        + components["target_depth_score"] * weights["target_depth"]
+        + components["play_action_score"] * weights["play_action"]
+        + components["personnel_score"] * weights["personnel"]
+        + components["situational_score"] * weights["situational"]
+    )
+    return occi * 100
+
+
+def _conflict_scores(df: pd.DataFrame, arrays: Mapping[str, np.ndarray]) -> np.ndarray:
+    """``compute_conflict_scores(engineer_basic_features(df))`` from the shared arrays."""
+    if "personnel_offense" in df.columns:
+        counts = parse_personnel_counts(df["personnel_offense"])
+        num_receivers = counts["num_te"].to_numpy(dtype=float) + counts["num_wr"].to_numpy(dtype=float)
+    else:
+        num_receivers = np.zeros(len(df))
+    red_zone, third_and_medium = situation_masks(arrays["down"], arrays["ydstogo"], arrays["yardline_100"])
+    return heuristic_scores(
+        _flags(df, "motion"),
+        _flags(df, "play_action"),
+        num_receivers,
+        third_and_medium,
+        red_zone,
+        stress_penalty_flags(df),
+        _values(df, "epa", 0.0),
+    )
+
+
+def compute_play_indices(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """Both indices for every raw play in one pass.
+
+    Returns a frame aligned to ``df_raw`` with the ``KEY_COLUMNS`` present,
+    ``pass_attempt``/``rush_attempt``, the six OCCI component scores, ``occi``
+    and ``conflict_score``. The wide input frame is never copied.
+    """
+    arrays = {col: _values(df_raw, col) for col in OCCI_COLUMNS}
+    components = occi_components(df_raw, arrays=arrays)
+    keys = [col for col in KEY_COLUMNS if col in df_raw.columns]
+    return df_raw[[*keys, "pass_attempt", "rush_attempt"]].assign(
+        **components,
+        occi=occi_index(components),
+        conflict_score=_conflict_scores(df_raw, arrays),
+    )
+
+
+def team_index_summary(plays: pd.DataFrame, team_col: str = "posteam") -> pd.DataFrame:
+    """Per-team table of both indices from ``compute_play_indices`` output.
+
+    The OCCI columns match ``OCCICalculator.calculate_team_occi`` (rounded to
+    two decimals, sorted by ``avg_occi``); ``avg_conflict_score`` and
+    ``conflict_score_std`` are rounded to four.
+    """
+    grouped = plays.groupby(team_col, observed=True)
+    stats = grouped.agg(
+        avg_occi=("occi", "mean"),
+        occi_std=("occi", "std"),
+        median_occi=("occi", "median"),
+        total_plays=("occi", "count"),
+        pass_plays=("pass_attempt", "sum"),
+        rush_plays=("rush_attempt", "sum"),
+    ).round(2)
+    stats["pass_rate"] = (stats["pass_plays"] / stats["total_plays"] * 100).round(1)
+    conflict = grouped["conflict_score"].agg(["mean", "std"]).round(4)
+    stats["avg_conflict_score"] = conflict["mean"]
+    stats["conflict_score_std"] = conflict["std"]
+    stats = stats.sort_values("avg_occi", ascending=False)
+    return stats.reset_index()
+
+
+@dataclass
+class UnifiedIndices:
+    """Both indices per play plus their team and team-game aggregates."""
+
+    plays: pd.DataFrame
+    teams: pd.DataFrame
+    team_games: pd.DataFrame
+
+
+def compute_unified_indices(df_raw: pd.DataFrame) -> UnifiedIndices:
+    """Score raw plays once and aggregate both indices.
+
+    ``team_games`` is ``compute_team_game_occi`` on the conflict score, as the
+    pipeline writes it; it is empty when ``game_id`` is absent.
+    """
+    plays = compute_play_indices(df_raw)
+    if "game_id" in plays.columns:
+        team_games = compute_team_game_occi(plays)
+    else:
+        team_games = pd.DataFrame(columns=["game_id", "team", "plays", "occi_mean", "occi_std"])
+    return UnifiedIndices(plays=plays, teams=team_index_summary(plays), team_games=team_games)
@@ -0,0 +1,205 @@
+"""
+Stage memoization for pipeline runs.
+
+``StageExecutor`` wires pipeline stages into a small graph. A stage's key
+hashes its name, the source code of the functions/modules it runs, its
+parameters and the keys of its inputs. Raw inputs are keyed by file content:
+each file's SHA-1 is kept in ``<cache_dir>/files.json`` next to its size and
+mtime, so unchanged files are only ``stat``-ed on later runs. Stage outputs
+are pickled to ``<cache_dir>/<stage>/<key>.pkl``.
+
+Keys chain, so they can all be computed before any data is touched, and
+``Memo.value`` only loads or computes upstream results on a miss. A rerun
+where nothing changed therefore reads no raw files and no cached frames.
+
+With ``cache_dir=None`` nothing is hashed or stored and every stage simply
+runs, which is how ``run_pipeline`` behaves unless given a cache directory.
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+import pandas as pd
+
+from .instrumentation import PipelineRecorder
+
+FILE_MANIFEST = "files.json"
+# Cached outputs kept per stage; older entries are pruned on save.
+KEEP_ENTRIES = 3
+_HASH_CHUNK = 1 << 20
+
+
+def _sha1(parts: Iterable[str]) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def code_version(*objects: Any) -> str:
+    """Hash the source of functions, classes or modules a stage depends on."""
+    return _sha1(f"{getattr(obj, '__qualname__', obj.__name__)}:{inspect.getsource(obj)}" for obj in objects)
+
+
+def _file_sha1(path: Path) -> str:
+    digest = hashlib.sha1()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class RawFiles:
+    """Raw input backed by files: keyed by their content, loaded only when needed."""
+
+    paths: Sequence[Path]
+    load: Callable[[], pd.DataFrame]
+
+
+class Memo:
+    """A stage result that is loaded from the cache or computed on first use."""
+
+    def __init__(
+        self,
+        executor: "StageExecutor",
+        name: str,
+        key: str | None,
+        compute: Callable[..., Any],
+        inputs: Sequence["Memo"] = (),
+        store: bool = True,
+    ):
+        self.executor = executor
+        self.name = name
+        self.key = key
+        self.compute = compute
+        self.inputs = list(inputs)
+        self.store = store
+        self._done = False
+        self._value: Any = None
+
+    @property
+    def cached(self) -> bool:
+        return self.store and self.executor.has(self.name, self.key)
+
+    def value(self) -> Any:
+        if not self._done:
+            if self.cached:
+                with self.executor.recorder.stage(self.name) as stage:
+                    stage.cached = True
+                    self._value = self.executor.load(self.name, self.key)
+            else:
+                self._value = self.compute(*[memo.value() for memo in self.inputs])
+                if self.store:
+                    self.executor.save(self.name, self.key, self._value)
+            self._done = True
+        return self._value
+
+
+class StageExecutor:
+    """Build memoized stages and persist their outputs under ``cache_dir``."""
+
+    def __init__(self, cache_dir: Path | None = None, recorder: PipelineRecorder | None = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.recorder = recorder or PipelineRecorder()
+        self._manifest: dict | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache_dir is not None
+
+    def file_fingerprint(self, paths: Iterable[Path]) -> str:
+        """Content key for ``paths``; hashes are reused while size and mtime match."""
+        manifest_path = self.cache_dir / FILE_MANIFEST
+        if self._manifest is None:
+            try:
+                self._manifest = json.loads(manifest_path.read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._manifest = {}
+        parts, changed = [], False
+        for path in paths:
+            path = Path(path).resolve()
+            stat = path.stat()
+            entry = self._manifest.get(str(path))
+            if entry is None or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": _file_sha1(path)}
+                self._manifest[str(path)] = entry
+                changed = True
+            parts.append(f"{path.name}:{entry['sha1']}")
+        if changed:
+            self._write_atomic(manifest_path, json.dumps(self._manifest, indent=2).encode())
+        return _sha1(parts)
+
+    def source(self, raw: pd.DataFrame | RawFiles, code: Sequence[Any] = ()) -> Memo:
+        """Root of the graph: an in-memory frame or a ``RawFiles`` input.
+
+        Sources are never stored; they are already on disk or in memory and
+        only their key matters. ``code`` versions a ``RawFiles`` loader.
+        """
+        key = None
+        if isinstance(raw, RawFiles):
+            if self.enabled:
+                key = _sha1(["files", self.file_fingerprint(raw.paths), code_version(*code) if code else ""])
+            return Memo(self, "load", key, raw.load, store=False)
+        if self.enabled:
+            hashed = pd.util.hash_pandas_object(raw, index=False).to_numpy().tobytes()
+            key = _sha1(["frame", ",".join(map(str, raw.columns)), hashlib.sha1(hashed).hexdigest()])
+        return Memo(self, "frame", key, lambda: raw, store=False)
+
+    def stage(
+        self,
+        name: str,
+        compute: Callable[..., Any],
+        inputs: Sequence[Memo] = (),
+        code: Sequence[Any] = (),
+        params: dict | None = None,
+    ) -> Memo:
+        """A memoized stage computing ``compute(*input values)``."""
+        key = None
+        if self.enabled:
+            key = _sha1(
+                [name, code_version(*code), json.dumps(params or {}, sort_keys=True, default=str)]
+                + [memo.key for memo in inputs]
+            )
+        return Memo(self, name, key, compute, inputs)
+
+    def combined_key(self, memos: Iterable[Memo]) -> str | None:
+        """Key identifying a set of outputs, e.g. to skip rewriting unchanged files."""
+        if not self.enabled:
+            return None
+        return _sha1(memo.key for memo in memos)
+
+    def _path(self, name: str, key: str) -> Path:
+        return self.cache_dir / name / f"{key}.pkl"
+
+    def has(self, name: str, key: str | None) -> bool:
+        return self.enabled and key is not None and self._path(name, key).exists()
+
+    def load(self, name: str, key: str) -> Any:
+        with self._path(name, key).open("rb") as handle:
+            return pickle.load(handle)
+
+    def save(self, name: str, key: str | None, value: Any) -> None:
+        if not self.enabled or key is None:
+            return
+        path = self._path(name, key)
+        self._write_atomic(path, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        entries = sorted(path.parent.glob("*.pkl"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+        for stale in entries[KEEP_ENTRIES:]:
+            stale.unlink(missing_ok=True)
+
+    @staticmethod
+    def _write_atomic(path: Path, payload: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+
@@ -0,0 +1,119 @@
+"""Per-stage timing, row counts, memory and byte accounting for pipeline runs."""
+from __future__ import annotations
+
+import cProfile
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+try:  # ``resource`` is POSIX only.
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+
+def peak_rss_mb() -> float | None:
+    """Return the process high-water resident set size in MiB, if available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Shallow in-memory size of a frame (object payloads are not walked)."""
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+
+def file_bytes(paths: Iterable[Path]) -> int:
+    return int(sum(Path(p).stat().st_size for p in paths if Path(p).exists()))
+
+
+@dataclass
+class StageMetrics:
+    """Measurements for one executed stage."""
+
+    name: str
+    seconds: float = 0.0
+    rows_in: int | None = None
+    rows_out: int | None = None
+    bytes_in: int | None = None
+    bytes_out: int | None = None
+    peak_rss_mb: float | None = None
+    profile: str | None = None
+    cached: bool = False
+
+    def output(self, df: pd.DataFrame) -> None:
+        """Record ``df`` as the stage output."""
+        self.rows_out = int(len(df))
+        self.bytes_out = frame_bytes(df)
+
+
+class PipelineRecorder:
+    """Collect :class:`StageMetrics` for a run.
+
+    When ``profile_dir`` is set each stage also runs under cProfile and its
+    stats are dumped to ``<profile_dir>/<nn>_<stage>.pstats``. When
+    ``log_path`` is set every finished stage is appended to that file as one
+    JSON object per line.
+    """
+
+    def __init__(self, profile_dir: Path | None = None, log_path: Path | None = None):
+        self.profile_dir = profile_dir
+        self.log_path = log_path
+        self.stages: list[StageMetrics] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int | None = None, bytes_in: int | None = None) -> Iterator[StageMetrics]:
+        metrics = StageMetrics(name=name, rows_in=rows_in, bytes_in=bytes_in)
+        profiler = cProfile.Profile() if self.profile_dir is not None else None
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield metrics
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            metrics.seconds = round(time.perf_counter() - start, 6)
+            metrics.peak_rss_mb = peak_rss_mb()
+            if profiler is not None:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                target = self.profile_dir / f"{len(self.stages):02d}_{name}.pstats"
+                profiler.dump_stats(target)
+                metrics.profile = str(target)
+            self.record(metrics)
+
+    def record(self, metrics: StageMetrics) -> None:
+        """Add a stage measured outside ``stage``, e.g. one run by worker threads."""
+        self.stages.append(metrics)
+        self._log({"event": "stage", **asdict(metrics)})
+
+    def to_metadata(self) -> dict:
+        """Summary suitable for ``occi_run_metadata.json``."""
+        return {
+            "total_seconds": round(time.perf_counter() - self._started, 6),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": [asdict(stage) for stage in self.stages],
+        }
+
+    def log_summary(self) -> None:
+        self._log({"event": "run", **self.to_metadata()})
+
+    def _log(self, record: dict) -> None:
+        if self.log_path is None:
+            return
+        record = {"timestamp": datetime.now(timezone.utc).isoformat(), **record}
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.log_path.open("a") as handle:
+            handle.write(json.dumps(record) + "\n")
@@ -0,0 +1,354 @@
+"""
+Live in-game OCCI from a feed of play events.
+
+Plays arrive one at a time as JSON objects with nflverse column names, from a
+tailed JSON-lines file or a TCP socket (``replay_to_file``/``serve_replay``
+stand in for a real provider by replaying a pbp file). Each play goes through
+``engineer_play_features`` (the single-play equivalent of
+``engineer_basic_features``) and ``compute_conflict_score_row``, then updates a
+Welford running mean/variance for its team-game, so the work per play is
+constant no matter how far into the game or week the feed is.
+"""
+from __future__ import annotations
+
+import json
+import math
+import queue
+import re
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping
+
+import pandas as pd
+
+from ..features.build_features import (
+    PERSONNEL_PATTERN,
+    STRESS_PENALTIES,
+    TARGET_DEPTH_BINS,
+    TARGET_DEPTH_LABELS,
+    classify_situation,
+)
+from ..model.conflict_score import compute_conflict_score_row
+
+_PERSONNEL = re.compile(PERSONNEL_PATTERN)
+POLL_INTERVAL = 0.05
+_RECV_BYTES = 1 << 16
+
+
+def _missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _count(match: re.Match | None, group: str) -> int:
+    return int(match.group(group)) if match else 0
+
+
+def _depth_bucket(air_yards: float):
+    for lower, upper, label in zip(TARGET_DEPTH_BINS[:-1], TARGET_DEPTH_BINS[1:], TARGET_DEPTH_LABELS):
+        if lower < air_yards <= upper:
+            return label
+    return math.nan
+
+
+def engineer_play_features(play: Mapping) -> dict:
+    """Add the ``engineer_basic_features`` columns to a single play mapping.
+
+    Missing values (``None`` or NaN) behave as they do in the DataFrame
+    version, e.g. a missing ``motion`` counts as motion, just as
+    ``astype(bool)`` treats NaN as True.
+    """
+    row = {key: (math.nan if value is None else value) for key, value in play.items()}
+
+    personnel = row.get("personnel_offense")
+    match = _PERSONNEL.search(personnel) if isinstance(personnel, str) else None
+    row["num_rb"] = _count(match, "num_rb")
+    row["num_te"] = _count(match, "num_te")
+    row["num_wr"] = _count(match, "num_wr")
+
+    row["has_motion"] = bool(row["motion"]) if "motion" in row else False
+    row["has_play_action"] = bool(row["play_action"]) if "play_action" in row else False
+
+    if "air_yards" in row:
+        air_yards = 0 if _missing(row["air_yards"]) else row["air_yards"]
+        row["target_air_yards"] = air_yards
+        row["target_depth_bucket"] = _depth_bucket(air_yards)
+    else:
+        row["target_air_yards"] = 0.0
+        row["target_depth_bucket"] = "unknown"
+
+    location = row.get("pass_location")
+    row["pass_location_bucket"] = "unknown" if _missing(location) else location
+
+    if "posteam_score" in row and "defteam_score" in row:
+        own, other = row["posteam_score"], row["defteam_score"]
+        row["score_diff"] = (0 if _missing(own) else own) - (0 if _missing(other) else other)
+    else:
+        row["score_diff"] = 0
+
+    row["situation_bucket"] = classify_situation(row)
+    row["defensive_stress_penalty"] = row.get("penalty_type") in STRESS_PENALTIES
+    row["personnel_group"] = f"{row['num_rb']}RB_{row['num_te']}TE_{row['num_wr']}WR"
+    return row
+
+
+@dataclass
+class RunningStats:
+    """Welford running count, mean and sample variance."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+
+class LiveOCCI:
+    """Running team-game OCCI updated one play at a time.
+
+    Plays are identified by ``(game_id, play_id)`` so a feed that resends a
+    play does not count it twice.
+    """
+
+    def __init__(self):
+        self.games: dict[tuple[str, str], RunningStats] = {}
+        self._seen: set[tuple] = set()
+
+    def process(self, play: Mapping) -> dict | None:
+        """Score one play and return the updated team-game aggregate, or None if skipped."""
+        started = time.perf_counter()
+        team, game_id = play.get("posteam"), play.get("game_id")
+        if _missing(team) or _missing(game_id):
+            return None
+        play_key = (game_id, play.get("play_id"))
+        if play_key[1] is not None and play_key in self._seen:
+            return None
+        self._seen.add(play_key)
+
+        score = compute_conflict_score_row(engineer_play_features(play))
+        stats = self.games.setdefault((game_id, team), RunningStats())
+        stats.update(score)
+        return {
+            "game_id": game_id,
+            "team": team,
+            "play_id": play.get("play_id"),
+            "conflict_score": score,
+            "plays": stats.count,
+            "occi_mean": stats.mean,
+            "occi_std": None if stats.count < 2 else stats.std,
+            "latency_ms": (time.perf_counter() - started) * 1000,
+        }
+
+    def snapshot(self) -> pd.DataFrame:
+        """Current aggregates in the layout of ``compute_team_game_occi``."""
+        rows = [
+            {"game_id": game_id, "team": team, "plays": s.count, "occi_mean": s.mean, "occi_std": s.std}
+            for (game_id, team), s in sorted(self.games.items())
+        ]
+        return pd.DataFrame(rows, columns=["game_id", "team", "plays", "occi_mean", "occi_std"])
+
+
+def _parse_line(line: str) -> dict | None:
+    line = line.strip()
+    return json.loads(line) if line else None
+
+
+def tail_file(
+    path: Path,
+    follow: bool = True,
+    stop: threading.Event | None = None,
+    poll_interval: float = POLL_INTERVAL,
+) -> Iterator[dict]:
+    """Yield plays from a JSON-lines file, waiting for new lines when ``follow``.
+
+    A line is only parsed once its trailing newline has been written, so a
+    writer caught mid-line is never read as a truncated play.
+    """
+    path = Path(path)
+    while follow and not path.exists():
+        if stop is not None and stop.is_set():
+            return
+        time.sleep(poll_interval)
+    with path.open("r") as handle:
+        pending = ""
+        while stop is None or not stop.is_set():
+            chunk = handle.readline()
+            if chunk:
+                pending += chunk
+                if pending.endswith("\n"):
+                    play = _parse_line(pending)
+                    pending = ""
+                    if play is not None:
+                        yield play
+                continue
+            if not follow:
+                break
+            time.sleep(poll_interval)
+        if not follow and pending:
+            play = _parse_line(pending)
+            if play is not None:
+                yield play
+
+
+def iter_socket(
+    host: str, port: int, stop: threading.Event | None = None, poll_interval: float = POLL_INTERVAL
+) -> Iterator[dict]:
+    """Yield plays sent as newline-delimited JSON over a TCP connection until it closes.
+
+    Reads time out every ``poll_interval`` seconds to check ``stop``, so a
+    quiet feed can still be stopped.
+    """
+    with socket.create_connection((host, port)) as conn:
+        conn.settimeout(poll_interval)
+        pending = b""
+        while stop is None or not stop.is_set():
+            try:
+                chunk = conn.recv(_RECV_BYTES)
+            except TimeoutError:
+                continue
+            if not chunk:
+                play = _parse_line(pending.decode())
+                if play is not None:
+                    yield play
+                return
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                if stop is not None and stop.is_set():
+                    return
+                play = _parse_line(line.decode())
+                if play is not None:
+                    yield play
+
+
+def open_feed(source: str, stop: threading.Event | None = None, follow: bool = True) -> Iterator[dict]:
+    """Open ``file:<path>`` (followed like ``tail -f`` unless ``follow=False``) or ``tcp:<host>:<port>``."""
+    kind, _, target = source.partition(":")
+    if kind == "file":
+        return tail_file(Path(target), follow=follow, stop=stop)
+    if kind == "tcp":
+        host, _, port = target.rpartition(":")
+        return iter_socket(host or "127.0.0.1", int(port), stop=stop)
+    raise ValueError(f"feed source must be file:<path> or tcp:<host>:<port>, got {source!r}")
+
+
+def iter_play_records(df_raw: pd.DataFrame) -> Iterator[dict]:
+    """Yield plays in game order as JSON-safe dicts (NaN becomes None)."""
+    order = [c for c in ("game_id", "play_id") if c in df_raw.columns]
+    df = df_raw.sort_values(order, kind="stable") if order else df_raw
+    for play in df.astype(object).where(df.notna(), None).to_dict(orient="records"):
+        yield play
+
+
+def replay_to_file(plays: Iterable[dict], path: Path, delay: float = 0.0) -> int:
+    """Append plays to a JSON-lines file, flushing each one, as a tailable feed."""
+    written = 0
+    with Path(path).open("a") as handle:
+        for play in plays:
+            handle.write(json.dumps(play, default=str) + "\n")
+            handle.flush()
+            written += 1
+            if delay:
+                time.sleep(delay)
+    return written
+
+
+def serve_replay(
+    plays: Iterable[dict], host: str = "127.0.0.1", port: int = 0, delay: float = 0.0
+) -> socketserver.TCPServer:
+    """Start a background TCP server that replays ``plays`` to the first client.
+
+    Returns the server; its ``server_address`` has the bound port. Call
+    ``shutdown()`` when finished.
+    """
+    lines = [json.dumps(play, default=str) + "\n" for play in plays]
+
+    class _ReplayHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in lines:
+                self.wfile.write(line.encode())
+                self.wfile.flush()
+                if delay:
+                    time.sleep(delay)
+
+    server = socketserver.TCPServer((host, port), _ReplayHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class Broadcaster:
+    """Fan updates out to subscribers (e.g. SSE clients) through bounded queues.
+
+    A subscriber that falls ``maxsize`` updates behind loses its oldest
+    updates rather than slowing the feed down.
+    """
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._subscribers: list[queue.Queue] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        q: queue.Queue = queue.Queue(maxsize=self.maxsize)
+        with self._lock:
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def publish(self, update: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            while True:
+                try:
+                    q.put_nowait(update)
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+
+def run_live(
+    feed: Iterable[dict],
+    live: LiveOCCI | None = None,
+    on_update: Callable[[dict], None] | None = None,
+) -> LiveOCCI:
+    """Consume ``feed`` until it ends, calling ``on_update`` for every scored play."""
+    live = live or LiveOCCI()
+    for play in feed:
+        update = live.process(play)
+        if update is not None and on_update is not None:
+            on_update(update)
+    return live
+
+
+def start_live_thread(
+    source: str, broadcaster: Broadcaster, live: LiveOCCI | None = None
+) -> tuple[LiveOCCI, threading.Event]:
+    """Run ``run_live`` on ``open_feed(source)`` in a daemon thread.
+
+    Returns the aggregator (for snapshots) and an event that stops the feed.
+    """
+    live = live or LiveOCCI()
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=run_live, args=(open_feed(source, stop=stop), live, broadcaster.publish), daemon=True
+    )
+    thread.start()
+    return live, stop
@@ -0,0 +1,254 @@
+"""
+Overlapped fetch, parse and score for cold builds.
+
+``build_from_ranges`` reads every raw file, then engineers features for all
+of them, then scores them, so the network, decompression and CPU each sit
+idle while another runs. ``build_overlapped`` runs the same build as a chain
+of threads connected by bounded queues, one raw file (a season or a week of
+the latest season) at a time:
+
+    fetch (download if missing) -> parse (decompress + CSV) -> score (features + conflict score)
+
+While season N is parsed, season N+1 downloads and season N-1 is scored.
+Each queue holds at most ``queue_size`` files, so a fast producer blocks
+instead of piling up parsed frames: with one thread per step, at most
+``steps * (queue_size + 1)`` files are in flight besides the scored ones
+already collected. Files come out in their original order.
+
+Features and scores are computed per play, so scoring file by file gives the
+same numbers as scoring the concatenation. Team/game labels are encoded once,
+after the scored files are concatenated, so the category dictionaries and
+every output match ``build_from_ranges`` byte for byte. The rest of the
+pipeline (aggregates, writing, stage cache) is shared with ``run_pipeline``.
+
+``run_overlapped`` is the generic part and can chain any callables.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+import pandas as pd
+
+from ..config import RAW_DATA_DIR, WEEKLY_RAW_DATA_DIR
+from ..data.download import SEASON_URL, WEEKLY_URL, fetch_file
+from ..data.load import read_raw_csv
+from ..features.build_features import engineer_basic_features
+from ..features.encoding import CATEGORY_FILE, CategoryEncoder
+from ..model.conflict_score import compute_conflict_scores
+from ..model.learned import ConflictModel
+from .instrumentation import PipelineRecorder, StageMetrics, file_bytes
+from .updates import _dedupe_conflict_frame, _run_stages
+
+DEFAULT_QUEUE_SIZE = 1
+# How often blocked threads check whether the run was cancelled.
+_CANCEL_POLL_SECONDS = 0.1
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _put(target: queue.Queue, item: Any, cancelled: threading.Event) -> bool:
+    while not cancelled.is_set():
+        try:
+            target.put(item, timeout=_CANCEL_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(source: queue.Queue, cancelled: threading.Event) -> Any:
+    while not cancelled.is_set():
+        try:
+            return source.get(timeout=_CANCEL_POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def run_overlapped(
+    items: Iterable[Any],
+    steps: Sequence[tuple[str, Callable[[Any], Any]]],
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    busy: dict[str, float] | None = None,
+) -> Iterator[Any]:
+    """Yield ``steps`` applied in turn to each of ``items``, with the steps running concurrently.
+
+    Each named step runs in its own thread and hands results to the next
+    through a queue of at most ``queue_size`` entries. Results are yielded in
+    input order. The first exception raised by a step is re-raised here after
+    the other threads stop. ``busy`` accumulates each step's working seconds.
+    """
+    cancelled = threading.Event()
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(steps) + 1)]
+
+    def feed() -> None:
+        try:
+            for item in items:
+                if not _put(queues[0], item, cancelled):
+                    return
+        except BaseException as exc:  # e.g. a failing generator of items
+            _put(queues[0], _Failure(exc), cancelled)
+            return
+        _put(queues[0], _DONE, cancelled)
+
+    def work(index: int, name: str, func: Callable[[Any], Any]) -> None:
+        inbox, outbox = queues[index], queues[index + 1]
+        while True:
+            item = _get(inbox, cancelled)
+            if item is _DONE or isinstance(item, _Failure):
+                _put(outbox, item, cancelled)
+                return
+            start = time.perf_counter()
+            try:
+                result = func(item)
+            except BaseException as exc:
+                _put(outbox, _Failure(exc), cancelled)
+                return
+            if busy is not None:
+                busy[name] = busy.get(name, 0.0) + time.perf_counter() - start
+            if not _put(outbox, result, cancelled):
+                return
+
+    threads = [threading.Thread(target=feed, name="overlap-feed", daemon=True)]
+    threads += [
+        threading.Thread(target=work, args=(i, name, func), name=f"overlap-{name}", daemon=True)
+        for i, (name, func) in enumerate(steps)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        cancelled.set()
+        for thread in threads:
+            thread.join()
+
+
+@dataclass(frozen=True)
+class RawSource:
+    """One raw file of a build: a full season, or one week of a season."""
+
+    season: int
+    week: int | None = None
+
+    @property
+    def stem(self) -> str:
+        return f"pbp_{self.season}" if self.week is None else f"pbp_{self.season}_week_{self.week}"
+
+
+@dataclass
+class Fetcher:
+    """Resolve a ``RawSource`` to a local file, downloading it when missing.
+
+    ``season_url``/``weekly_url`` are format strings with ``{season}`` (and
+    ``{week}``); set them to None to only use files already on disk.
+    ``refresh`` downloads even when a local file exists.
+    """
+
+    data_dir: Path = RAW_DATA_DIR
+    weekly_dir: Path = WEEKLY_RAW_DATA_DIR
+    season_url: str | None = SEASON_URL
+    weekly_url: str | None = WEEKLY_URL
+    refresh: bool = False
+
+    def local_path(self, source: RawSource) -> Path | None:
+        base_dir = Path(self.data_dir if source.week is None else self.weekly_dir)
+        for ext in (".csv", ".csv.gz"):
+            candidate = base_dir / f"{source.stem}{ext}"
+            if candidate.exists():
+                return candidate
+        return None
+
+    def __call__(self, source: RawSource) -> Path:
+        path = self.local_path(source)
+        if path is not None and not self.refresh:
+            return path
+        url = self.season_url if source.week is None else self.weekly_url
+        if url is None:
+            raise FileNotFoundError(f"{source.stem}.csv(.gz) does not exist and downloading is disabled.")
+        base_dir = Path(self.data_dir if source.week is None else self.weekly_dir)
+        return fetch_file(url.format(season=source.season, week=source.week), base_dir / f"{source.stem}.csv.gz")
+
+
+def range_sources(
+    base_seasons: Iterable[int], latest_season: int | None = None, latest_weeks: Sequence[int] | None = None
+) -> list[RawSource]:
+    """The raw files ``build_from_ranges`` reads for the same arguments, in the same order."""
+    sources = [RawSource(season) for season in base_seasons]
+    if latest_season is not None:
+        if latest_weeks:
+            sources += [RawSource(latest_season, week) for week in latest_weeks]
+        else:
+            sources.append(RawSource(latest_season))
+    return sources
+
+
+def _score_frame(df_raw: pd.DataFrame, model: ConflictModel | None) -> pd.DataFrame:
+    df_feat = engineer_basic_features(df_raw)
+    return model.score(df_feat) if model is not None else compute_conflict_scores(df_feat)
+
+
+def build_overlapped(
+    sources: Sequence[RawSource],
+    output_dir: Path,
+    fetcher: Fetcher | None = None,
+    metadata: dict | None = None,
+    recorder: PipelineRecorder | None = None,
+    model: ConflictModel | None = None,
+    cache_dir: Path | None = None,
+    arrow: bool = False,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> dict[str, Path]:
+    """Fetch, parse and score ``sources`` concurrently, then run the rest of the pipeline.
+
+    Writes the same outputs as ``build_from_ranges`` over the same raw files.
+    Per-step working time is recorded as ``overlap_fetch``, ``overlap_parse``
+    and ``overlap_score``; the ``load`` stage covers the whole overlapped
+    phase, so its time against their sum shows how much the steps overlapped.
+    """
+    if not sources:
+        raise ValueError("No seasons provided. Specify base seasons or a latest season to process.")
+    recorder = recorder or PipelineRecorder()
+    fetcher = fetcher or Fetcher()
+    busy: dict[str, float] = {}
+    paths: list[Path] = []
+    rows_in = 0
+
+    def fetch(source: RawSource) -> Path:
+        path = fetcher(source)
+        paths.append(path)
+        return path
+
+    def parse(path: Path) -> pd.DataFrame:
+        nonlocal rows_in
+        df_raw = read_raw_csv(path, arrow=arrow)
+        rows_in += len(df_raw)
+        return df_raw
+
+    steps = [("fetch", fetch), ("parse", parse), ("score", lambda df: _score_frame(df, model))]
+    with recorder.stage("load") as stage:
+        scored = list(run_overlapped(sources, steps, queue_size=queue_size, busy=busy))
+        encoder = CategoryEncoder.load(output_dir / CATEGORY_FILE)
+        df_conf = _dedupe_conflict_frame(encoder.encode(pd.concat(scored, ignore_index=True)))
+        del scored
+        stage.rows_in = rows_in
+        stage.bytes_in = file_bytes(paths)
+        stage.output(df_conf)
+    for name, _ in steps:
+        recorder.record(StageMetrics(name=f"overlap_{name}", seconds=round(busy.get(name, 0.0), 6)))
+    return _run_stages(df_conf, output_dir, metadata, recorder, model, cache_dir, encoder, from_scores=True)
@@ -0,0 +1,211 @@
+"""
+Server-side query layer for play-level drill-down.
+
+The pipeline writes ``play_index.parquet``: one narrow row per scored play
+(keys, game situation, a few engineered flags, EPA and ``conflict_score``),
+sorted by season, offense and week and split into fixed-size row groups.
+``PlayIndex`` answers the explorer's questions from that file without ever
+materialising the whole play table:
+
+- filters (team, season, week, situation) are pushed down to the parquet
+  scan, so row groups that cannot match are skipped;
+- ``page`` returns one fixed-size page of plays ordered by conflict score in
+  two passes: the first reads only the filtered scores and row ids and picks
+  the page's rows in numpy, the second reads full columns for just those
+  rows (ties are broken by file order, i.e. season, offense, week, play);
+- ``histogram`` bins the filtered scores on the server and returns counts;
+- ``sample`` returns a bounded uniform sample for scatter plots.
+
+Every result is small regardless of how many plays the file holds.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from ..data.arrow_backend import plain_strings
+from ..features.encoding import plain_labels
+
+PLAY_INDEX_FILE = "play_index.parquet"
+INDEX_COLUMNS = (
+    "season",
+    "week",
+    "game_id",
+    "play_id",
+    "posteam",
+    "defteam",
+    "qtr",
+    "down",
+    "ydstogo",
+    "yardline_100",
+    "play_type",
+    "situation_bucket",
+    "personnel_group",
+    "has_motion",
+    "has_play_action",
+    "desc",
+    "epa",
+    "conflict_score",
+)
+SORT_ORDER = ["season", "posteam", "week", "game_id", "play_id"]
+ROW_GROUP_SIZE = 65_536
+DEFAULT_PAGE_SIZE = 50
+SCORE_COL = "conflict_score"
+# Position of each play in the file; orders plays with equal scores.
+ROW_COL = "row_id"
+# Plays the explorer lists and counts: those with a conflict score.
+_SCORED = ~pc.field(SCORE_COL).is_null(nan_is_null=True)
+
+
+def write_play_index(df_conf: pd.DataFrame, path: Path) -> Path:
+    """Write the explorer's columns of a scored play frame to ``path``."""
+    columns = [c for c in INDEX_COLUMNS if c in df_conf.columns]
+    df = plain_strings(plain_labels(df_conf[columns], columns))
+    order = [c for c in SORT_ORDER if c in df.columns]
+    if order:
+        df = df.sort_values(order, kind="stable")
+    df = df.reset_index(drop=True)
+    df[ROW_COL] = np.arange(len(df), dtype=np.int64)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(path, index=False, compression="zstd", row_group_size=ROW_GROUP_SIZE)
+    return path
+
+
+@dataclass(frozen=True)
+class PlayFilter:
+    """Selected values per dimension; an empty tuple means no restriction."""
+
+    teams: tuple[str, ...] = ()
+    seasons: tuple[int, ...] = ()
+    weeks: tuple[int, ...] = ()
+    situations: tuple[str, ...] = ()
+
+    def expression(self, schema: pa.Schema) -> pc.Expression | None:
+        conditions = [
+            pc.field(col).isin(list(values))
+            for col, values in (
+                ("posteam", self.teams),
+                ("season", self.seasons),
+                ("week", self.weeks),
+                ("situation_bucket", self.situations),
+            )
+            if values and col in schema.names
+        ]
+        if not conditions:
+            return None
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+
+@dataclass
+class PlayPage:
+    """One page of plays and where it sits in the filtered result."""
+
+    rows: pd.DataFrame
+    page: int
+    page_size: int
+    total_rows: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total_rows // self.page_size))
+
+
+@dataclass
+class PlayIndex:
+    """Queries over ``play_index.parquet``."""
+
+    path: Path
+    dataset: ds.Dataset = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.path = Path(self.path)
+        self.dataset = ds.dataset(self.path, format="parquet")
+
+    @property
+    def columns(self) -> list[str]:
+        return [c for c in self.dataset.schema.names if c != ROW_COL]
+
+    def _table(self, play_filter: PlayFilter, columns: Sequence[str], extra: pc.Expression | None = None) -> pa.Table:
+        expression = play_filter.expression(self.dataset.schema)
+        if extra is not None:
+            expression = extra if expression is None else expression & extra
+        return self.dataset.to_table(columns=list(columns), filter=expression)
+
+    def options(self) -> dict[str, list]:
+        """Distinct values for each filter dimension, for building the controls."""
+        result = {}
+        for key, col in (("teams", "posteam"), ("seasons", "season"), ("weeks", "week"), ("situations", "situation_bucket")):
+            if col in self.columns:
+                values = pc.unique(self.dataset.to_table(columns=[col]).column(col)).drop_null()
+                result[key] = sorted(values.to_pylist())
+            else:
+                result[key] = []
+        return result
+
+    def _scores(self, play_filter: PlayFilter) -> np.ndarray:
+        table = self._table(play_filter, [SCORE_COL])
+        return table.column(SCORE_COL).to_numpy(zero_copy_only=False).astype(float)
+
+    def count(self, play_filter: PlayFilter = PlayFilter()) -> int:
+        """Filtered plays with a conflict score, the ``total_rows`` of ``page``."""
+        expression = play_filter.expression(self.dataset.schema)
+        return self.dataset.count_rows(filter=_SCORED if expression is None else expression & _SCORED)
+
+    def page(
+        self,
+        play_filter: PlayFilter = PlayFilter(),
+        page: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        descending: bool = True,
+    ) -> PlayPage:
+        """Page ``page`` (0-based, clamped to the last page) of the filtered plays by conflict score."""
+        table = self._table(play_filter, [SCORE_COL, ROW_COL], _SCORED)
+        scores = table.column(SCORE_COL).to_numpy(zero_copy_only=False).astype(float)
+        row_ids = table.column(ROW_COL).to_numpy()
+        key = -scores if descending else scores
+        total = len(key)
+        page = min(max(page, 0), max(0, -(-total // page_size) - 1))
+        start, stop = page * page_size, min((page + 1) * page_size, total)
+        if start >= stop:
+            return PlayPage(pd.DataFrame(columns=self.columns), page, page_size, total)
+
+        # Everything up to the page's last key, including all ties with it,
+        # then an exact (key, row) sort of that much smaller set.
+        candidates = np.flatnonzero(key <= np.partition(key, stop - 1)[stop - 1])
+        ordered = candidates[np.lexsort((row_ids[candidates], key[candidates]))]
+        page_ids = row_ids[ordered[start:stop]]
+
+        rows = self.dataset.to_table(columns=[*self.columns, ROW_COL], filter=pc.field(ROW_COL).isin(page_ids))
+        rows = rows.to_pandas().set_index(ROW_COL).loc[page_ids].reset_index(drop=True)
+        return PlayPage(rows, page, page_size, total)
+
+    def histogram(self, play_filter: PlayFilter = PlayFilter(), bins: int = 40) -> pd.DataFrame:
+        """Counts of filtered plays per conflict score bin over [0, 1]."""
+        counts, edges = np.histogram(self._scores(play_filter), bins=bins, range=(0.0, 1.0))
+        return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "plays": counts})
+
+    def sample(
+        self,
+        play_filter: PlayFilter = PlayFilter(),
+        columns: Sequence[str] = ("epa", SCORE_COL),
+        n: int = 5000,
+        seed: int = 0,
+    ) -> pd.DataFrame:
+        """At most ``n`` filtered plays drawn uniformly without replacement."""
+        columns = [c for c in columns if c in self.columns]
+        table = self._table(play_filter, columns)
+        if table.num_rows > n:
+            rows = np.sort(np.random.default_rng(seed).choice(table.num_rows, size=n, replace=False))
+            table = table.take(rows)
+        return table.to_pandas()
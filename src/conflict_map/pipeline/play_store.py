@@ -0,0 +1,144 @@
+"""
+Read-only play store shared by every process on a host.
+
+A multi-worker web deployment would otherwise load and score the plays in
+each worker, so memory grows with the number of workers. Instead the scored
+plays are published once as uncompressed Arrow IPC files, and each worker
+memory-maps them. Numeric columns become numpy arrays directly over the
+mapping, and text columns become categoricals whose codes are mapped the
+same way (labels live in the schema metadata). The page cache holds one copy
+of the data, and a worker attaching to the store reads nothing up front.
+
+Layout under the store directory::
+
+    CURRENT                    name of the live generation
+    <generation>/plays.arrow   the play table
+    <generation>/<name>.arrow  small tables published alongside (e.g. team stats)
+
+``publish_play_store`` writes a new generation next to the live one and then
+swaps ``CURRENT``, so readers never see a half-written store. Processes that
+mapped an older generation keep their mapping until they reopen the store.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Mapping
+
+import pandas as pd
+import pyarrow as pa
+
+from ..metrics.similarity import COMPONENT_COLUMNS
+from ..model.unified import KEY_COLUMNS
+
+CURRENT_FILE = "CURRENT"
+PLAYS_TABLE = "plays"
+# Play columns the dashboards read; anything else in a scored frame is dropped.
+STORE_COLUMNS = KEY_COLUMNS + ("pass_attempt", "rush_attempt") + COMPONENT_COLUMNS + ("occi", "conflict_score")
+_CATEGORIES_KEY = b"categories"
+
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    """Numeric columns as-is (NaN stays a value, not a null); text as categorical codes."""
+    arrays, fields = [], []
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            arrays.append(pa.array(values.to_numpy()))
+            fields.append(pa.field(col, arrays[-1].type))
+            continue
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype("category")
+        categories = [str(label) for label in values.cat.categories]
+        arrays.append(pa.array(values.cat.codes.to_numpy()))
+        fields.append(pa.field(col, arrays[-1].type, metadata={_CATEGORIES_KEY: json.dumps(categories)}))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def _write_table(df: pd.DataFrame, path: Path) -> None:
+    table = _to_arrow(df.reset_index(drop=True))
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        # One record batch keeps every column a single contiguous buffer.
+        writer.write_table(table, max_chunksize=max(len(table), 1))
+
+
+def _to_frame(table: pa.Table) -> pd.DataFrame:
+    """Frame whose columns are views over ``table``'s buffers."""
+    columns = {}
+    for col in table.schema:
+        column = table.column(col.name)
+        values = column.chunk(0).to_numpy(zero_copy_only=True) if column.num_chunks == 1 else column.to_numpy()
+        metadata = col.metadata or {}
+        if _CATEGORIES_KEY in metadata:
+            dtype = pd.CategoricalDtype(json.loads(metadata[_CATEGORIES_KEY]))
+            values = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        columns[col.name] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def publish_play_store(
+    plays: pd.DataFrame,
+    directory: Path,
+    tables: Mapping[str, pd.DataFrame] | None = None,
+    columns: Iterable[str] = STORE_COLUMNS,
+) -> Path:
+    """Publish the ``columns`` of ``plays`` (and any small ``tables``) as a new generation.
+
+    Returns the generation directory. Older generations other than the one
+    being replaced are removed.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    previous = current_generation(directory)
+    generation = f"{time.time_ns():x}-{os.getpid()}"
+    tmp = directory / f".{generation}.tmp"
+    tmp.mkdir()
+    _write_table(plays[[col for col in columns if col in plays.columns]], tmp / f"{PLAYS_TABLE}.arrow")
+    for name, table in (tables or {}).items():
+        _write_table(table, tmp / f"{name}.arrow")
+    os.replace(tmp, directory / generation)
+
+    pointer = directory / f".{CURRENT_FILE}.{os.getpid()}.tmp"
+    pointer.write_text(generation)
+    os.replace(pointer, directory / CURRENT_FILE)
+
+    for stale in directory.iterdir():
+        if stale.is_dir() and stale.name not in (generation, previous) and not stale.name.startswith("."):
+            shutil.rmtree(stale, ignore_errors=True)
+    return directory / generation
+
+
+def current_generation(directory: Path) -> str | None:
+    try:
+        return (Path(directory) / CURRENT_FILE).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+@dataclass
+class PlayStore:
+    """A published generation, memory-mapped read-only."""
+
+    path: Path
+    tables: dict[str, pd.DataFrame] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def open(cls, directory: Path) -> "PlayStore":
+        """Map the live generation under ``directory``."""
+        generation = current_generation(directory)
+        if generation is None:
+            raise FileNotFoundError(f"no play store published under {directory}")
+        path = Path(directory) / generation
+        tables = {}
+        for file in sorted(path.glob("*.arrow")):
+            table = pa.ipc.open_file(pa.memory_map(str(file))).read_all()
+            tables[file.stem] = _to_frame(table)
+        return cls(path, tables)
+
+    @property
+    def plays(self) -> pd.DataFrame:
+        return self.tables[PLAYS_TABLE]
@@ -0,0 +1,137 @@
+"""
+On-demand conflict scoring with request coalescing.
+
+``score_plays`` runs ``engineer_basic_features`` and ``compute_conflict_scores``
+on a frame of raw plays. ``MicroBatcher`` lets many concurrent callers share
+those vectorized passes: a single worker thread drains whatever requests are
+queued, waits up to ``max_wait_ms`` for more (until ``max_batch_rows`` is
+reached), scores the combined frame once and hands each caller back its own
+slice. Requests are only combined with others that have the same columns, so
+a play's features never depend on which batch it landed in.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable
+
+import pandas as pd
+
+from ..features.build_features import engineer_basic_features
+from ..model.conflict_score import compute_conflict_scores
+
+DEFAULT_MAX_BATCH_ROWS = 8192
+DEFAULT_MAX_WAIT_MS = 1.0
+
+
+def score_plays(df_raw: pd.DataFrame) -> pd.Series:
+    """Conflict score for every raw play, aligned to ``df_raw``'s row order."""
+    scored = compute_conflict_scores(engineer_basic_features(df_raw.reset_index(drop=True)))
+    return scored["conflict_score"]
+
+
+@dataclass
+class _Request:
+    frame: pd.DataFrame
+    future: Future = field(default_factory=Future)
+
+
+class MicroBatcher:
+    """Coalesce concurrent scoring requests into vectorized micro-batches."""
+
+    def __init__(
+        self,
+        score_fn: Callable[[pd.DataFrame], pd.Series] = score_plays,
+        max_batch_rows: int = DEFAULT_MAX_BATCH_ROWS,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ):
+        self.score_fn = score_fn
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.rows = 0
+        self._queue: queue.Queue[_Request | None] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: pd.DataFrame) -> Future:
+        """Queue ``frame`` for scoring; the future resolves to its score Series."""
+        request = _Request(frame.reset_index(drop=True))
+        self._queue.put(request)
+        return request.future
+
+    def score(self, frame: pd.DataFrame, timeout: float | None = None) -> pd.Series:
+        return self.submit(frame).result(timeout)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_rows": self.rows / self.batches if self.batches else 0.0,
+        }
+
+    def _collect(self, first: _Request) -> tuple[list[_Request], bool]:
+        """Gather requests for one batch; returns them and whether close() was called."""
+        pending, rows = [first], len(first.frame)
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch_rows:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is None:
+                return pending, True
+            pending.append(item)
+            rows += len(item.frame)
+        return pending, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            pending, closing = self._collect(first)
+            groups: dict[tuple, list[_Request]] = {}
+            for request in pending:
+                groups.setdefault(tuple(sorted(map(str, request.frame.columns))), []).append(request)
+            for group in groups.values():
+                self._score(group)
+            if closing:
+                return
+
+    def _score(self, group: list[_Request]) -> None:
+        try:
+            frames = [r.frame for r in group]
+            combined = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            scores = self.score_fn(combined)
+        except Exception:
+            # Score one by one so a single malformed request only fails itself.
+            for request in group:
+                self._score_one(request)
+            return
+        self.batches += 1
+        self.rows += len(combined)
+        start = 0
+        for request in group:
+            end = start + len(request.frame)
+            request.future.set_result(scores.iloc[start:end].reset_index(drop=True))
+            start = end
+
+    def _score_one(self, request: _Request) -> None:
+        try:
+            request.future.set_result(self.score_fn(request.frame))
+        except Exception as exc:
+            request.future.set_exception(exc)
@@ -7,10 +7,38 @@ from typing import Iterable, Sequence
 
 import pandas as pd
 
-from ..data.load import load_raw_multiple_seasons, load_raw_season, load_weekly_updates
+from ..data import load as load_module
+from ..data.arrow_backend import plain_strings
+from ..data.load import (
+    load_raw_multiple_seasons,
+    load_raw_season,
+    load_weekly_updates,
+    season_raw_path,
+    weekly_raw_paths,
+)
+from ..features import build_features as features_module
+from ..features import encoding as encoding_module
 from ..features.build_features import engineer_basic_features
+from ..features.encoding import CATEGORY_FILE, CategoryEncoder
+from ..features.store import FEATURES_FILE, read_feature_store, write_feature_store
+from ..metrics import adjusted, drives, occi, rolling, sketch, splits
+from ..metrics.adjusted import attach_opponents, fit_opponent_adjusted_occi
+from ..metrics.drives import compute_drive_occi
 from ..metrics.occi import compute_team_game_occi, compute_team_season_occi
+from ..metrics.rolling import RollingOCCIState, attach_game_order
+from ..metrics.sketch import load_digests, merge_digests, save_digests, team_occi_digests, team_occi_quantiles
+from ..metrics.splits import compute_team_occi_splits
+from ..model import conflict_score as scoring_module
 from ..model.conflict_score import compute_conflict_scores
+from ..model.learned import ConflictModel
+from .cache import RawFiles, StageExecutor
+from .instrumentation import PipelineRecorder, file_bytes, frame_bytes
+from .play_index import PLAY_INDEX_FILE, write_play_index
+
+
+ROLLING_STATE_FILE = "team_rolling_state.json"
+ADJUSTED_FILE = "team_season_occi_adjusted.csv"
+SKETCH_FILE = "team_occi_sketches.json"
 
 
 def _dedupe_conflict_frame(df_conf: pd.DataFrame) -> pd.DataFrame:
@@ -20,25 +48,385 @@ def _dedupe_conflict_frame(df_conf: pd.DataFrame) -> pd.DataFrame:
     return df_conf.drop_duplicates(subset=keys, keep="last")
 
 
-def run_pipeline(df_raw: pd.DataFrame, output_dir: Path, metadata: dict | None = None) -> dict[str, Path]:
-    """Run the full conflict pipeline on a raw frame and write CSV outputs."""
+def _feature_stage(
+    df_raw: pd.DataFrame, recorder: PipelineRecorder, encoder: CategoryEncoder | None = None
+) -> pd.DataFrame:
+    """Engineer features, then turn team/game/bucket columns into stable categorical codes."""
+    with recorder.stage("features", rows_in=len(df_raw), bytes_in=frame_bytes(df_raw)) as stage:
+        df_feat = engineer_basic_features(df_raw)
+        if encoder is not None:
+            df_feat = encoder.encode(df_feat)
+        stage.output(df_feat)
+    return df_feat
+
+
+def _scoring_stage(
+    df_feat: pd.DataFrame, recorder: PipelineRecorder, model: ConflictModel | None = None
+) -> pd.DataFrame:
+    with recorder.stage("scoring", rows_in=len(df_feat), bytes_in=frame_bytes(df_feat)) as stage:
+        df_conf = model.score(df_feat) if model is not None else compute_conflict_scores(df_feat)
+        stage.output(df_conf)
+    return df_conf
+
+
+def _score_raw_frame(
+    df_raw: pd.DataFrame,
+    recorder: PipelineRecorder,
+    model: ConflictModel | None = None,
+    encoder: CategoryEncoder | None = None,
+) -> pd.DataFrame:
+    return _scoring_stage(_feature_stage(df_raw, recorder, encoder), recorder, model)
+
+
+def _dedupe_stage(df_conf: pd.DataFrame, recorder: PipelineRecorder) -> pd.DataFrame:
+    with recorder.stage("dedupe", rows_in=len(df_conf), bytes_in=frame_bytes(df_conf)) as stage:
+        df_conf = _dedupe_conflict_frame(df_conf)
+        stage.output(df_conf)
+    return df_conf
+
+
+def _aggregate_stage(df_conf: pd.DataFrame, recorder: PipelineRecorder) -> tuple[pd.DataFrame, pd.DataFrame]:
+    with recorder.stage("aggregation", rows_in=len(df_conf), bytes_in=frame_bytes(df_conf)) as stage:
+        df_game = compute_team_game_occi(df_conf)
+        season_lookup = df_conf[["game_id", "season"]].drop_duplicates() if "season" in df_conf.columns else None
+        df_season = compute_team_season_occi(df_game, season_lookup=season_lookup)
+        stage.rows_out = int(len(df_game) + len(df_season))
+        stage.bytes_out = frame_bytes(df_game) + frame_bytes(df_season)
+    return df_game, df_season
+
+
+def _adjustment_stage(
+    df_game: pd.DataFrame, df_conf: pd.DataFrame, output_dir: Path, recorder: PipelineRecorder
+) -> pd.DataFrame:
+    """Fit opponent-adjusted OCCI, warm-started from the previous run's effects."""
+    with recorder.stage("adjustment", rows_in=len(df_game)) as stage:
+        if {"posteam", "defteam"}.issubset(df_conf.columns):
+            df_game = attach_opponents(df_game, df_conf)
+        previous_path = output_dir / ADJUSTED_FILE
+        previous = pd.read_csv(previous_path) if previous_path.exists() else None
+        df_adjusted = fit_opponent_adjusted_occi(df_game, previous=previous)
+        stage.output(df_adjusted)
+    return df_adjusted
+
+
+def _quantile_stage(
+    df_season: pd.DataFrame,
+    df_conf: pd.DataFrame,
+    output_dir: Path,
+    recorder: PipelineRecorder,
+    df_new_plays: pd.DataFrame | None = None,
+) -> tuple[pd.DataFrame, dict]:
+    """Attach sketch-based median/p10/p90 play OCCI to the team-season table.
+
+    When ``df_new_plays`` only adds plays, their digests are merged into the
+    saved ones; otherwise digests are rebuilt from every play.
+    """
+    with recorder.stage("quantiles", rows_in=len(df_conf)) as stage:
+        digests = load_digests(output_dir / SKETCH_FILE) if df_new_plays is not None else None
+        if digests is not None:
+            digests = merge_digests(digests, team_occi_digests(df_new_plays))
+        else:
+            digests = team_occi_digests(df_conf)
+        df_quantiles = team_occi_quantiles(digests)
+        keys = [c for c in ("season", "team") if c in df_quantiles.columns and c in df_season.columns]
+        df_season = df_season.merge(df_quantiles, on=keys, how="left")
+        stage.output(df_quantiles)
+    return df_season, digests
+
+
+def _splits_stage(df_conf: pd.DataFrame, recorder: PipelineRecorder) -> pd.DataFrame:
+    with recorder.stage("splits", rows_in=len(df_conf), bytes_in=frame_bytes(df_conf)) as stage:
+        df_splits = compute_team_occi_splits(df_conf)
+        stage.output(df_splits)
+    return df_splits
+
+
+def _drive_stage(df_conf: pd.DataFrame, recorder: PipelineRecorder) -> tuple[pd.DataFrame, pd.DataFrame]:
+    with recorder.stage("drives", rows_in=len(df_conf), bytes_in=frame_bytes(df_conf)) as stage:
+        df_drives = compute_drive_occi(df_conf, unit="drive")
+        df_series = compute_drive_occi(df_conf, unit="series")
+        stage.rows_out = len(df_drives) + len(df_series)
+    return df_drives, df_series
+
+
+def _rolling_stage(
+    df_game: pd.DataFrame,
+    df_conf: pd.DataFrame,
+    output_dir: Path,
+    recorder: PipelineRecorder,
+    new_game_ids: pd.Series | None = None,
+) -> tuple[RollingOCCIState, pd.DataFrame, bool]:
+    """Return the rolling state, the rows to write, and whether they are an append.
+
+    With ``new_game_ids`` the persisted per-team state is advanced by just
+    those games. Anything the state cannot absorb in order (missing state,
+    replaced or back-dated games) falls back to a rebuild from all games.
+    """
+    with recorder.stage("rolling", rows_in=len(df_game)) as stage:
+        df_ordered = attach_game_order(df_game, df_conf)
+        state = RollingOCCIState.load(output_dir / ROLLING_STATE_FILE)
+        if (
+            new_game_ids is not None
+            and state is not None
+            and (output_dir / "team_rolling_occi.csv").exists()
+        ):
+            df_new = df_ordered[df_ordered["game_id"].isin(new_game_ids)]
+            if state.can_append(df_new):
+                df_rolling = state.update(df_new)
+                stage.output(df_rolling)
+                return state, df_rolling, True
+
+        params = {"window": state.window, "alpha": state.alpha} if state is not None else {}
+        state, df_rolling = RollingOCCIState.from_games(df_ordered, **params)
+        stage.output(df_rolling)
+    return state, df_rolling, False
+
+
+def _write_stage(
+    output_dir: Path,
+    frames: dict[str, tuple[str, pd.DataFrame]],
+    recorder: PipelineRecorder,
+    append_keys: tuple[str, ...] = (),
+) -> dict[str, Path]:
+    """Write ``{key: (file name, frame)}`` into ``output_dir`` and return the paths.
+
+    Frames whose key is in ``append_keys`` are appended to an existing file
+    instead of replacing it.
+    """
+    rows = sum(len(df) for _, df in frames.values())
+    with recorder.stage("write", rows_in=rows) as stage:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths: dict[str, Path] = {}
+        for key, (file_name, df) in frames.items():
+            paths[key] = output_dir / file_name
+            if key in append_keys and paths[key].exists():
+                df.to_csv(paths[key], mode="a", header=False, index=False)
+            else:
+                df.to_csv(paths[key], index=False)
+        stage.rows_out = rows
+        stage.bytes_out = file_bytes(paths.values())
+    return paths
+
+
+def _rescored_plays(plays_path: Path, df_conf: pd.DataFrame) -> pd.DataFrame:
+    """The plays table at ``plays_path`` with ``conflict_score`` replaced by the one in ``df_conf``.
+
+    The feature store only holds the columns scoring and aggregation need, so
+    a rescore merges its scores back into the full table by play key instead
+    of replacing it. Falls back to ``df_conf`` when there is no table to merge into.
+    """
+    keys = ["game_id", "play_id"]
+    if not plays_path.exists() or not set(keys) <= set(df_conf.columns):
+        return df_conf
+    plays = pd.read_csv(plays_path, low_memory=False)
+    if not set(keys) <= set(plays.columns):
+        return df_conf
+    scores = df_conf[[*keys, "conflict_score"]].astype({"game_id": str, "play_id": plays["play_id"].dtype})
+    columns = list(plays.columns) if "conflict_score" in plays.columns else [*plays.columns, "conflict_score"]
+    merged = plays.drop(columns="conflict_score", errors="ignore").astype({"game_id": str})
+    return merged.merge(scores, on=keys, how="left", validate="one_to_one")[columns]
+
+
+def _feature_store_stage(df_conf: pd.DataFrame, output_dir: Path, recorder: PipelineRecorder) -> Path:
+    """Persist the columns ``rescore_from_features`` needs."""
+    with recorder.stage("feature_store", rows_in=len(df_conf)) as stage:
+        path = write_feature_store(df_conf, output_dir / FEATURES_FILE)
+        stage.rows_out = int(len(df_conf))
+        stage.bytes_out = file_bytes([path])
+    return path
+
+
+def _play_index_stage(df_conf: pd.DataFrame, output_dir: Path, recorder: PipelineRecorder) -> Path:
+    """Write the narrow, sorted play table the explorer queries."""
+    with recorder.stage("play_index", rows_in=len(df_conf)) as stage:
+        path = write_play_index(df_conf, output_dir / PLAY_INDEX_FILE)
+        stage.rows_out = int(len(df_conf))
+        stage.bytes_out = file_bytes([path])
+    return path
+
+
+def _scorer_metadata(model: ConflictModel | None) -> dict:
+    return model.describe() if model is not None else {"kind": "heuristic"}
+
+
+def _write_metadata(output_dir: Path, meta: dict, recorder: PipelineRecorder) -> None:
+    meta["instrumentation"] = recorder.to_metadata()
+    (output_dir / "occi_run_metadata.json").write_text(json.dumps(meta, indent=2))
+    recorder.log_summary()
+
+
+OUTPUT_FILES = {
+    "conflict": "plays_with_conflict_scores.csv",
+    "game": "team_game_occi.csv",
+    "season": "team_season_occi.csv",
+    "adjusted": ADJUSTED_FILE,
+    "splits": "team_occi_splits.csv",
+    "drives": "drive_occi.csv",
+    "series": "series_occi.csv",
+    "rolling": "team_rolling_occi.csv",
+}
 
-    df_feat = engineer_basic_features(df_raw)
-    df_conf = compute_conflict_scores(df_feat)
-    df_conf = _dedupe_conflict_frame(df_conf)
 
-    df_game = compute_team_game_occi(df_conf)
-    season_lookup = df_conf[["game_id", "season"]].drop_duplicates() if "season" in df_conf.columns else None
-    df_season = compute_team_season_occi(df_game, season_lookup=season_lookup)
+def _read_metadata(output_dir: Path) -> dict:
+    meta_path = output_dir / "occi_run_metadata.json"
+    if not meta_path.exists():
+        return {}
+    try:
+        return json.loads(meta_path.read_text())
+    except json.JSONDecodeError:
+        return {}
 
-    output_dir.mkdir(parents=True, exist_ok=True)
-    conflict_path = output_dir / "plays_with_conflict_scores.csv"
-    game_path = output_dir / "team_game_occi.csv"
-    season_path = output_dir / "team_season_occi.csv"
 
-    df_conf.to_csv(conflict_path, index=False)
-    df_game.to_csv(game_path, index=False)
-    df_season.to_csv(season_path, index=False)
+def run_pipeline(
+    df_raw: pd.DataFrame | RawFiles,
+    output_dir: Path,
+    metadata: dict | None = None,
+    recorder: PipelineRecorder | None = None,
+    model: ConflictModel | None = None,
+    cache_dir: Path | None = None,
+) -> dict[str, Path]:
+    """Run the full conflict pipeline on a raw frame and write CSV outputs.
+
+    Plays are scored with ``compute_conflict_scores`` unless a trained
+    ``model`` (see ``conflict_map.model.learned``) is given.
+
+    With ``cache_dir`` every stage is memoized by ``StageExecutor``: stages
+    whose code, parameters and inputs are unchanged are loaded from the cache,
+    and when every output matches the previous run in ``output_dir`` nothing
+    is loaded or rewritten at all. Pass ``RawFiles`` instead of a frame so the
+    raw input is keyed by file content and only read on a cache miss.
+
+    Per-stage timings, row counts, byte counts and peak RSS are stored under
+    ``instrumentation`` in ``occi_run_metadata.json``. Pass a recorder to
+    include an upstream load stage or to enable profiling and JSON logging.
+    """
+
+    encoder = CategoryEncoder.load(output_dir / CATEGORY_FILE)
+    return _run_stages(df_raw, output_dir, metadata, recorder or PipelineRecorder(), model, cache_dir, encoder)
+
+
+def _run_stages(
+    source: pd.DataFrame | RawFiles,
+    output_dir: Path,
+    metadata: dict | None,
+    recorder: PipelineRecorder,
+    model: ConflictModel | None,
+    cache_dir: Path | None,
+    encoder: CategoryEncoder,
+    from_features: bool = False,
+    from_scores: bool = False,
+) -> dict[str, Path]:
+    """Stage graph behind ``run_pipeline``, ``rescore_from_features`` and overlapped builds.
+
+    With ``from_features`` the source is already engineered (the feature
+    store), so the features stage is skipped and the store is not rewritten.
+    With ``from_scores`` it is already scored and deduplicated, so both the
+    features and scoring stages are skipped.
+    """
+    executor = StageExecutor(cache_dir, recorder)
+    scorer = _scorer_metadata(model)
+    # The rolling stage keeps the window/alpha of a previous run's saved state.
+    rolling_params = (RollingOCCIState.load(output_dir / ROLLING_STATE_FILE) if executor.enabled else None) or (
+        RollingOCCIState()
+    )
+
+    raw = executor.source(source, code=[load_module])
+    features = raw if from_features or from_scores else executor.stage(
+        "features",
+        lambda df: _feature_stage(df, recorder, encoder),
+        [raw],
+        code=[features_module, encoding_module, _feature_stage],
+    )
+    scores = raw if from_scores else executor.stage(
+        "scoring",
+        lambda df: _dedupe_stage(_scoring_stage(df, recorder, model), recorder),
+        [features],
+        code=[scoring_module, _scoring_stage, _dedupe_conflict_frame],
+        params={"scorer": model.to_dict() if model is not None else scorer},
+    )
+    aggregates = executor.stage(
+        "aggregation",
+        lambda df_conf: _aggregate_stage(df_conf, recorder),
+        [scores],
+        code=[occi, _aggregate_stage],
+    )
+    quantiles = executor.stage(
+        "quantiles",
+        lambda agg, df_conf: _quantile_stage(agg[1], df_conf, output_dir, recorder),
+        [aggregates, scores],
+        code=[sketch, _quantile_stage],
+    )
+    adjustment = executor.stage(
+        "adjustment",
+        lambda agg, df_conf: _adjustment_stage(agg[0], df_conf, output_dir, recorder),
+        [aggregates, scores],
+        code=[adjusted, _adjustment_stage],
+    )
+    split_table = executor.stage(
+        "splits", lambda df: _splits_stage(df, recorder), [scores], code=[splits, _splits_stage]
+    )
+    drive_tables = executor.stage(
+        "drives", lambda df: _drive_stage(df, recorder), [scores], code=[drives, _drive_stage]
+    )
+    rolling_tables = executor.stage(
+        "rolling",
+        lambda agg, df_conf: _rolling_stage(agg[0], df_conf, output_dir, recorder)[:2],
+        [aggregates, scores],
+        code=[rolling, _rolling_stage],
+        params={"window": rolling_params.window, "alpha": rolling_params.alpha},
+    )
+    outputs = [scores, aggregates, quantiles, adjustment, split_table, drive_tables, rolling_tables]
+
+    run_key = executor.combined_key(outputs)
+    meta = _read_metadata(output_dir) if run_key is not None else {}
+    paths = {key: output_dir / name for key, name in OUTPUT_FILES.items()}
+    state_files = [
+        output_dir / name
+        for name in (ROLLING_STATE_FILE, SKETCH_FILE, FEATURES_FILE, CATEGORY_FILE, PLAY_INDEX_FILE)
+    ]
+    if (
+        run_key is not None
+        and meta.get("stage_key") == run_key
+        and all(p.exists() for p in [*paths.values(), *state_files])
+    ):
+        # Nothing changed since the run that wrote these files.
+        with recorder.stage("write") as stage:
+            stage.cached = True
+        meta.update(metadata or {})
+        _write_metadata(output_dir, meta, recorder)
+        return paths
+
+    df_conf = scores.value()
+    df_game, _ = aggregates.value()
+    df_season, digests = quantiles.value()
+    df_adjusted = adjustment.value()
+    df_splits = split_table.value()
+    df_drives, df_series = drive_tables.value()
+    rolling_state, df_rolling = rolling_tables.value()
+
+    paths = _write_stage(
+        output_dir,
+        {
+            key: (OUTPUT_FILES[key], df)
+            for key, df in {
+                "conflict": _rescored_plays(paths["conflict"], df_conf) if from_features else df_conf,
+                "game": df_game,
+                "season": df_season,
+                "adjusted": df_adjusted,
+                "splits": df_splits,
+                "drives": df_drives,
+                "series": df_series,
+                "rolling": df_rolling,
+            }.items()
+        },
+        recorder,
+    )
+    rolling_state.save(output_dir / ROLLING_STATE_FILE)
+    save_digests(digests, output_dir / SKETCH_FILE)
+    encoder.fit(df_conf).save(output_dir / CATEGORY_FILE)
+    _play_index_stage(df_conf, output_dir, recorder)
+    if not from_features:
+        _feature_store_stage(df_conf, output_dir, recorder)
 
     meta = metadata or {}
     meta.update(
@@ -46,11 +434,14 @@ def run_pipeline(df_raw: pd.DataFrame, output_dir: Path, metadata: dict | None =
             "seasons": sorted(df_conf["season"].dropna().unique().tolist()) if "season" in df_conf.columns else [],
             "plays": int(len(df_conf)),
             "games": int(df_game.shape[0]),
+            "scorer": scorer,
         }
     )
-    (output_dir / "occi_run_metadata.json").write_text(json.dumps(meta, indent=2))
+    if run_key is not None:
+        meta["stage_key"] = run_key
+    _write_metadata(output_dir, meta, recorder)
 
-    return {"conflict": conflict_path, "game": game_path, "season": season_path}
+    return paths
 
 
 def build_from_ranges(
@@ -58,30 +449,56 @@ def build_from_ranges(
     latest_season: int | None,
     latest_weeks: Sequence[int] | None,
     output_dir: Path,
+    recorder: PipelineRecorder | None = None,
+    model: ConflictModel | None = None,
+    cache_dir: Path | None = None,
+    arrow: bool = False,
 ) -> dict[str, Path]:
-    """Load historical seasons plus an in-progress season and run the pipeline."""
+    """Load historical seasons plus an in-progress season and run the pipeline.
 
-    frames: list[pd.DataFrame] = []
-    base_seasons = list(base_seasons)
-    if base_seasons:
-        frames.append(load_raw_multiple_seasons(base_seasons))
+    The raw files are only read if ``run_pipeline`` needs them, i.e. always
+    without ``cache_dir`` and only on a cache miss with it. With ``arrow`` they
+    are parsed by pyarrow into Arrow-backed text columns; outputs are unchanged.
+    """
 
+    recorder = recorder or PipelineRecorder()
+    base_seasons = list(base_seasons)
+    if not base_seasons and latest_season is None:
+        raise ValueError("No seasons provided. Specify base seasons or a latest season to process.")
+    paths = [season_raw_path(s) for s in base_seasons]
     if latest_season is not None:
-        if latest_weeks:
-            frames.append(load_weekly_updates(latest_season, latest_weeks))
-        else:
-            frames.append(load_raw_season(latest_season))
+        paths.extend(
+            weekly_raw_paths(latest_season, latest_weeks) if latest_weeks else [season_raw_path(latest_season)]
+        )
 
-    if not frames:
-        raise ValueError("No seasons provided. Specify base seasons or a latest season to process.")
+    def load() -> pd.DataFrame:
+        with recorder.stage("load") as stage:
+            frames: list[pd.DataFrame] = []
+            if base_seasons:
+                frames.append(load_raw_multiple_seasons(base_seasons, arrow=arrow))
+            if latest_season is not None:
+                if latest_weeks:
+                    frames.append(load_weekly_updates(latest_season, latest_weeks, arrow=arrow))
+                else:
+                    frames.append(load_raw_season(latest_season, arrow=arrow))
+            df_raw = pd.concat(frames, ignore_index=True)
+            stage.bytes_in = file_bytes(paths)
+            stage.output(df_raw)
+        return df_raw
 
-    df_raw = pd.concat(frames, ignore_index=True)
     metadata = {
         "base_seasons": base_seasons,
         "latest_season": latest_season,
         "latest_weeks": list(latest_weeks) if latest_weeks else [],
     }
-    return run_pipeline(df_raw, output_dir=output_dir, metadata=metadata)
+    return run_pipeline(
+        RawFiles(paths, load),
+        output_dir=output_dir,
+        metadata=metadata,
+        recorder=recorder,
+        model=model,
+        cache_dir=cache_dir,
+    )
 
 
 def append_weekly_updates(
@@ -89,45 +506,79 @@ def append_weekly_updates(
     season: int,
     weeks: Sequence[int],
     weekly_dir: Path | None = None,
+    recorder: PipelineRecorder | None = None,
+    model: ConflictModel | None = None,
+    arrow: bool = False,
 ) -> dict[str, Path]:
     """Append new weekly raw files to an existing processed run.
 
     If existing outputs are missing the conflict scores will be rebuilt from the
     provided weekly updates only. This keeps the command resilient while still
     encouraging a historical base build.
+
+    New plays are scored with ``model`` when given; pass the same model (or
+    none) as the base run so old and new scores are comparable.
     """
 
-    weekly_raw = load_weekly_updates(season, weeks, weekly_dir=weekly_dir)
-    df_feat = engineer_basic_features(weekly_raw)
-    df_updates = compute_conflict_scores(df_feat)
+    recorder = recorder or PipelineRecorder()
+    with recorder.stage("load") as stage:
+        stage.bytes_in = file_bytes(weekly_raw_paths(season, weeks, weekly_dir))
+        weekly_raw = load_weekly_updates(season, weeks, weekly_dir=weekly_dir, arrow=arrow)
+        stage.output(weekly_raw)
+    encoder = CategoryEncoder.load(processed_dir / CATEGORY_FILE)
+    df_updates = _score_raw_frame(weekly_raw, recorder, model, encoder)
 
     conflict_path = processed_dir / "plays_with_conflict_scores.csv"
     if conflict_path.exists():
-        df_base = pd.read_csv(conflict_path)
+        with recorder.stage("load_processed") as stage:
+            stage.bytes_in = file_bytes([conflict_path])
+            df_base = encoder.encode(pd.read_csv(conflict_path))
+            stage.output(df_base)
+        # Arrow-backed text would turn the combined columns into objects.
+        df_updates = encoder.encode(plain_strings(df_updates))
         df_conf = pd.concat([df_base, df_updates], ignore_index=True)
     else:
         df_conf = df_updates
 
-    df_conf = _dedupe_conflict_frame(df_conf)
-
-    df_game = compute_team_game_occi(df_conf)
-    season_lookup = df_conf[["game_id", "season"]].drop_duplicates() if "season" in df_conf.columns else None
-    df_season = compute_team_season_occi(df_game, season_lookup=season_lookup)
+    combined_rows = len(df_conf)
+    df_conf = _dedupe_stage(df_conf, recorder)
+    df_game, df_season = _aggregate_stage(df_conf, recorder)
+    # Sketches can only be merged when the update added plays without replacing any.
+    only_new_plays = conflict_path.exists() and len(df_conf) == combined_rows
+    df_season, digests = _quantile_stage(
+        df_season, df_conf, processed_dir, recorder, df_new_plays=df_updates if only_new_plays else None
+    )
+    df_adjusted = _adjustment_stage(df_game, df_conf, processed_dir, recorder)
+    df_splits = _splits_stage(df_conf, recorder)
+    df_drives, df_series = _drive_stage(df_conf, recorder)
+    rolling_state, df_rolling, rolling_append = _rolling_stage(
+        df_game, df_conf, processed_dir, recorder, new_game_ids=df_updates["game_id"].unique()
+    )
 
-    processed_dir.mkdir(parents=True, exist_ok=True)
-    df_conf.to_csv(conflict_path, index=False)
-    game_path = processed_dir / "team_game_occi.csv"
-    season_path = processed_dir / "team_season_occi.csv"
-    df_game.to_csv(game_path, index=False)
-    df_season.to_csv(season_path, index=False)
+    paths = _write_stage(
+        processed_dir,
+        {
+            "conflict": ("plays_with_conflict_scores.csv", df_conf),
+            "game": ("team_game_occi.csv", df_game),
+            "season": ("team_season_occi.csv", df_season),
+            "adjusted": (ADJUSTED_FILE, df_adjusted),
+            "splits": ("team_occi_splits.csv", df_splits),
+            "drives": ("drive_occi.csv", df_drives),
+            "series": ("series_occi.csv", df_series),
+            "rolling": ("team_rolling_occi.csv", df_rolling),
+        },
+        recorder,
+        append_keys=("rolling",) if rolling_append else (),
+    )
+    rolling_state.save(processed_dir / ROLLING_STATE_FILE)
+    save_digests(digests, processed_dir / SKETCH_FILE)
+    encoder.save(processed_dir / CATEGORY_FILE)
+    _play_index_stage(df_conf, processed_dir, recorder)
+    _feature_store_stage(df_conf, processed_dir, recorder)
 
-    meta_path = processed_dir / "occi_run_metadata.json"
-    meta: dict = {}
-    if meta_path.exists():
-        try:
-            meta = json.loads(meta_path.read_text())
-        except json.JSONDecodeError:
-            meta = {}
+    meta = _read_metadata(processed_dir)
+    # The outputs no longer match the stages that produced ``stage_key``.
+    meta.pop("stage_key", None)
 
     meta.update(
         {
@@ -139,8 +590,43 @@ def append_weekly_updates(
             "seasons": sorted(df_conf["season"].dropna().unique().tolist()) if "season" in df_conf.columns else [],
             "plays": int(len(df_conf)),
             "games": int(df_game.shape[0]),
+            "scorer": _scorer_metadata(model),
         }
     )
-    meta_path.write_text(json.dumps(meta, indent=2))
+    _write_metadata(processed_dir, meta, recorder)
+
+    return paths
+
+
+def rescore_from_features(
+    processed_dir: Path,
+    recorder: PipelineRecorder | None = None,
+    model: ConflictModel | None = None,
+    cache_dir: Path | None = None,
+) -> dict[str, Path]:
+    """Recompute conflict scores and every aggregate from ``play_features.parquet``.
+
+    Raw play-by-play is not read and features are not re-engineered, so a
+    change to the heuristic (or a new ``model``) only costs scoring,
+    aggregation and writing. ``plays_with_conflict_scores.csv`` keeps every
+    raw column; only its ``conflict_score`` is replaced.
+    """
+    recorder = recorder or PipelineRecorder()
+    features_path = processed_dir / FEATURES_FILE
+    if not features_path.exists():
+        raise FileNotFoundError(f"{features_path} does not exist. Run the pipeline once to create it.")
+
+    def load() -> pd.DataFrame:
+        with recorder.stage("load_features") as stage:
+            stage.bytes_in = file_bytes([features_path])
+            df_feat = encoder.encode(read_feature_store(features_path, categorical=True))
+            stage.output(df_feat)
+        return df_feat
 
-    return {"conflict": conflict_path, "game": game_path, "season": season_path}
+    encoder = CategoryEncoder.load(processed_dir / CATEGORY_FILE)
+    meta = _read_metadata(processed_dir)
+    meta.pop("stage_key", None)
+    meta.pop("instrumentation", None)
+    return _run_stages(
+        RawFiles([features_path], load), processed_dir, meta, recorder, model, cache_dir, encoder, from_features=True
+    )
@@ -0,0 +1,283 @@
+"""
+Watch mode: append weekly raw files to a processed run as they land.
+
+``WeeklyWatcher`` scans a weekly directory for ``pbp_<season>_week_<week>``
+files (``.csv`` or ``.csv.gz``) and hands new or changed ones to
+``append_weekly_updates``, one call per season with just those weeks.
+Only names the loader resolves are watched: weeks without a leading zero,
+and the ``.csv`` alone when a week has both a ``.csv`` and a ``.csv.gz``.
+
+- Partial writes are debounced: a file is only picked up once it has not
+  been modified for ``settle`` seconds. Temporary names (``.part``, dotfiles,
+  ...) never match the pattern, so writers that rename into place are picked
+  up as soon as the rename lands.
+- ``watch_manifest.json`` in the processed directory records the size,
+  mtime and SHA-1 of every file already appended. A file whose size or
+  mtime differs from its entry is hashed, and only appended if its content
+  changed, so touching or re-copying an identical file costs nothing.
+  Re-delivered weeks replace their earlier plays, as with ``--weekly-append``.
+- A file that fails to load is skipped until it changes again.
+
+``run`` waits on filesystem events from ``watchdog`` (inotify on Linux) when
+it is installed and polls the directory otherwise.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from ..model.learned import ConflictModel
+from .instrumentation import PipelineRecorder
+from .updates import append_weekly_updates
+
+# Week numbers as ``weekly_raw_paths`` formats them, i.e. without a leading zero.
+WEEKLY_FILE_PATTERN = re.compile(r"^pbp_(?P<season>\d{4})_week_(?P<week>[1-9]\d?)\.csv(?:\.gz)?$")
+WATCH_MANIFEST_FILE = "watch_manifest.json"
+DEFAULT_SETTLE_SECONDS = 2.0
+DEFAULT_POLL_SECONDS = 1.0
+# With filesystem events, still rescan this often in case an event was missed.
+EVENT_RESCAN_SECONDS = 30.0
+# Events that can change a file's content or presence.
+_WAKE_EVENTS = {"created", "modified", "moved", "deleted", "closed"}
+_HASH_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True)
+class WeeklyFile:
+    """A weekly raw file as last seen on disk."""
+
+    path: Path
+    season: int
+    week: int
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class WatchBatch:
+    """One ``append_weekly_updates`` call made by the watcher."""
+
+    season: int
+    weeks: list[int]
+    files: list[str]
+    seconds: float
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def scan_weekly_dir(weekly_dir: Path) -> list[WeeklyFile]:
+    """Weekly raw files in ``weekly_dir``, one per week, sorted by season and week.
+
+    A week with both a ``.csv`` and a ``.csv.gz`` is the ``.csv``, which is
+    what ``load_weekly_updates`` reads.
+    """
+    files = []
+    try:
+        entries = list(os.scandir(weekly_dir))
+    except FileNotFoundError:
+        return []
+    for entry in entries:
+        match = WEEKLY_FILE_PATTERN.match(entry.name)
+        if not match or not entry.is_file():
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:  # Removed between listing and stat.
+            continue
+        files.append(
+            WeeklyFile(Path(entry.path), int(match["season"]), int(match["week"]), stat.st_size, stat.st_mtime_ns)
+        )
+    by_week: dict[tuple[int, int], WeeklyFile] = {}
+    # ".csv" sorts before ".csv.gz", matching the loader's preference.
+    for file in sorted(files, key=lambda f: f.path.name):
+        by_week.setdefault((file.season, file.week), file)
+    return [by_week[key] for key in sorted(by_week)]
+
+
+def _sha1(path: Path) -> str:
+    digest = hashlib.sha1()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_watch_manifest(path: Path) -> dict[str, dict]:
+    """Manifest entries keyed by file name; empty if the manifest is missing or unreadable."""
+    try:
+        return json.loads(Path(path).read_text()).get("files", {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_watch_manifest(entries: dict[str, dict], path: Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"files": entries}, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def _entry(file: WeeklyFile, sha1: str) -> dict:
+    return {"season": file.season, "week": file.week, "size": file.size, "mtime_ns": file.mtime_ns, "sha1": sha1}
+
+
+def _start_observer(directory: Path, wake: threading.Event):
+    """A running ``watchdog`` observer that sets ``wake`` on changes, or None without watchdog."""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class _Wake(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.event_type in _WAKE_EVENTS:
+                wake.set()
+
+    observer = Observer()
+    observer.schedule(_Wake(), str(directory), recursive=False)
+    observer.start()
+    return observer
+
+
+@dataclass
+class WeeklyWatcher:
+    """Appends new or changed weekly files in ``weekly_dir`` to the run in ``processed_dir``."""
+
+    weekly_dir: Path
+    processed_dir: Path
+    settle: float = DEFAULT_SETTLE_SECONDS
+    model: ConflictModel | None = None
+    arrow: bool = False
+    log_path: Path | None = None
+    # Files that failed to load, by name, with the (size, mtime) they failed at.
+    failed: dict[str, tuple[int, int]] = field(default_factory=dict, repr=False)
+    uses_events: bool = field(default=False, init=False)
+    _wake: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+
+    def __post_init__(self):
+        self.weekly_dir = Path(self.weekly_dir)
+        self.processed_dir = Path(self.processed_dir)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.processed_dir / WATCH_MANIFEST_FILE
+
+    def changed_files(self) -> list[WeeklyFile]:
+        """Files whose size or mtime differ from the manifest (content may still match)."""
+        manifest = load_watch_manifest(self.manifest_path)
+        changed = []
+        for file in scan_weekly_dir(self.weekly_dir):
+            seen = manifest.get(file.path.name, {})
+            stamp = (file.size, file.mtime_ns)
+            if (seen.get("size"), seen.get("mtime_ns")) != stamp and self.failed.get(file.path.name) != stamp:
+                changed.append(file)
+        return changed
+
+    def _settles_in(self, file: WeeklyFile, now: float) -> float:
+        return file.mtime_ns / 1e9 + self.settle - now
+
+    def mark_current(self) -> int:
+        """Record every file present as already appended, e.g. after a base build that included them."""
+        manifest = load_watch_manifest(self.manifest_path)
+        files = scan_weekly_dir(self.weekly_dir)
+        for file in files:
+            manifest[file.path.name] = _entry(file, _sha1(file.path))
+        save_watch_manifest(manifest, self.manifest_path)
+        return len(files)
+
+    def poll(self) -> list[WatchBatch]:
+        """Append every changed file that has settled; returns one batch per season."""
+        now = time.time()
+        ready = [f for f in self.changed_files() if self._settles_in(f, now) <= 0]
+        if not ready:
+            return []
+
+        manifest = load_watch_manifest(self.manifest_path)
+        by_season: dict[int, list[tuple[WeeklyFile, str]]] = {}
+        for file in ready:
+            sha1 = _sha1(file.path)
+            if manifest.get(file.path.name, {}).get("sha1") == sha1:
+                manifest[file.path.name] = _entry(file, sha1)
+            else:
+                by_season.setdefault(file.season, []).append((file, sha1))
+        save_watch_manifest(manifest, self.manifest_path)
+
+        batches = []
+        for season, files in sorted(by_season.items()):
+            batch = self._append(season, files, manifest)
+            if batch.error and len(files) > 1:
+                # Retry week by week so one bad file does not hold back the others.
+                batches.extend(self._append(season, [item], manifest) for item in files)
+            else:
+                batches.append(batch)
+        return batches
+
+    def _append(self, season: int, files: list[tuple[WeeklyFile, str]], manifest: dict[str, dict]) -> WatchBatch:
+        weeks = sorted({file.week for file, _ in files})
+        names = [file.path.name for file, _ in files]
+        start = time.perf_counter()
+        try:
+            append_weekly_updates(
+                self.processed_dir,
+                season=season,
+                weeks=weeks,
+                weekly_dir=self.weekly_dir,
+                recorder=PipelineRecorder(log_path=self.log_path),
+                model=self.model,
+                arrow=self.arrow,
+            )
+        except Exception as exc:  # A bad file must not stop the watcher.
+            for file, _ in files:
+                self.failed[file.path.name] = (file.size, file.mtime_ns)
+            return WatchBatch(season, weeks, names, time.perf_counter() - start, f"{type(exc).__name__}: {exc}")
+        for file, sha1 in files:
+            manifest[file.path.name] = _entry(file, sha1)
+            self.failed.pop(file.path.name, None)
+        save_watch_manifest(manifest, self.manifest_path)
+        return WatchBatch(season, weeks, names, time.perf_counter() - start)
+
+    def _next_wait(self, interval: float) -> float:
+        """Seconds until the next scan: the earliest settling file, else ``interval``."""
+        now = time.time()
+        settling = [self._settles_in(f, now) for f in self.changed_files()]
+        return max(0.05, min([interval, *settling]))
+
+    def run(
+        self,
+        on_batch: Callable[[WatchBatch], None] | None = None,
+        poll_interval: float = DEFAULT_POLL_SECONDS,
+        use_events: bool = True,
+    ) -> None:
+        """Watch until ``stop`` is called, calling ``on_batch`` after each append."""
+        self.weekly_dir.mkdir(parents=True, exist_ok=True)
+        observer = _start_observer(self.weekly_dir, self._wake) if use_events else None
+        self.uses_events = observer is not None
+        interval = EVENT_RESCAN_SECONDS if observer is not None else poll_interval
+        try:
+            while not self._stop.is_set():
+                for batch in self.poll():
+                    if on_batch is not None:
+                        on_batch(batch)
+                self._wake.wait(self._next_wait(interval))
+                self._wake.clear()
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+
+    def stop(self) -> None:
+        """Make ``run`` return after the current scan."""
+        self._stop.set()
+        self._wake.set()
@@ -0,0 +1,112 @@
+"""
+HTTP scoring service for play-level conflict scores.
+
+``POST /api/score`` accepts a batch of raw plays with nflverse column names,
+either as JSON (a list of play objects, or ``{"plays": [...]}``) or as an
+Arrow IPC stream (``Content-Type: application/vnd.apache.arrow.stream``).
+Concurrent requests are coalesced by a :class:`MicroBatcher`, so many small
+requests share one vectorized feature/scoring pass.
+
+The response lists one ``conflict_score`` per play in request order, as JSON
+(``{"plays": n, "scores": [...]}``) or as an Arrow stream when the request
+``Accept`` header asks for one. ``GET /health`` reports batching statistics.
+
+Run with ``python -m conflict_map.service --port 5002``.
+"""
+from __future__ import annotations
+
+import argparse
+
+import pandas as pd
+import pyarrow as pa
+from flask import Flask, Response, jsonify, request
+
+from .pipeline.scoring import DEFAULT_MAX_BATCH_ROWS, DEFAULT_MAX_WAIT_MS, MicroBatcher, score_plays
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+# Raw columns echoed back next to the score so callers can join results.
+ID_COLUMNS = ("game_id", "play_id")
+REQUEST_TIMEOUT = 30.0
+
+
+def _read_plays() -> pd.DataFrame:
+    if request.mimetype == ARROW_STREAM:
+        return pa.ipc.open_stream(request.get_data()).read_pandas()
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("plays")
+    if not isinstance(payload, list) or not all(isinstance(p, dict) for p in payload):
+        raise ValueError("expected a JSON list of play objects or {\"plays\": [...]}")
+    return pd.DataFrame.from_records(payload)
+
+
+def _arrow_response(df_plays: pd.DataFrame, scores: pd.Series) -> Response:
+    result = df_plays[[c for c in ID_COLUMNS if c in df_plays.columns]].reset_index(drop=True)
+    result["conflict_score"] = scores.to_numpy()
+    table = pa.Table.from_pandas(result, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Response(sink.getvalue().to_pybytes(), mimetype=ARROW_STREAM)
+
+
+def create_app(batcher: MicroBatcher | None = None, batching: bool = True) -> Flask:
+    """Build the scoring app. With ``batching=False`` every request is scored on its own."""
+    app = Flask(__name__)
+    if batching and batcher is None:
+        batcher = MicroBatcher()
+    app.config["batcher"] = batcher if batching else None
+
+    @app.route("/api/score", methods=["POST"])
+    def score():
+        try:
+            df_plays = _read_plays()
+        except (ValueError, pa.ArrowInvalid) as exc:
+            return jsonify({"error": str(exc)}), 400
+        if df_plays.empty:
+            scores = pd.Series(dtype=float)
+        elif app.config["batcher"] is not None:
+            scores = app.config["batcher"].score(df_plays, timeout=REQUEST_TIMEOUT)
+        else:
+            scores = score_plays(df_plays)
+
+        if ARROW_STREAM in request.headers.get("Accept", ""):
+            return _arrow_response(df_plays, scores)
+        return jsonify({"plays": int(len(scores)), "scores": scores.round(6).tolist()})
+
+    @app.route("/health")
+    def health():
+        stats = app.config["batcher"].stats() if app.config["batcher"] is not None else {}
+        return jsonify({"status": "ok", "batching": app.config["batcher"] is not None, **stats})
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve play-level conflict scores over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5002)
+    parser.add_argument(
+        "--max-batch-rows",
+        type=int,
+        default=DEFAULT_MAX_BATCH_ROWS,
+        help="Stop coalescing requests once a batch holds this many plays.",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=DEFAULT_MAX_WAIT_MS,
+        help="How long the batcher waits for more requests before scoring.",
+    )
+    parser.add_argument("--no-batching", action="store_true", help="Score each request on its own.")
+    args = parser.parse_args()
+
+    batcher = None if args.no_batching else MicroBatcher(
+        max_batch_rows=args.max_batch_rows, max_wait_ms=args.max_wait_ms
+    )
+    app = create_app(batcher, batching=not args.no_batching)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from conflict_map.metrics.adjusted import attach_opponents, fit_opponent_adjusted_occi
+
+
+def _round_robin(offense, defense, seasons=(2023,)):
+    rows = []
+    for season in seasons:
+        for team in offense:
+            for opponent in offense:
+                if team != opponent:
+                    rows.append(
+                        {
+                            "season": season,
+                            "game_id": f"{season}_{min(team, opponent)}_{max(team, opponent)}",
+                            "team": team,
+                            "opponent": opponent,
+                            "plays": 60,
+                            "occi_mean": 0.5 + offense[team] + defense[opponent],
+                        }
+                    )
+    return pd.DataFrame(rows)
+
+
+def test_recovers_offense_effects_despite_schedule():
+    offense = {"A": 0.10, "B": 0.0, "C": -0.10, "D": 0.0}
+    defense = {"A": 0.0, "B": 0.05, "C": 0.0, "D": -0.05}
+    df_game = _round_robin(offense, defense)
+    # A soft schedule: D gets two extra games against the most permissive defense.
+    soft = df_game[(df_game["team"] == "D") & (df_game["opponent"] == "B")]
+    df_game = pd.concat([df_game, soft, soft])
+
+    result = fit_opponent_adjusted_occi(df_game, ridge=1e-6).set_index("team")
+
+    assert result.loc["D", "raw_occi"] > result.loc["B", "raw_occi"] + 0.01
+    assert np.isclose(result.loc["D", "offense_effect"], result.loc["B", "offense_effect"], atol=1e-4)
+    assert np.isclose(result.loc["A", "offense_effect"] - result.loc["C", "offense_effect"], 0.2, atol=1e-4)
+    assert np.isclose(result.loc["B", "defense_effect"] - result.loc["D", "defense_effect"], 0.1, atol=1e-4)
+    assert result.loc["D", "schedule_strength"] > result.loc["B", "schedule_strength"]
+
+
+def test_warm_start_matches_cold_fit():
+    rng = np.random.default_rng(1)
+    teams = list("ABCDEF")
+    df_game = _round_robin(dict(zip(teams, rng.normal(0, 0.05, 6))), dict(zip(teams, rng.normal(0, 0.05, 6))), (2022, 2023))
+    df_game["occi_mean"] += rng.normal(0, 0.01, len(df_game))
+    partial = fit_opponent_adjusted_occi(df_game.iloc[:-6])
+
+    cold = fit_opponent_adjusted_occi(df_game)
+    warm = fit_opponent_adjusted_occi(df_game, previous=partial)
+
+    pd.testing.assert_frame_equal(cold, warm, atol=1e-8)
+
+
+def test_attach_opponents_from_plays():
+    df_game = pd.DataFrame({"game_id": ["g1", "g1"], "team": ["A", "B"], "occi_mean": [0.4, 0.5]})
+    plays = pd.DataFrame(
+        {"game_id": ["g1"] * 3, "posteam": ["A", "B", "A"], "defteam": ["B", "A", "B"], "season": 2023}
+    )
+    result = attach_opponents(df_game, plays)
+    assert result["opponent"].tolist() == ["B", "A"]
+    assert result["season"].tolist() == [2023, 2023]
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from conflict_map.data.arrow_backend import plain_strings, read_csv_arrow
+from conflict_map.data.synthetic import simulate_week
+from conflict_map.pipeline.updates import run_pipeline
+
+
+def _assert_same_values(arrow: pd.DataFrame, default: pd.DataFrame) -> None:
+    assert list(arrow.columns) == list(default.columns)
+    for col in default.columns:
+        if isinstance(arrow[col].dtype, pd.ArrowDtype):
+            expected = default[col].to_numpy(dtype=object, na_value=None).tolist()
+            assert arrow[col].to_numpy(dtype=object, na_value=None).tolist() == expected, col
+        else:
+            pd.testing.assert_series_equal(arrow[col], default[col], obj=col)
+
+
+def test_reader_matches_pandas_types_and_missing_values(tmp_path):
+    path = tmp_path / "plays.csv"
+    path.write_text(
+        "game_id,down,epa,motion,penalty_type,empty,game_date,note\n"
+        "2030_01_A_B,1,0.25,True,,,2030-09-07,NA\n"
+        "2030_01_A_B,,-1.5,,Defensive Holding,,2030-09-07,None\n"
+        "2030_01_A_B,3,nan,False,N/A,,2030-09-08,\"a, b\"\n"
+    )
+    df = read_csv_arrow(path)
+    default = pd.read_csv(path)
+
+    _assert_same_values(df, default)
+    assert isinstance(df["game_id"].dtype, pd.ArrowDtype)
+    assert df["down"].dtype == np.float64 and df["motion"].dtype == object
+    assert df["game_date"].tolist() == default["game_date"].tolist()
+    assert plain_strings(df)["penalty_type"].tolist()[1] == "Defensive Holding"
+
+
+def test_reader_falls_back_when_a_column_changes_type(tmp_path):
+    path = tmp_path / "late_text.csv"
+    rows = ["play_id,value"] + [f"{i},{i}" for i in range(200_000)] + ["200000,late"]
+    path.write_text("\n".join(rows) + "\n")
+
+    df = read_csv_arrow(path)
+    assert df["value"].iloc[-1] == "late" and df["play_id"].dtype == np.int64
+
+
+def test_arrow_pipeline_writes_identical_outputs(tmp_path):
+    path = tmp_path / "pbp.csv"
+    simulate_week(2030, 1, num_teams=6).to_csv(path, index=False)
+    run_pipeline(pd.read_csv(path), tmp_path / "default")
+    run_pipeline(read_csv_arrow(path), tmp_path / "arrow")
+
+    for output in sorted((tmp_path / "default").glob("*.csv")):
+        assert output.read_bytes() == (tmp_path / "arrow" / output.name).read_bytes(), output.name
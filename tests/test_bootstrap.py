@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from conflict_map.metrics import bootstrap
+from conflict_map.metrics.bootstrap import bootstrap_group_means, bootstrap_team_occi, rank_probability_matrix
+
+
+def _games():
+    rng = np.random.default_rng(1)
+    teams = np.repeat(["A", "B", "C"], 17)
+    means = {"A": 0.40, "B": 0.30, "C": 0.29}
+    return pd.DataFrame(
+        {
+            "season": 2023,
+            "team": teams,
+            "occi_mean": [means[t] + rng.normal(0, 0.02) for t in teams],
+        }
+    )
+
+
+def test_resamples_stay_within_each_group():
+    values = np.r_[np.zeros(50), np.ones(50)]
+    codes = np.r_[np.zeros(50, dtype=int), np.ones(50, dtype=int)]
+    samples = bootstrap_group_means(np.r_[values, values], np.r_[codes, codes + 2], n_resamples=2000)
+    assert samples.shape == (2000, 4)
+    np.testing.assert_array_equal(samples[:, 0], 0.0)
+    np.testing.assert_array_equal(samples[:, 1], 1.0)
+
+
+def test_intervals_and_rank_probabilities():
+    result = bootstrap_team_occi(_games(), n_resamples=2000, seed=3)
+    intervals = result.intervals(0.9).set_index("team")
+
+    assert list(intervals["rank"]) == [1, 2, 3]
+    assert (intervals["ci_low"] < intervals["occi"]).all()
+    assert (intervals["occi"] < intervals["ci_high"]).all()
+    assert intervals.loc["A", "rank_ci_high"] == 1
+    assert intervals.loc["C", "rank_ci_low"] == 2
+
+    matrix = rank_probability_matrix(result, season=2023)
+    np.testing.assert_allclose(matrix.sum(axis=1), 1.0)
+    np.testing.assert_allclose(matrix.sum(axis=0), 1.0)
+    assert matrix.loc["A", "rank_1"] == 1.0
+    assert 0.0 < matrix.loc["B", "rank_2"] < 1.0
+
+
+def test_same_seed_gives_same_draws_in_a_process_pool(monkeypatch):
+    monkeypatch.setattr(bootstrap, "BLOCK_DRAWS", 3000)  # 30 units -> 5 blocks of 100
+    serial = bootstrap_group_means(np.arange(30.0), np.repeat([0, 1, 2], 10), n_resamples=500, seed=7)
+    pooled = bootstrap_team_occi(
+        pd.DataFrame({"team": np.repeat(["a", "b", "c"], 10), "occi_mean": np.arange(30.0)}),
+        season_col=None,
+        n_resamples=500,
+        seed=7,
+        n_jobs=2,
+    )
+    np.testing.assert_array_equal(pooled.samples, serial)
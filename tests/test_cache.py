@@ -0,0 +1,94 @@
+import json
+import os
+
+import pandas as pd
+
+from conflict_map.data.synthetic import simulate_week, write_synthetic_weekly
+from conflict_map.pipeline.cache import RawFiles, StageExecutor
+from conflict_map.pipeline.instrumentation import PipelineRecorder
+from conflict_map.pipeline.updates import append_weekly_updates, run_pipeline
+
+
+def _double(df):
+    return df * 2
+
+
+def _triple(df):
+    return df * 3
+
+
+def test_stage_keys_follow_inputs_code_and_params(tmp_path):
+    raw_path = tmp_path / "raw.csv"
+    pd.DataFrame({"x": [1, 2, 3]}).to_csv(raw_path, index=False)
+    calls = []
+
+    def build(fn=_double, params=None):
+        executor = StageExecutor(tmp_path / "cache")
+        raw = executor.source(RawFiles([raw_path], lambda: calls.append("load") or pd.read_csv(raw_path)))
+        return executor.stage("double", fn, [raw], code=[fn], params=params)
+
+    assert list(build().value()["x"]) == [2, 4, 6]
+    assert build().cached and list(build().value()["x"]) == [2, 4, 6]
+    assert calls == ["load"]
+
+    # Touching a file without changing it keeps the key.
+    os.utime(raw_path, ns=(0, 0))
+    assert build().cached
+    assert not build(fn=_triple).cached
+    assert not build(params={"scale": 2}).cached
+
+    pd.DataFrame({"x": [5]}).to_csv(raw_path, index=False)
+    assert list(build().value()["x"]) == [10]
+
+
+def test_noop_rerun_skips_loading_and_writing(tmp_path):
+    raw_path = tmp_path / "pbp_2030.csv"
+    simulate_week(2030, 1, num_teams=6).to_csv(raw_path, index=False)
+    loads = []
+
+    def load():
+        loads.append(raw_path)
+        return pd.read_csv(raw_path)
+
+    out, cache = tmp_path / "out", tmp_path / "cache"
+    run_pipeline(RawFiles([raw_path], load), output_dir=out, cache_dir=cache)
+    first = pd.read_csv(out / "team_game_occi.csv")
+
+    recorder = PipelineRecorder()
+    run_pipeline(RawFiles([raw_path], load), output_dir=out, cache_dir=cache, recorder=recorder)
+    assert len(loads) == 1
+    assert [(s.name, s.cached) for s in recorder.stages] == [("write", True)]
+
+    # A missing output is rewritten from cached stages without reloading raw data.
+    (out / "team_game_occi.csv").unlink()
+    recorder = PipelineRecorder()
+    run_pipeline(RawFiles([raw_path], load), output_dir=out, cache_dir=cache, recorder=recorder)
+    assert len(loads) == 1
+    assert all(s.cached for s in recorder.stages if s.name not in ("write", "play_index", "feature_store"))
+    pd.testing.assert_frame_equal(pd.read_csv(out / "team_game_occi.csv"), first)
+
+
+def test_base_rerun_after_weekly_append_rewrites_outputs(tmp_path):
+    raw_path = tmp_path / "pbp_2030.csv"
+    simulate_week(2030, 1, num_teams=6).to_csv(raw_path, index=False)
+    write_synthetic_weekly(2031, [1], tmp_path / "weekly", num_teams=6)
+
+    def base_build(recorder=None):
+        run_pipeline(
+            RawFiles([raw_path], lambda: pd.read_csv(raw_path)),
+            output_dir=out,
+            cache_dir=tmp_path / "cache",
+            recorder=recorder,
+        )
+
+    out = tmp_path / "out"
+    base_build()
+    first = pd.read_csv(out / "team_season_occi.csv")
+    append_weekly_updates(out, season=2031, weeks=[1], weekly_dir=tmp_path / "weekly")
+    assert set(pd.read_csv(out / "team_season_occi.csv")["season"]) == {2030, 2031}
+
+    recorder = PipelineRecorder()
+    base_build(recorder)
+    assert ("write", True) not in [(s.name, s.cached) for s in recorder.stages]
+    pd.testing.assert_frame_equal(pd.read_csv(out / "team_season_occi.csv"), first)
+    assert json.loads((out / "occi_run_metadata.json").read_text())["seasons"] == [2030]
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from conflict_map.metrics.drives import compute_cumulative_drive_occi, compute_drive_occi
+
+
+def _plays():
+    scores = [0.5, 0.6, 0.1, 0.7, 0.2, 0.45, 0.5, 0.9]
+    df = pd.DataFrame(
+        {
+            "season": 2023,
+            "game_id": ["g1"] * 5 + ["g2"] * 3,
+            "drive": [1, 1, 1, 2, 2, 1, 1, 1],
+            "series": [1, 1, 2, 3, 3, 1, 1, 2],
+            "play_id": [10, 20, 30, 40, 50, 10, 20, 30],
+            "posteam": ["A", "A", "A", "B", "B", "C", "C", "C"],
+            "defteam": ["B", "B", "B", "A", "A", "D", "D", "D"],
+            "conflict_score": scores,
+        }
+    )
+    # Shuffle so the functions have to restore play order themselves.
+    return df.sample(frac=1, random_state=0)
+
+
+def test_drive_aggregates_and_streaks():
+    drives = compute_drive_occi(_plays(), threshold=0.4)
+    assert list(drives["game_id"]) == ["g1", "g1", "g2"]
+    assert list(drives["team"]) == ["A", "B", "C"]
+    assert list(drives["plays"]) == [3, 2, 3]
+    np.testing.assert_allclose(drives["occi_mean"], [0.4, 0.45, 1.85 / 3])
+    np.testing.assert_allclose(drives["occi_max"], [0.6, 0.7, 0.9])
+    assert list(drives["high_conflict_plays"]) == [2, 1, 3]
+    assert list(drives["longest_high_conflict_streak"]) == [2, 1, 3]
+
+    series = compute_drive_occi(_plays(), unit="series", threshold=0.4)
+    assert list(series["plays"]) == [2, 1, 2, 2, 1]
+
+
+def test_cumulative_occi_restarts_each_drive():
+    cumulative = compute_cumulative_drive_occi(_plays(), threshold=0.4)
+    assert list(cumulative["play_in_drive"]) == [1, 2, 3, 1, 2, 1, 2, 3]
+    np.testing.assert_allclose(cumulative["cumulative_occi"], [0.5, 1.1, 1.2, 0.7, 0.9, 0.45, 0.95, 1.85])
+    assert list(cumulative["high_conflict_streak"]) == [1, 2, 0, 1, 0, 1, 2, 3]
+
+
+def test_missing_unit_gives_empty_frame():
+    drives = compute_drive_occi(_plays().drop(columns="series"), unit="series")
+    assert drives.empty and "longest_high_conflict_streak" in drives.columns
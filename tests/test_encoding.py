@@ -0,0 +1,66 @@
+import pandas as pd
+
+from conflict_map.data.synthetic import simulate_week
+from conflict_map.features.build_features import engineer_basic_features
+from conflict_map.features.encoding import CATEGORY_FILE, CategoryEncoder, decode_group_codes, group_codes
+from conflict_map.metrics.occi import compute_team_game_occi, compute_team_season_occi
+from conflict_map.model.conflict_score import compute_conflict_scores
+
+
+def _scored(weeks=(1, 2)):
+    raw = pd.concat([simulate_week(2030, week, num_teams=6) for week in weeks], ignore_index=True)
+    return compute_conflict_scores(engineer_basic_features(raw))
+
+
+def test_codes_are_stable_across_appends_and_reloads(tmp_path):
+    encoder = CategoryEncoder()
+    first = encoder.encode(pd.DataFrame({"posteam": ["NYJ", "BUF", None], "game_id": ["g2", "g1", "g2"]}))
+    assert list(first["posteam"].cat.categories) == ["BUF", "NYJ"]
+    assert first["posteam"].isna().iloc[2]
+    encoder.save(tmp_path / CATEGORY_FILE)
+
+    reloaded = CategoryEncoder.load(tmp_path / CATEGORY_FILE)
+    second = reloaded.encode(pd.DataFrame({"posteam": ["NYJ", "ARI"], "game_id": ["g3", "g1"]}))
+    # New labels are appended; existing labels keep their codes.
+    assert list(second["posteam"].cat.categories) == ["BUF", "NYJ", "ARI"]
+    assert second["posteam"].cat.codes.tolist() == [1, 2]
+    assert second["game_id"].cat.codes.tolist() == [2, 0]
+    assert CategoryEncoder.load(tmp_path / "missing.json").dictionaries["posteam"] == []
+
+
+def test_integer_labels_keep_their_codes_after_reload(tmp_path):
+    ids = pd.DataFrame({"game_id": [2019090500, 2019090800]})
+    encoder = CategoryEncoder()
+    encoder.fit(ids).save(tmp_path / CATEGORY_FILE)
+
+    reloaded = CategoryEncoder.load(tmp_path / CATEGORY_FILE)
+    again = reloaded.encode(pd.DataFrame({"game_id": [2019090800, 2019091500]}))
+    assert reloaded.dictionaries["game_id"] == [2019090500, 2019090800, 2019091500]
+    assert again["game_id"].cat.codes.tolist() == [1, 2]
+
+
+def test_group_codes_round_trip_keys():
+    df = pd.DataFrame({"game_id": ["g1", "g2", "g1", None], "team": ["A", "B", "B", "A"]})
+    codes, labels = group_codes(CategoryEncoder(columns=["game_id"]).encode(df), ["game_id", "team"])
+    assert codes[3] == -1
+    games, teams = decode_group_codes(codes[:3], labels)
+    assert list(games) == ["g1", "g2", "g1"] and list(teams) == ["A", "B", "B"]
+
+
+def test_aggregates_match_on_encoded_keys():
+    df_conf = _scored()
+    # A reversed dictionary checks that results do not depend on code order.
+    reversed_encoder = CategoryEncoder(
+        {col: sorted(df_conf[col].dropna().unique(), reverse=True) for col in ("posteam", "game_id")}
+    )
+    encoded = reversed_encoder.encode(df_conf)
+    assert encoded.memory_usage(deep=True).sum() < df_conf.memory_usage(deep=True).sum()
+
+    game_plain = compute_team_game_occi(df_conf)
+    game_encoded = compute_team_game_occi(encoded)
+    pd.testing.assert_frame_equal(game_encoded, game_plain)
+
+    seasons = df_conf[["game_id", "season"]].drop_duplicates()
+    pd.testing.assert_frame_equal(
+        compute_team_season_occi(game_encoded, seasons), compute_team_season_occi(game_plain, seasons)
+    )
@@ -0,0 +1,22 @@
+import json
+
+from conflict_map.data.synthetic import simulate_week
+from conflict_map.pipeline.instrumentation import PipelineRecorder
+from conflict_map.pipeline.updates import run_pipeline
+
+
+def test_run_pipeline_records_stage_metrics(tmp_path):
+    df_raw = simulate_week(2030, 1, num_teams=4)
+    recorder = PipelineRecorder(profile_dir=tmp_path / "profile", log_path=tmp_path / "run.jsonl")
+
+    run_pipeline(df_raw, output_dir=tmp_path, recorder=recorder)
+
+    meta = json.loads((tmp_path / "occi_run_metadata.json").read_text())
+    stages = {stage["name"]: stage for stage in meta["instrumentation"]["stages"]}
+    assert {"features", "scoring", "dedupe", "aggregation", "write"} <= set(stages)
+    assert stages["features"]["rows_in"] == len(df_raw)
+    assert stages["write"]["bytes_out"] > 0
+    assert len(list((tmp_path / "profile").glob("*.pstats"))) == len(stages)
+
+    events = [json.loads(line)["event"] for line in (tmp_path / "run.jsonl").read_text().splitlines()]
+    assert events == ["stage"] * len(stages) + ["run"]
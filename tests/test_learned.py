@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conflict_map.data.synthetic import simulate_week
+from conflict_map.features.build_features import engineer_basic_features
+from conflict_map.model.learned import (
+    ConflictModel,
+    cross_validate_by_season,
+    fit_conflict_model,
+    prepare_season_folds,
+)
+from conflict_map.pipeline.updates import run_pipeline
+
+
+def _seasons():
+    frames = [simulate_week(season, week, num_teams=6) for season in (2030, 2031, 2032) for week in (1, 2)]
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize("target", ["success", "epa"])
+def test_fit_predict_and_round_trip(tmp_path, target):
+    df = engineer_basic_features(_seasons())
+    model = fit_conflict_model(df, target=target)
+    scores = model.predict(df)
+    assert scores.shape == (len(df),)
+    assert ((scores > 0) & (scores < 1)).all()
+
+    model.save(tmp_path / "model.json")
+    loaded = ConflictModel.load(tmp_path / "model.json")
+    np.testing.assert_allclose(loaded.predict(df), scores)
+    # Unseen categories are ignored rather than widening the matrix.
+    df_new = df.head(5).assign(personnel_group="9RB_0TE_0WR")
+    assert loaded.predict(df_new).shape == (5,)
+
+
+def test_season_cv_parallel_matches_serial_and_uses_cache(tmp_path):
+    df = engineer_basic_features(_seasons())
+    serial = cross_validate_by_season(df, n_jobs=1)
+    parallel = cross_validate_by_season(df, n_jobs=2, cache_dir=tmp_path)
+    assert list(serial["season"]) == [2030, 2031, 2032]
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert ((serial["auc"] > 0.5) & (serial["auc"] <= 1)).all()
+
+    cached = prepare_season_folds(df, cache_dir=tmp_path)
+    assert all(isinstance(source, str) for source in cached.sources.values())
+
+
+def test_run_pipeline_with_model_records_scorer(tmp_path):
+    df_raw = _seasons()
+    model = fit_conflict_model(engineer_basic_features(df_raw), target="epa")
+    run_pipeline(df_raw, output_dir=tmp_path, model=model)
+    meta = json.loads((tmp_path / "occi_run_metadata.json").read_text())
+    assert meta["scorer"]["kind"] == "learned"
+    plays = pd.read_csv(tmp_path / "plays_with_conflict_scores.csv")
+    np.testing.assert_allclose(plays["conflict_score"], model.predict(engineer_basic_features(df_raw)), rtol=1e-6)
@@ -0,0 +1,96 @@
+import socket
+import threading
+
+import numpy as np
+import pandas as pd
+
+from conflict_map.data.synthetic import simulate_week
+from conflict_map.features.build_features import engineer_basic_features
+from conflict_map.metrics.occi import compute_team_game_occi
+from conflict_map.model.conflict_score import compute_conflict_scores
+from conflict_map.pipeline.live import (
+    Broadcaster,
+    LiveOCCI,
+    iter_play_records,
+    open_feed,
+    replay_to_file,
+    run_live,
+    serve_replay,
+)
+
+
+def test_live_aggregates_match_batch_pipeline():
+    df_raw = simulate_week(2030, 1, num_teams=6)
+    expected = compute_team_game_occi(compute_conflict_scores(engineer_basic_features(df_raw)))
+
+    updates = []
+    live = run_live(iter_play_records(df_raw), on_update=updates.append)
+    merged = expected.merge(live.snapshot(), on=["game_id", "team"], suffixes=("", "_live"))
+
+    assert len(merged) == len(expected) == len(live.snapshot())
+    assert (merged["plays"] == merged["plays_live"]).all()
+    np.testing.assert_allclose(merged["occi_mean_live"], merged["occi_mean"])
+    np.testing.assert_allclose(merged["occi_std_live"], merged["occi_std"])
+    assert len(updates) == len(df_raw)
+
+
+def test_resent_plays_are_not_double_counted():
+    plays = list(iter_play_records(simulate_week(2030, 1, num_teams=2)))
+    live = LiveOCCI()
+    for play in plays + plays[:10]:
+        live.process(play)
+    assert live.snapshot()["plays"].sum() == len(plays)
+
+
+def test_file_and_socket_feeds(tmp_path):
+    df_raw = simulate_week(2030, 1, num_teams=2).head(40)
+
+    feed = tmp_path / "feed.jsonl"
+    replay_to_file(iter_play_records(df_raw), feed)
+    from_file = run_live(open_feed(f"file:{feed}", follow=False))
+
+    server = serve_replay(iter_play_records(df_raw))
+    try:
+        from_socket = run_live(open_feed(f"tcp:127.0.0.1:{server.server_address[1]}"))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    pd.testing.assert_frame_equal(from_file.snapshot(), from_socket.snapshot())
+    assert from_file.snapshot()["plays"].sum() == 40
+
+
+def test_tailed_feed_is_broadcast_to_subscribers(tmp_path):
+    feed = tmp_path / "feed.jsonl"
+    broadcaster = Broadcaster(maxsize=5)
+    updates = broadcaster.subscribe()
+    stop = threading.Event()
+    thread = threading.Thread(target=run_live, args=(open_feed(f"file:{feed}", stop=stop), None, broadcaster.publish))
+    thread.start()
+
+    replay_to_file(iter_play_records(simulate_week(2030, 1, num_teams=2).head(8)), feed)
+    received = [updates.get(timeout=5) for _ in range(5)]
+    stop.set()
+    thread.join(timeout=5)
+
+    assert all(u["game_id"] and u["team"] for u in received)
+    assert len({u["play_id"] for u in received}) == 5
+    assert not thread.is_alive()
+
+
+def test_quiet_socket_feed_stops_on_request():
+    server = socket.create_server(("127.0.0.1", 0))
+    stop = threading.Event()
+    seen = []
+    thread = threading.Thread(
+        target=lambda: seen.extend(open_feed(f"tcp:127.0.0.1:{server.getsockname()[1]}", stop=stop)), daemon=True
+    )
+    thread.start()
+    conn, _ = server.accept()  # Connected, but nothing is ever sent.
+    try:
+        stop.set()
+        thread.join(timeout=5)
+        assert not thread.is_alive() and seen == []
+    finally:
+        conn.close()
+        server.close()
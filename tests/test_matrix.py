@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from conflict_map.features.matrix import DesignMatrixBuilder, build_design_matrix, build_season_matrices
+from conflict_map.features.schema import FeatureSchema
+
+SCHEMA = FeatureSchema(["down", "ydstogo"], ["pass_location_bucket", "has_motion"])
+
+
+def _plays():
+    return pd.DataFrame(
+        {
+            "season": [2022, 2022, 2023, 2023],
+            "down": [1, 3, np.nan, 2],
+            "ydstogo": [10, 0, 7, 4],
+            "pass_location_bucket": ["left", "middle", "right", None],
+            "has_motion": [True, False, True, True],
+        }
+    )
+
+
+def test_transform_one_hot_and_numeric_block():
+    builder = DesignMatrixBuilder(SCHEMA)
+    matrix = builder.transform(_plays())
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (4, builder.n_features)
+    dense = pd.DataFrame(matrix.toarray(), columns=builder.feature_names)
+    assert list(dense["down"]) == [1, 3, 0, 2]
+    assert list(dense["pass_location_bucket=missing"]) == [0, 0, 0, 1]
+    assert list(dense["has_motion=True"]) == [1, 0, 1, 1]
+    # Zeros and NaN are not stored.
+    assert matrix.nnz == 3 + 3 + 4 + 4
+
+
+def test_chunks_stack_to_single_build():
+    df = _plays()
+    whole, full_builder = build_design_matrix(df, DesignMatrixBuilder(SCHEMA))
+    chunked, builder = build_design_matrix([df.iloc[:2], df.iloc[2:]], DesignMatrixBuilder(SCHEMA))
+    # Indices follow discovery order, so compare by feature name.
+    chunked_dense = pd.DataFrame(chunked.toarray(), columns=builder.feature_names)
+    whole_dense = pd.DataFrame(whole.toarray(), columns=full_builder.feature_names)
+    pd.testing.assert_frame_equal(chunked_dense[whole_dense.columns], whole_dense)
+
+    seasons, season_builder = build_season_matrices(df, DesignMatrixBuilder(SCHEMA))
+    assert set(seasons) == {2022, 2023}
+    assert {m.shape[1] for m in seasons.values()} == {season_builder.n_features}
+
+
+def test_vocabulary_round_trip_and_frozen_transform(tmp_path):
+    builder = DesignMatrixBuilder(SCHEMA).fit(_plays())
+    path = tmp_path / "vocab.json"
+    builder.save(path)
+    loaded = DesignMatrixBuilder.load(path)
+    assert loaded.feature_names == builder.feature_names
+
+    unseen = pd.DataFrame({"down": [1], "ydstogo": [2], "pass_location_bucket": ["deep"], "has_motion": [False]})
+    matrix = loaded.transform(unseen, grow=False)
+    assert matrix.shape == (1, builder.n_features)
+    assert matrix.nnz == 3
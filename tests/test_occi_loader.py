@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conflict_map.data.synthetic import generate_season
+
+data_loader = pytest.importorskip("occi.data_loader")
+calculator_module = pytest.importorskip("occi.calculator")
+
+
+def _raw_season(season):
+    return generate_season(season, weeks=[1, 2], num_teams=8, seed=season)
+
+
+def _scrimmage(df):
+    return df[df["play_type"].isin(["pass", "run"]) & df["down"].notna()].reset_index(drop=True)
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    def fetch(season, columns):
+        calls.append(season)
+        return _raw_season(season)[columns]
+
+    monkeypatch.setattr(data_loader, "_fetch_season", fetch)
+    return calls
+
+
+def test_seasons_are_trimmed_cached_and_read_back(tmp_path, fetches):
+    columns = data_loader.default_columns()
+    first = data_loader.load_nfl_data([2022, 2023], cache_dir=tmp_path)
+    assert fetches == [2022, 2023]
+    assert list(first.columns) == columns
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["pbp_2022.parquet", "pbp_2023.parquet"]
+
+    expected = pd.concat([_scrimmage(_raw_season(2022)), _scrimmage(_raw_season(2023))], ignore_index=True)
+    assert len(first) == len(expected)
+    assert first["down"].dtype == np.float32 and first["season"].dtype == np.int16
+    pd.testing.assert_frame_equal(first, expected[columns], check_dtype=False)
+
+    again = data_loader.load_nfl_data([2022, 2023], cache_dir=tmp_path, offline=True)
+    assert fetches == [2022, 2023]
+    pd.testing.assert_frame_equal(again, first)
+
+    data_loader.load_nfl_data([2022, 2023], cache_dir=tmp_path, refresh=[2023])
+    assert fetches == [2022, 2023, 2023]
+
+    # A cached season without a requested column is downloaded again.
+    data_loader.load_nfl_data([2022], cache_dir=tmp_path, columns=[*columns, "epa"])
+    assert fetches[-1] == 2022
+
+
+def test_downcast_plays_score_identically(tmp_path, fetches):
+    plays = data_loader.load_nfl_data([2023], cache_dir=tmp_path)
+    full = _scrimmage(_raw_season(2023))
+
+    downcast = calculator_module.OCCICalculator(plays)
+    reference = calculator_module.OCCICalculator(full)
+    np.testing.assert_array_equal(downcast.calculate_play_occi().to_numpy(), reference.calculate_play_occi().to_numpy())
+    pd.testing.assert_frame_equal(
+        downcast.calculate_team_occi(), reference.calculate_team_occi(), check_dtype=False
+    )
+
+
+def test_offline_mode_never_downloads(tmp_path, fetches, monkeypatch):
+    with pytest.raises(FileNotFoundError):
+        data_loader.load_nfl_data([2023], cache_dir=tmp_path, offline=True)
+    with pytest.raises(ValueError):
+        data_loader.load_nfl_data([2023], cache_dir=tmp_path, offline=True, refresh=True)
+
+    monkeypatch.setenv("OCCI_OFFLINE", "true")
+    monkeypatch.setenv("OCCI_CACHE_DIR", str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        data_loader.load_nfl_data([2023])
+    assert fetches == []
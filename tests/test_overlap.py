@@ -0,0 +1,128 @@
+import filecmp
+import functools
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from conflict_map.data.load import load_raw_multiple_seasons, load_weekly_updates
+from conflict_map.data.synthetic import write_synthetic_season, write_synthetic_weekly
+from conflict_map.pipeline.instrumentation import PipelineRecorder
+from conflict_map.pipeline.overlap import Fetcher, build_overlapped, range_sources, run_overlapped
+from conflict_map.pipeline.updates import run_pipeline
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def file_server(tmp_path):
+    """Serve ``tmp_path / "remote"`` over HTTP, standing in for the nflverse release pages."""
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=str(remote)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield remote, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    thread.join()
+
+
+def test_steps_overlap_in_order_with_bounded_queues():
+    in_flight, peak, active, seen, busy = [0], [0], {}, [], {}
+    lock = threading.Lock()
+
+    def step(name):
+        def run(item):
+            with lock:
+                active[name] = item
+                seen.append(dict(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop(name)
+            return item
+
+        return run
+
+    def items():
+        for i in range(12):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            yield i
+
+    def consume(iterator):
+        for item in iterator:
+            with lock:
+                in_flight[0] -= 1
+            time.sleep(0.03)  # A slow consumer must throttle the producers.
+            yield item
+
+    steps = [(name, step(name)) for name in ("fetch", "parse", "score")]
+    assert list(consume(run_overlapped(items(), steps, queue_size=1, busy=busy))) == list(range(12))
+    assert max(len(snapshot) for snapshot in seen) > 1  # Different items were in different steps at once.
+    assert peak[0] <= 3 * 2 + 2  # Queues of one plus one item per thread and the consumer.
+    assert set(busy) == {"fetch", "parse", "score"}
+
+
+def test_step_failure_is_raised_and_threads_stop():
+    def parse(item):
+        if item == 3:
+            raise ValueError("bad file")
+        return item
+
+    before = threading.active_count()
+    results = []
+    with pytest.raises(ValueError, match="bad file"):
+        for item in run_overlapped(range(100), [("fetch", lambda i: i), ("parse", parse)]):
+            results.append(item)
+    assert results == [0, 1, 2]
+    assert threading.active_count() == before
+
+
+def test_overlapped_build_downloads_and_matches_sequential_outputs(tmp_path, file_server):
+    remote, base_url = file_server
+    for season in (2028, 2029):
+        write_synthetic_season(season, remote, weeks=[1, 2], num_teams=4, seed=season)
+    for week, path in zip((1, 2), write_synthetic_weekly(2030, [1, 2], remote, num_teams=4)):
+        path.rename(remote / f"pbp_2030_{week}.csv.gz")  # The weekly release's naming.
+
+    fetcher = Fetcher(
+        data_dir=tmp_path / "raw",
+        weekly_dir=tmp_path / "raw" / "weekly",
+        season_url=base_url + "/pbp_{season}.csv.gz",
+        weekly_url=base_url + "/pbp_{season}_{week}.csv.gz",
+    )
+    recorder = PipelineRecorder()
+    build_overlapped(range_sources([2028, 2029], 2030, [1, 2]), tmp_path / "overlapped", fetcher, recorder=recorder)
+    stages = {stage.name: stage for stage in recorder.stages}
+    assert stages["load"].bytes_out > 0
+    assert all(stages[f"overlap_{step}"].bytes_out is None for step in ("fetch", "parse", "score"))
+    assert sorted(p.name for p in (tmp_path / "raw").rglob("*.gz")) == [
+        "pbp_2028.csv.gz",
+        "pbp_2029.csv.gz",
+        "pbp_2030_week_1.csv.gz",
+        "pbp_2030_week_2.csv.gz",
+    ]
+
+    df_raw = pd.concat(
+        [
+            load_raw_multiple_seasons([2028, 2029], data_dir=tmp_path / "raw"),
+            load_weekly_updates(2030, [1, 2], weekly_dir=tmp_path / "raw" / "weekly"),
+        ],
+        ignore_index=True,
+    )
+    run_pipeline(df_raw, tmp_path / "sequential")
+    for path in (tmp_path / "sequential").iterdir():
+        if path.name != "occi_run_metadata.json":
+            assert filecmp.cmp(path, tmp_path / "overlapped" / path.name, shallow=False), path.name
+
+    # Files now on disk are not downloaded again.
+    offline = Fetcher(tmp_path / "raw", tmp_path / "raw" / "weekly", season_url=None, weekly_url=None)
+    build_overlapped(range_sources([2028, 2029], 2030, [1, 2]), tmp_path / "again", offline)
+    plays = "plays_with_conflict_scores.csv"
+    assert filecmp.cmp(tmp_path / "overlapped" / plays, tmp_path / "again" / plays, shallow=False)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from conflict_map.data.synthetic import simulate_week
+from conflict_map.pipeline.play_index import PLAY_INDEX_FILE, PlayFilter, PlayIndex, write_play_index
+from conflict_map.pipeline.updates import run_pipeline
+
+
+def _plays(seed_weeks=(1, 2, 3)):
+    frames = [simulate_week(2030, week, num_teams=8) for week in seed_weeks]
+    plays = pd.concat(frames, ignore_index=True)
+    rng = np.random.default_rng(0)
+    # Coarse scores so pages have to break plenty of ties.
+    plays["conflict_score"] = rng.integers(0, 5, len(plays)) / 4
+    return plays
+
+
+def test_pages_follow_score_order_with_stable_ties(tmp_path):
+    plays = _plays()
+    index = PlayIndex(write_play_index(plays, tmp_path / PLAY_INDEX_FILE))
+    team = sorted(plays["posteam"].unique())[0]
+    play_filter = PlayFilter(teams=(team,), weeks=(1, 3))
+
+    subset = plays[plays["posteam"].eq(team) & plays["week"].isin([1, 3])]
+    subset = subset.sort_values(["season", "posteam", "week", "game_id", "play_id"], kind="stable")
+    expected = subset.sort_values("conflict_score", ascending=False, kind="stable")["play_id"].tolist()
+
+    assert index.count(play_filter) == len(subset)
+    pages = [index.page(play_filter, page, page_size=7) for page in range(-(-len(subset) // 7))]
+    assert [p for page in pages for p in page.rows["play_id"]] == expected
+    assert pages[0].total_rows == len(subset) and pages[0].pages == len(pages)
+    # Out-of-range pages clamp to the last one.
+    assert index.page(play_filter, 10_000, page_size=7).page == len(pages) - 1
+
+    ascending = index.page(play_filter, 0, page_size=len(subset), descending=False)
+    assert ascending.rows["conflict_score"].is_monotonic_increasing
+
+
+def test_count_and_pages_skip_unscored_plays(tmp_path):
+    plays = _plays()
+    plays.loc[::3, "conflict_score"] = np.nan
+    index = PlayIndex(write_play_index(plays, tmp_path / PLAY_INDEX_FILE))
+    scored = int(plays["conflict_score"].notna().sum())
+    assert index.count() == index.page(page_size=10).total_rows == scored
+    week_two = plays.loc[plays["week"].eq(2), "conflict_score"]
+    week = PlayFilter(weeks=(2,))
+    assert index.count(week) == index.page(week).total_rows == int(week_two.notna().sum())
+
+
+def test_histogram_and_sample_stay_bounded(tmp_path):
+    plays = _plays()
+    index = PlayIndex(write_play_index(plays, tmp_path / PLAY_INDEX_FILE))
+
+    histogram = index.histogram(bins=10)
+    assert len(histogram) == 10 and histogram["plays"].sum() == len(plays)
+    sample = index.sample(n=50)
+    assert len(sample) == 50 and list(sample.columns) == ["epa", "conflict_score"]
+    assert len(index.sample(PlayFilter(seasons=(1999,)), n=50)) == 0
+
+
+def test_pipeline_writes_play_index(tmp_path):
+    run_pipeline(simulate_week(2030, 1, num_teams=6), output_dir=tmp_path)
+    index = PlayIndex(tmp_path / PLAY_INDEX_FILE)
+    scored = pd.read_csv(tmp_path / "plays_with_conflict_scores.csv")
+    assert index.count() == len(scored)
+    assert index.options()["teams"] == sorted(scored["posteam"].unique())
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conflict_map.data.synthetic import simulate_week
+from conflict_map.model.unified import compute_unified_indices
+from conflict_map.pipeline.play_store import PlayStore, current_generation, publish_play_store
+
+
+def test_store_maps_plays_read_only_and_round_trips(tmp_path):
+    indices = compute_unified_indices(simulate_week(2030, 1, num_teams=6))
+    publish_play_store(indices.plays, tmp_path, tables={"teams": indices.teams})
+
+    store = PlayStore.open(tmp_path)
+    plays = store.plays
+    assert list(plays.columns) == list(indices.plays.columns)
+    assert isinstance(plays["posteam"].dtype, pd.CategoricalDtype)
+    assert not plays["occi"].to_numpy().flags.writeable
+    pd.testing.assert_frame_equal(
+        plays.astype({"posteam": object, "defteam": object, "game_id": object}),
+        indices.plays.reset_index(drop=True).astype({"posteam": object, "defteam": object, "game_id": object}),
+    )
+    assert store.tables["teams"]["posteam"].astype(object).tolist() == indices.teams["posteam"].tolist()
+
+
+def test_republishing_swaps_generations_without_disturbing_readers(tmp_path):
+    plays = pd.DataFrame({"posteam": ["BUF", None, "KC"], "occi": [50.0, np.nan, 70.0]})
+    first = publish_play_store(plays, tmp_path, columns=plays.columns)
+    reader = PlayStore.open(tmp_path)
+
+    second = publish_play_store(plays.assign(occi=[1.0, 2.0, 3.0]), tmp_path, columns=plays.columns)
+    assert current_generation(tmp_path) == second.name
+    assert reader.plays["occi"].tolist()[::2] == [50.0, 70.0]
+    assert PlayStore.open(tmp_path).plays["occi"].tolist() == [1.0, 2.0, 3.0]
+    assert PlayStore.open(tmp_path).plays["posteam"].isna().tolist() == [False, True, False]
+
+    # Only the live generation and the one it replaced are kept.
+    publish_play_store(plays, tmp_path, columns=plays.columns)
+    assert not first.exists() and second.exists()
+
+
+def test_open_without_published_store_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        PlayStore.open(tmp_path)
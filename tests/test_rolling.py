@@ -0,0 +1,52 @@
+import pandas as pd
+
+from conflict_map.data.synthetic import simulate_week, write_synthetic_weekly
+from conflict_map.metrics.rolling import RollingOCCIState, compute_team_rolling_occi
+from conflict_map.pipeline.updates import append_weekly_updates, run_pipeline
+
+
+def _games(values):
+    return pd.DataFrame(
+        {
+            "season": 2023,
+            "week": [w for w, _ in values],
+            "game_id": [f"g{w}" for w, _ in values],
+            "team": "A",
+            "occi_mean": [v for _, v in values],
+        }
+    )
+
+
+def test_incremental_state_matches_full_computation():
+    df_all = _games([(1, 0.2), (2, 0.6), (3, 0.4), (4, 0.9), (5, 0.1)])
+    expected = compute_team_rolling_occi(df_all, window=3, alpha=0.5)
+
+    state, first = RollingOCCIState.from_games(df_all.iloc[:2], window=3, alpha=0.5)
+    restored = RollingOCCIState.from_dict(state.to_dict())
+    assert restored.can_append(df_all.iloc[2:])
+    assert not restored.can_append(df_all.iloc[1:3])
+    rest = restored.update(df_all.iloc[2:])
+
+    combined = pd.concat([first, rest], ignore_index=True)
+    pd.testing.assert_frame_equal(combined, expected, check_dtype=False)
+
+
+def test_weekly_append_extends_rolling_output(tmp_path):
+    df_raw = pd.concat([simulate_week(2030, w, num_teams=4) for w in (1, 2)], ignore_index=True)
+    run_pipeline(df_raw, output_dir=tmp_path)
+    write_synthetic_weekly(2030, [3], tmp_path / "weekly", num_teams=4)
+
+    append_weekly_updates(tmp_path, season=2030, weeks=[3], weekly_dir=tmp_path / "weekly")
+
+    appended = pd.read_csv(tmp_path / "team_rolling_occi.csv")
+    df_game = pd.read_csv(tmp_path / "team_game_occi.csv")
+    lookup = pd.read_csv(tmp_path / "plays_with_conflict_scores.csv")[["game_id", "season", "week"]].drop_duplicates()
+    expected = compute_team_rolling_occi(df_game.merge(lookup, on="game_id"))
+
+    key = ["team", "season", "week"]
+    pd.testing.assert_frame_equal(
+        appended.sort_values(key).reset_index(drop=True)[expected.columns],
+        expected.sort_values(key).reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert set(appended["week"]) == {1, 2, 3}
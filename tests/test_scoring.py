@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from conflict_map.data.synthetic import simulate_week
+from conflict_map.features.build_features import classify_situation, engineer_basic_features
+from conflict_map.model.conflict_score import compute_conflict_score_row, compute_conflict_scores
+from conflict_map.pipeline.live import iter_play_records
+from conflict_map.pipeline.scoring import MicroBatcher, score_plays
+from conflict_map.service import ARROW_STREAM, create_app
+
+
+def test_vectorized_scores_match_row_function_exactly():
+    df = engineer_basic_features(simulate_week(2030, 1, num_teams=8))
+    df.loc[::5, "epa"] = np.nan
+    scored = compute_conflict_scores(df)
+    expected = df.apply(compute_conflict_score_row, axis=1)
+    np.testing.assert_array_equal(scored["conflict_score"].to_numpy(), expected.to_numpy())
+    assert (df["situation_bucket"] == df.apply(classify_situation, axis=1)).all()
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    df_raw = simulate_week(2030, 1, num_teams=4)
+    expected = score_plays(df_raw)
+    chunks = [df_raw.iloc[i:i + 7] for i in range(0, len(df_raw), 7)]
+
+    batcher = MicroBatcher(max_wait_ms=20)
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(batcher.score, chunks))
+    finally:
+        batcher.close()
+
+    np.testing.assert_array_equal(pd.concat(results, ignore_index=True), expected)
+    assert batcher.stats()["batches"] < len(chunks)
+
+
+def test_score_endpoint_accepts_json_and_arrow():
+    df_raw = simulate_week(2030, 1, num_teams=2).head(12)
+    expected = score_plays(df_raw).round(6).tolist()
+    app = create_app(MicroBatcher(max_wait_ms=0))
+    client = app.test_client()
+
+    response = client.post("/api/score", json={"plays": list(iter_play_records(df_raw))})
+    assert response.status_code == 200
+    assert response.get_json() == {"plays": 12, "scores": expected}
+
+    table = pa.Table.from_pandas(df_raw, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    response = client.post(
+        "/api/score",
+        data=sink.getvalue().to_pybytes(),
+        headers={"Content-Type": ARROW_STREAM, "Accept": ARROW_STREAM},
+    )
+    result = pa.ipc.open_stream(response.data).read_pandas()
+    assert list(result.columns) == ["game_id", "play_id", "conflict_score"]
+    np.testing.assert_allclose(result["conflict_score"], expected, atol=1e-6)
+
+    assert client.post("/api/score", json={"nope": 1}).status_code == 400
+    app.config["batcher"].close()
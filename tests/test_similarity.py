@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conflict_map.metrics.similarity import SimilarityIndex, component_profiles, split_profiles
+
+
+def _plays():
+    rows = []
+    profiles = {"A": (0.9, 0.1), "B": (0.85, 0.15), "C": (0.1, 0.9), "D": (0.2, 0.8)}
+    for team, (motion, play_action) in profiles.items():
+        for game in range(3):
+            for _ in range(4):
+                rows.append(
+                    {
+                        "season": 2023,
+                        "game_id": f"{team}{game}",
+                        "posteam": team,
+                        "motion_score": motion + 0.01 * game,
+                        "play_action_score": play_action,
+                    }
+                )
+    return pd.DataFrame(rows)
+
+
+def test_season_profiles_find_closest_offense():
+    profiles = component_profiles(_plays())
+    assert list(profiles.columns) == ["season", "team", "motion_score", "play_action_score", "plays"]
+
+    index = SimilarityIndex(profiles)
+    result = index.query((2023, "A"), k=3)
+    assert result["team"].iloc[0] == "B"
+    assert len(result) == 3 and "A" not in set(result["team"])
+    assert result["similarity"].is_monotonic_decreasing
+    assert index.query({"season": 2023, "team": "C"}, k=1)["team"].item() == "D"
+    with pytest.raises(KeyError):
+        index.query((2023, "Z"))
+
+
+def test_game_profiles_can_exclude_own_team():
+    index = SimilarityIndex(component_profiles(_plays(), level="game"))
+    result = index.query((2023, "A0", "A"), k=3, exclude_same_team=True)
+    assert set(result["team"]) == {"B"}
+    nearest = index.query_vector([0.1, 0.9], k=1)
+    assert nearest["team"].item() == "C"
+
+
+def test_split_profiles_are_wide_shares_and_occi():
+    df_splits = pd.DataFrame(
+        {
+            "season": 2023,
+            "team": ["A", "A", "B", "B"],
+            "split": "down",
+            "value": ["1", "2", "1", "3"],
+            "plays": [30, 10, 20, 20],
+            "occi_mean": [0.3, 0.4, 0.2, 0.5],
+        }
+    )
+    profiles = split_profiles(df_splits).set_index("team")
+    assert profiles.loc["A", "down=1:share"] == 0.75
+    assert profiles.loc["B", "down=2:share"] == 0.0
+    assert np.isclose(profiles.loc["B", "down=2:occi"], 0.4)
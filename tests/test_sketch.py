@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from conflict_map.data.synthetic import simulate_week, write_synthetic_weekly
+from conflict_map.metrics.sketch import (
+    TDigest,
+    build_group_digests,
+    merge_digests,
+    team_occi_digests,
+    team_occi_quantiles,
+)
+from conflict_map.pipeline.updates import SKETCH_FILE, append_weekly_updates, run_pipeline
+
+
+def test_group_digests_match_exact_quantiles_and_merge():
+    rng = np.random.default_rng(0)
+    values = rng.gamma(2.0, 0.2, size=40_000)
+    keys = np.repeat(["A", "B"], 20_000)
+
+    digests = build_group_digests(keys, values)
+    chunks = [build_group_digests(keys[i::4], values[i::4]) for i in range(4)]
+    merged = merge_digests(*chunks)
+
+    for team, lo in (("A", 0), ("B", 20_000)):
+        exact = np.quantile(values[lo:lo + 20_000], [0.1, 0.5, 0.9])
+        np.testing.assert_allclose(digests[team].quantile([0.1, 0.5, 0.9]), exact, rtol=0.02)
+        np.testing.assert_allclose(merged[team].quantile([0.1, 0.5, 0.9]), exact, rtol=0.02)
+        assert merged[team].count == 20_000
+        assert len(merged[team].means) < 200
+
+    restored = TDigest.from_dict(digests["A"].to_dict())
+    assert restored.quantile(0.5) == digests["A"].quantile(0.5)
+
+
+def test_pipeline_writes_quantiles_and_merges_weekly_sketches(tmp_path):
+    df_raw = pd.concat([simulate_week(2030, w, num_teams=4) for w in (1, 2)], ignore_index=True)
+    run_pipeline(df_raw, output_dir=tmp_path)
+    df_season = pd.read_csv(tmp_path / "team_season_occi.csv")
+    assert {"occi_p10", "occi_median", "occi_p90"}.issubset(df_season.columns)
+    assert (df_season["occi_p10"] <= df_season["occi_median"]).all()
+    assert (df_season["occi_median"] <= df_season["occi_p90"]).all()
+
+    write_synthetic_weekly(2030, [3], tmp_path / "weekly", num_teams=4)
+    append_weekly_updates(tmp_path, season=2030, weeks=[3], weekly_dir=tmp_path / "weekly")
+    plays = pd.read_csv(tmp_path / "plays_with_conflict_scores.csv")
+    assert (tmp_path / SKETCH_FILE).exists()
+
+    updated = pd.read_csv(tmp_path / "team_season_occi.csv")
+    exact = plays.groupby("posteam")["conflict_score"].median()
+    np.testing.assert_allclose(
+        updated.set_index("team")["occi_median"].loc[exact.index], exact, atol=0.02
+    )
+
+
+def test_plays_without_season_are_left_out_of_quantiles():
+    plays = pd.DataFrame(
+        {
+            "season": [2030, 2030, np.nan, 2031],
+            "posteam": ["BUF", "BUF", "BUF", "NYJ"],
+            "conflict_score": [0.2, 0.4, 0.9, 0.5],
+        }
+    )
+    table = team_occi_quantiles(team_occi_digests(plays))
+    assert table[["season", "team"]].values.tolist() == [[2030, "BUF"], [2031, "NYJ"]]
+    assert table["occi_p90"].max() <= 0.5
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from conflict_map.metrics.splits import compute_team_occi_splits
+
+
+def test_splits_match_groupby_per_dimension():
+    df_conflict = pd.DataFrame(
+        {
+            "season": [2023] * 6,
+            "posteam": ["A", "A", "A", "B", "B", None],
+            "defteam": ["B", "B", "C", "A", "A", "A"],
+            "down": [1.0, 3.0, 3.0, 1.0, np.nan, 2.0],
+            "situation_bucket": ["normal", "red_zone", "red_zone", "normal", "normal", "normal"],
+            "conflict_score": [0.2, 0.4, 0.8, 0.5, 0.3, 0.9],
+        }
+    )
+
+    splits = compute_team_occi_splits(df_conflict)
+
+    assert set(splits.columns) == {"season", "team", "split", "value", "plays", "occi_mean", "occi_std"}
+    assert set(splits["split"]) == {"defteam", "down", "situation_bucket"}
+    red_zone = splits[(splits["team"] == "A") & (splits["value"] == "red_zone")].iloc[0]
+    assert red_zone["plays"] == 2
+    assert np.isclose(red_zone["occi_mean"], 0.6)
+    assert np.isclose(red_zone["occi_std"], df_conflict["conflict_score"].iloc[1:3].std())
+
+    downs = splits[(splits["team"] == "B") & (splits["split"] == "down")].set_index("value")
+    assert downs.loc["1", "plays"] == 1
+    assert downs.loc["missing", "plays"] == 1
+    assert splits.groupby("split")["plays"].sum().eq(5).all()
@@ -0,0 +1,85 @@
+import gzip
+import importlib.util
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from conflict_map.data.synthetic import simulate_week
+from conflict_map.pipeline.updates import run_pipeline
+
+EXPORTER = Path(__file__).resolve().parents[1] / "webapp" / "export_static.py"
+
+
+def _exporter():
+    pytest.importorskip("plotly")
+    spec = importlib.util.spec_from_file_location("export_static", EXPORTER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    try:
+        module._load_app()
+    except ImportError as exc:
+        pytest.skip(f"webapp dependencies unavailable: {exc}")
+    return module
+
+
+def _read(path):
+    return json.loads(gzip.decompress(path.read_bytes()))
+
+
+def test_export_writes_payloads_and_updates_incrementally(tmp_path, monkeypatch):
+    exporter = _exporter()
+    processed, site = tmp_path / "processed", tmp_path / "site"
+    raw = pd.concat([simulate_week(2030, week, num_teams=6) for week in (1, 2)], ignore_index=True)
+    run_pipeline(raw, output_dir=processed)
+
+    first = exporter.export_dashboard(processed, site)
+    assert first["written"] > 0 and not first["up_to_date"]
+    teams = sorted(raw["posteam"].dropna().unique())
+    assert sorted(row["posteam"] for row in _read(site / "api" / "team-rankings.json.gz")) == teams
+    assert _read(site / "api" / "seasons.json.gz") == [2030]
+    for team in teams:
+        assert "data" in _read(site / "api" / "team-detail" / f"{team}.json.gz")
+    assert (site / "api" / "occi-distribution" / "2030.json.gz").exists()
+    assert "STATIC_EXPORT = true" in (site / "index.html").read_text()
+
+    assert exporter.export_dashboard(processed, site)["up_to_date"]
+
+    # Editing the code behind the payloads invalidates the export.
+    engine = tmp_path / "engine.py"
+    engine.write_text("WEIGHT = 1\n")
+    monkeypatch.setattr(exporter, "PAYLOAD_SOURCES", [*exporter.PAYLOAD_SOURCES, engine])
+    exporter.export_dashboard(processed, site)
+    assert exporter.export_dashboard(processed, site)["up_to_date"]
+    engine.write_text("WEIGHT = 2\n")
+    rerun = exporter.export_dashboard(processed, site)
+    assert not rerun["up_to_date"] and rerun["written"] == 0
+
+    # Dropping one team's plays removes its files and leaves unchanged payloads alone.
+    plays_path = processed / exporter.PLAYS_FILE
+    plays = pd.read_csv(plays_path)
+    plays[plays["posteam"] != teams[0]].to_csv(plays_path, index=False)
+    update = exporter.export_dashboard(processed, site)
+    assert update["removed"] >= 1 and update["unchanged"] >= 1
+    assert not (site / "api" / "team-detail" / f"{teams[0]}.json.gz").exists()
+
+
+def test_exported_payloads_match_flask_endpoints(tmp_path, monkeypatch):
+    exporter = _exporter()
+    data_loader = pytest.importorskip("occi.data_loader")
+    processed, site = tmp_path / "processed", tmp_path / "site"
+    raw = pd.concat([simulate_week(2030, week, num_teams=6) for week in (1, 2)], ignore_index=True)
+    assert not raw["play_type"].isin(["pass", "run"]).all()
+    run_pipeline(raw, output_dir=processed)
+    exporter.export_dashboard(processed, site)
+
+    # The live app loads the same raw plays through load_nfl_data.
+    monkeypatch.setattr(data_loader, "_fetch_season", lambda season, columns: raw[columns])
+    monkeypatch.setenv("OCCI_CACHE_DIR", str(tmp_path / "cache"))
+    dashboard = exporter._load_app()
+    dashboard.initialize_data([2030])
+    client = dashboard.app.test_client()
+
+    for path in ["api/team-rankings", "api/seasons", "api/pass-vs-run", "api/team-detail/" + raw["posteam"].iloc[0]]:
+        assert json.loads(client.get(f"/{path}").data) == _read(site / f"{path}.json.gz"), path
@@ -0,0 +1,53 @@
+import pandas as pd
+
+from conflict_map.data.synthetic import simulate_week
+from conflict_map.features.build_features import engineer_basic_features
+from conflict_map.features.store import FEATURES_FILE, read_feature_store, write_feature_store
+from conflict_map.model import conflict_score
+from conflict_map.model.conflict_score import SCORING_COLUMNS
+from conflict_map.pipeline.updates import rescore_from_features, run_pipeline
+
+
+def _raw():
+    return pd.concat([simulate_week(2030, week, num_teams=6) for week in (1, 2)], ignore_index=True)
+
+
+def test_feature_store_keeps_scoring_columns_compactly(tmp_path):
+    df_feat = engineer_basic_features(_raw())
+    path = write_feature_store(df_feat, tmp_path / FEATURES_FILE)
+    stored = read_feature_store(path)
+    assert set(SCORING_COLUMNS) <= set(stored.columns)
+    assert len(stored.columns) < len(df_feat.columns)
+    for col in stored.columns:
+        # Categoricals are read back as plain values.
+        expected = df_feat[col].astype(object) if isinstance(df_feat[col].dtype, pd.CategoricalDtype) else df_feat[col]
+        pd.testing.assert_series_equal(stored[col], expected, check_dtype=False)
+
+
+def test_rescore_matches_full_run_and_picks_up_new_heuristic(tmp_path, monkeypatch):
+    run_pipeline(_raw(), output_dir=tmp_path)
+    plays = pd.read_csv(tmp_path / "plays_with_conflict_scores.csv")
+    season = pd.read_csv(tmp_path / "team_season_occi.csv")
+    splits = pd.read_csv(tmp_path / "team_occi_splits.csv")
+
+    rescore_from_features(tmp_path)
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "plays_with_conflict_scores.csv"), plays)
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "team_season_occi.csv"), season)
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "team_occi_splits.csv"), splits)
+
+    # Edit the heuristic the way a developer would: batch, rescore and live all score through it.
+    original = conflict_score.heuristic_scores
+    monkeypatch.setattr(conflict_score, "heuristic_scores", lambda *arrays: original(*arrays) / 2)
+    rescore_from_features(tmp_path)
+    rescored = pd.read_csv(tmp_path / "plays_with_conflict_scores.csv")
+    # Raw columns survive; only the score changes.
+    assert "no_huddle" in rescored.columns
+    pd.testing.assert_frame_equal(rescored.drop(columns="conflict_score"), plays.drop(columns="conflict_score"))
+    pd.testing.assert_series_equal(rescored["conflict_score"], plays["conflict_score"] / 2)
+    rescored_season = pd.read_csv(tmp_path / "team_season_occi.csv")
+    pd.testing.assert_series_equal(rescored_season["season_occi_mean"], season["season_occi_mean"] / 2)
+
+    play = engineer_basic_features(_raw()).iloc[-1]
+    same_play = rescored["play_id"].eq(play["play_id"]) & rescored["game_id"].eq(play["game_id"])
+    (batch_score,) = rescored.loc[same_play, "conflict_score"]
+    assert conflict_score.compute_conflict_score_row(play) == batch_score
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conflict_map.data.synthetic import simulate_week
+from conflict_map.features.build_features import engineer_basic_features
+from conflict_map.metrics.occi import compute_team_game_occi
+from conflict_map.model.conflict_score import compute_conflict_scores
+from conflict_map.model.unified import compute_play_indices, compute_unified_indices
+
+COMPONENTS = [
+    "motion_score",
+    "formation_score",
+    "target_depth_score",
+    "play_action_score",
+    "personnel_score",
+    "situational_score",
+]
+
+
+def _raw():
+    df = pd.concat([simulate_week(2030, week, num_teams=6) for week in (1, 2)], ignore_index=True)
+    df.loc[:9, "down"] = np.nan
+    df.loc[10:19, "epa"] = np.nan
+    return df
+
+
+def test_conflict_scores_match_feature_pipeline():
+    df_raw = _raw()
+    result = compute_unified_indices(df_raw)
+    expected = compute_conflict_scores(engineer_basic_features(df_raw))
+    np.testing.assert_array_equal(result.plays["conflict_score"].to_numpy(), expected["conflict_score"].to_numpy())
+    pd.testing.assert_frame_equal(result.team_games, compute_team_game_occi(expected))
+    assert result.plays["occi"].between(0, 100).all()
+    assert set(result.teams["posteam"]) == set(df_raw["posteam"].dropna())
+
+
+def test_legacy_calculator_matches_engine():
+    calculator_module = pytest.importorskip("occi.calculator")
+    df_raw = _raw()
+    calculator = calculator_module.OCCICalculator(df_raw)
+    calculator.calculate_play_occi()
+    plays = compute_play_indices(df_raw)
+    for col in [*COMPONENTS, "occi"]:
+        np.testing.assert_array_equal(calculator.pbp_data[col].to_numpy(), plays[col].to_numpy())
+    team_stats = calculator.calculate_team_occi()
+    result = compute_unified_indices(df_raw)
+    pd.testing.assert_frame_equal(result.teams[team_stats.columns], team_stats)
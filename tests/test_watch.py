@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+from conflict_map.data.synthetic import simulate_week, write_synthetic_weekly
+from conflict_map.pipeline.updates import run_pipeline
+from conflict_map.pipeline.watch import WATCH_MANIFEST_FILE, WeeklyWatcher, load_watch_manifest, scan_weekly_dir
+
+
+def _age(path, seconds=60):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def _weeks(processed_dir):
+    return sorted(pd.read_csv(processed_dir / "plays_with_conflict_scores.csv")["week"].unique().tolist())
+
+
+def test_poll_appends_settled_new_and_changed_files(tmp_path):
+    processed, weekly = tmp_path / "processed", tmp_path / "weekly"
+    run_pipeline(pd.concat([simulate_week(2030, w, num_teams=4) for w in (1, 2)], ignore_index=True), processed)
+    watcher = WeeklyWatcher(weekly, processed, settle=30)
+
+    (week3,) = write_synthetic_weekly(2030, [3], weekly, num_teams=4)
+    (weekly / ".pbp_2030_week_4.csv.gz.part").write_bytes(b"partial")
+    assert watcher.poll() == []  # Still settling.
+
+    _age(week3)
+    (batch,) = watcher.poll()
+    assert (batch.season, batch.weeks, batch.error) == (2030, [3], None)
+    assert _weeks(processed) == [1, 2, 3]
+    assert set(load_watch_manifest(processed / WATCH_MANIFEST_FILE)) == {week3.name}
+    assert watcher.poll() == []
+
+    # Same content with a new mtime is recorded without appending.
+    _age(week3, 45)
+    assert watcher.poll() == [] and watcher.changed_files() == []
+
+    # A re-delivered week replaces its plays.
+    write_synthetic_weekly(2030, [3], weekly, num_teams=4, seed=7)
+    _age(week3, 40)
+    (batch,) = watcher.poll()
+    assert batch.weeks == [3] and batch.error is None
+    keys = ["game_id", "play_id", "epa"]
+    plays = pd.read_csv(processed / "plays_with_conflict_scores.csv")
+    redelivered = pd.read_csv(week3)[keys].dropna()
+    assert len(redelivered.merge(plays[keys], on=keys)) == len(redelivered)
+
+
+def test_bad_file_is_skipped_until_it_changes(tmp_path):
+    processed, weekly = tmp_path / "processed", tmp_path / "weekly"
+    weekly.mkdir()
+    write_synthetic_weekly(2030, [1], weekly, num_teams=4)
+    bad = weekly / "pbp_2030_week_2.csv.gz"
+    bad.write_bytes(b"\x1f\x8b truncated")
+    for path in weekly.iterdir():
+        _age(path)
+
+    watcher = WeeklyWatcher(weekly, processed, settle=1)
+    batches = watcher.poll()
+    assert [(b.weeks, b.error is None) for b in batches] == [([1], True), ([2], False)]
+    assert _weeks(processed) == [1]
+    assert watcher.poll() == []
+
+    write_synthetic_weekly(2030, [2], weekly, num_teams=4)
+    _age(bad)
+    (batch,) = watcher.poll()
+    assert batch.error is None and _weeks(processed) == [1, 2]
+
+
+def test_only_files_the_loader_reads_are_watched(tmp_path):
+    processed, weekly = tmp_path / "processed", tmp_path / "weekly"
+    run_pipeline(simulate_week(2030, 1, num_teams=4), processed)
+    (csv_week,) = write_synthetic_weekly(2030, [2], weekly, num_teams=4, compress=False)
+    simulate_week(2030, 2, num_teams=4, seed=7).to_csv(weekly / "pbp_2030_week_2.csv.gz", index=False)
+    simulate_week(2030, 3, num_teams=4).to_csv(weekly / "pbp_2030_week_03.csv", index=False)
+    for path in weekly.iterdir():
+        _age(path)
+
+    assert [f.path.name for f in scan_weekly_dir(weekly)] == [csv_week.name]
+    (batch,) = WeeklyWatcher(weekly, processed, settle=1).poll()
+    assert batch.files == [csv_week.name] and batch.error is None
+    keys = ["game_id", "play_id", "epa"]
+    appended = pd.read_csv(csv_week)[keys].dropna()
+    plays = pd.read_csv(processed / "plays_with_conflict_scores.csv")
+    assert len(appended.merge(plays[keys], on=keys)) == len(appended)
+    assert _weeks(processed) == [1, 2]
+
+
+def test_run_picks_up_files_as_they_land(tmp_path):
+    processed, weekly = tmp_path / "processed", tmp_path / "weekly"
+    watcher = WeeklyWatcher(weekly, processed, settle=0.2)
+    batches = []
+    thread = threading.Thread(target=watcher.run, kwargs={"on_batch": batches.append, "poll_interval": 0.05})
+    thread.start()
+    try:
+        write_synthetic_weekly(2030, [1], weekly, num_teams=4)
+        deadline = time.time() + 20
+        while not batches and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+        thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert [(b.season, b.weeks, b.error) for b in batches] == [(2030, [1], None)]
+    assert _weeks(processed) == [1]
@@ -2,11 +2,12 @@
 Flask web application for visualizing OCCI metrics
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.utils import PlotlyJSONEncoder
 import json
+import queue
 import sys
 import os
 
@@ -21,6 +22,9 @@ app = Flask(__name__)
 pbp_data = None
 calculator = None
 team_stats = None
+similarity_indexes = {}
+live_broadcaster = None
+live_occi = None
 
 
 def initialize_data(seasons=[2023]):
@@ -32,9 +36,37 @@ def initialize_data(seasons=[2023]):
     calculator = OCCICalculator(pbp_data)
     calculator.calculate_play_occi()
     team_stats = calculator.calculate_team_occi()
+    similarity_indexes.clear()
     print("Data initialized successfully!")
 
 
+def publish_play_store(store_dir, seasons=[2023]):
+    """Score the seasons once and publish the plays and team stats to a shared store."""
+    from conflict_map.pipeline.play_store import publish_play_store as publish
+    
+    print(f"Publishing play store to {store_dir}...")
+    store_calculator = OCCICalculator(load_nfl_data(seasons))
+    store_calculator.calculate_play_occi()
+    publish(
+        store_calculator.get_play_data_with_occi(),
+        store_dir,
+        tables={'team_stats': store_calculator.calculate_team_occi()},
+    )
+
+
+def attach_play_store(store_dir):
+    """Serve from a published play store, memory-mapped and shared with other workers."""
+    global pbp_data, calculator, team_stats
+    from conflict_map.pipeline.play_store import PlayStore
+    
+    store = PlayStore.open(store_dir)
+    pbp_data = store.plays
+    calculator = OCCICalculator.from_scored_plays(store.plays)
+    team_stats = store.tables['team_stats']
+    similarity_indexes.clear()
+    print(f"Attached to play store {store.path}")
+
+
 @app.route('/')
 def index():
     """Main page with OCCI visualizations."""
@@ -47,7 +79,16 @@ def team_rankings():
     if team_stats is None:
         return jsonify({"error": "Data not loaded"}), 500
     
-    return jsonify(team_stats.to_dict(orient='records'))
+    return jsonify(team_rankings_records(team_stats))
+
+
+@app.route('/api/seasons')
+def seasons():
+    """API endpoint listing the seasons in the loaded plays."""
+    if calculator is None:
+        return jsonify({"error": "Data not loaded"}), 500
+    
+    return jsonify(season_list(calculator.get_play_data_with_occi()))
 
 
 @app.route('/api/team-chart')
@@ -56,7 +97,28 @@ def team_chart():
     if team_stats is None:
         return jsonify({"error": "Data not loaded"}), 500
     
-    # Create bar chart of team OCCI scores
+    return figure_json(team_chart_figure(team_stats))
+
+
+def figure_json(fig):
+    """Serialize a Plotly figure the way every chart endpoint returns it."""
+    return json.dumps(fig, cls=PlotlyJSONEncoder)
+
+
+def team_rankings_records(team_stats):
+    """Team statistics as JSON-safe records (NaN becomes null)."""
+    return team_stats.astype(object).where(team_stats.notna(), None).to_dict(orient='records')
+
+
+def season_list(play_data):
+    """Sorted seasons present in the plays (empty without a season column)."""
+    if 'season' not in play_data.columns:
+        return []
+    return sorted(int(season) for season in play_data['season'].dropna().unique())
+
+
+def team_chart_figure(team_stats):
+    """Bar chart of average OCCI per team."""
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
@@ -76,18 +138,27 @@ def team_chart():
         showlegend=False,
     )
     
-    return json.dumps(fig, cls=PlotlyJSONEncoder)
+    return fig
 
 
 @app.route('/api/occi-distribution')
 def occi_distribution():
-    """Generate OCCI distribution chart."""
+    """Generate OCCI distribution chart, optionally for one ``season``."""
     if calculator is None:
         return jsonify({"error": "Data not loaded"}), 500
     
     play_data = calculator.get_play_data_with_occi()
+    season = request.args.get('season', type=int)
+    if season is not None:
+        play_data = play_data[play_data['season'] == season] if 'season' in play_data.columns else play_data.iloc[:0]
+        if len(play_data) == 0:
+            return jsonify({"error": f"No data found for season {season}"}), 404
     
-    # Create histogram of OCCI scores
+    return figure_json(occi_distribution_figure(play_data, season))
+
+
+def occi_distribution_figure(play_data, season=None):
+    """Histogram of play OCCI, titled for one season when given."""
     fig = go.Figure()
     
     fig.add_trace(go.Histogram(
@@ -96,8 +167,12 @@ def occi_distribution():
         marker_color='rgb(55, 83, 109)',
     ))
     
+    title = 'Distribution of OCCI Scores Across All Plays'
+    if season is not None:
+        title = f'Distribution of OCCI Scores - {season}'
+    
     fig.update_layout(
-        title='Distribution of OCCI Scores Across All Plays',
+        title=title,
         xaxis_title='OCCI Score',
         yaxis_title='Number of Plays',
         height=400,
@@ -105,7 +180,7 @@ def occi_distribution():
         showlegend=False,
     )
     
-    return json.dumps(fig, cls=PlotlyJSONEncoder)
+    return fig
 
 
 @app.route('/api/team-detail/<team>')
@@ -120,6 +195,11 @@ def team_detail(team):
     if len(team_plays) == 0:
         return jsonify({"error": f"No data found for team {team}"}), 404
     
+    return figure_json(team_detail_figure(team, team_plays))
+
+
+def team_detail_figure(team, team_plays):
+    """Radar chart of a team's average OCCI components."""
     # Calculate component averages
     components = {
         'Motion': team_plays['motion_score'].mean() * 100,
@@ -155,7 +235,7 @@ def team_detail(team):
         height=500,
     )
     
-    return json.dumps(fig, cls=PlotlyJSONEncoder)
+    return fig
 
 
 @app.route('/api/pass-vs-run')
@@ -164,8 +244,11 @@ def pass_vs_run():
     if calculator is None:
         return jsonify({"error": "Data not loaded"}), 500
     
-    play_data = calculator.get_play_data_with_occi()
-    
+    return figure_json(pass_vs_run_figure(calculator.get_play_data_with_occi()))
+
+
+def pass_vs_run_figure(play_data):
+    """Box plots of OCCI on pass plays and run plays."""
     pass_plays = play_data[play_data['pass_attempt'] == 1]['occi']
     run_plays = play_data[play_data['rush_attempt'] == 1]['occi']
     
@@ -190,14 +273,118 @@ def pass_vs_run():
         template='plotly_white',
     )
     
-    return json.dumps(fig, cls=PlotlyJSONEncoder)
+    return fig
+
+
+def get_similarity_index(level):
+    """Build the team similarity index for a level once and reuse it."""
+    if level not in similarity_indexes:
+        similarity_indexes[level] = calculator.build_similarity_index(level)
+    return similarity_indexes[level]
+
+
+@app.route('/api/similar/<team>')
+def similar_teams(team):
+    """Find the offenses whose component profile looks most like a team's.
+    
+    Query parameters: ``k`` (default 5), ``season`` (defaults to the latest),
+    ``game_id`` to compare a single team-game against all team-games, and
+    ``exclude_same_team=true`` to leave out the team's own other profiles.
+    """
+    if calculator is None:
+        return jsonify({"error": "Data not loaded"}), 500
+    
+    game_id = request.args.get('game_id')
+    season = request.args.get('season', type=int)
+    k = request.args.get('k', 5, type=int)
+    exclude_same_team = request.args.get('exclude_same_team', 'false').lower() == 'true'
+    
+    index = get_similarity_index('game' if game_id else 'season')
+    payload = similar_teams_payload(index, team, k, season, game_id, exclude_same_team)
+    if payload is None:
+        return jsonify({"error": f"No profile found for team {team}"}), 404
+    
+    return jsonify(payload)
+
+
+def similar_teams_payload(index, team, k=5, season=None, game_id=None, exclude_same_team=False):
+    """Nearest profiles to a team's (latest matching) profile, or None if it has none."""
+    matches = index.keys[index.keys['team'] == team]
+    if game_id:
+        matches = matches[matches['game_id'] == game_id]
+    if season is not None and 'season' in matches.columns:
+        matches = matches[matches['season'] == season]
+    
+    if len(matches) == 0:
+        return None
+    
+    query = matches.iloc[[-1]].to_dict(orient='records')[0]
+    results = index.query(query, k=k, exclude_same_team=exclude_same_team)
+    return {
+        'query': query,
+        'results': results.round(4).to_dict(orient='records'),
+    }
+
+
+def start_live_feed(source):
+    """Start scoring a live play feed (``file:<path>`` or ``tcp:<host>:<port>``) in the background."""
+    global live_broadcaster, live_occi
+    from conflict_map.pipeline.live import Broadcaster, start_live_thread
+    
+    live_broadcaster = Broadcaster()
+    live_occi, _ = start_live_thread(source, live_broadcaster)
+
+
+@app.route('/api/live/stream')
+def live_stream():
+    """Push one Server-Sent Event per scored play with the updated team-game OCCI."""
+    if live_broadcaster is None:
+        return jsonify({"error": "Live feed not started"}), 503
+    
+    updates = live_broadcaster.subscribe()
+    
+    def events():
+        try:
+            yield ': connected\n\n'
+            while True:
+                try:
+                    update = updates.get(timeout=15)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"event: play\ndata: {json.dumps(update)}\n\n"
+        finally:
+            live_broadcaster.unsubscribe(updates)
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@app.route('/api/live/snapshot')
+def live_snapshot():
+    """Current running OCCI for every team-game seen on the live feed."""
+    if live_occi is None:
+        return jsonify({"error": "Live feed not started"}), 503
+    
+    snapshot = live_occi.snapshot()
+    return jsonify(snapshot.astype(object).where(snapshot.notna(), None).to_dict(orient='records'))
 
 
 if __name__ == '__main__':
     import os
     
-    # Initialize with 2023 season data
-    initialize_data(seasons=[2023])
+    # Initialize with 2023 season data, or map a published play store
+    if os.environ.get('OCCI_PLAY_STORE'):
+        attach_play_store(os.environ['OCCI_PLAY_STORE'])
+    else:
+        initialize_data(seasons=[2023])
+    
+    # Optionally score a live feed, e.g. OCCI_LIVE_FEED=file:data/live/feed.jsonl
+    if os.environ.get('OCCI_LIVE_FEED'):
+        start_live_feed(os.environ['OCCI_LIVE_FEED'])
     
     # Run the app - use environment variable to control debug mode
     debug_mode = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
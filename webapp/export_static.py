@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Pre-render the OCCI dashboard as static files.
+
+Computes every ``/api/*`` payload the Flask app in ``app.py`` serves from the
+processed plays (``plays_with_conflict_scores.csv``) and writes them as
+gzipped JSON next to a static ``index.html``. The output directory can be
+served by any static file server, with no Python behind it::
+
+    index.html
+    api/team-rankings.json.gz
+    api/team-chart.json.gz
+    api/seasons.json.gz
+    api/occi-distribution.json.gz
+    api/occi-distribution/<season>.json.gz
+    api/pass-vs-run.json.gz
+    api/team-detail/<team>.json.gz
+    api/similar/<team>.json.gz
+    export_manifest.json
+
+Like ``load_nfl_data`` for the live app, only pass and run plays with a down
+are scored; the processed plays also hold kickoffs, punts and no-plays.
+
+The page fetches the ``.json.gz`` files and inflates them in the browser
+with ``DecompressionStream``. The live ``/api/live/*`` endpoints have no
+static form and are not exported.
+
+Exports are incremental. ``export_manifest.json`` records a hash of the inputs
+(the plays file, this script, ``app.py``, the template, and the calculator
+and engine modules that compute the payloads) and of every payload. A run
+whose inputs are unchanged returns without loading any data. Otherwise only
+files whose content changed are rewritten, so a static server or CDN keeps
+serving the rest unchanged, and payloads that no longer exist
+(e.g. a team that dropped out) are removed.
+
+Usage::
+
+    python webapp/export_static.py --processed-dir data/processed --output-dir dist/dashboard
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+WEBAPP_DIR = Path(__file__).resolve().parent
+ROOT = WEBAPP_DIR.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+import pandas as pd  # noqa: E402
+from jinja2 import Environment, FileSystemLoader, select_autoescape  # noqa: E402
+
+from conflict_map.config import PROCESSED_DATA_DIR  # noqa: E402
+from conflict_map.metrics import similarity  # noqa: E402
+from conflict_map.model import unified  # noqa: E402
+from occi import calculator, data_loader  # noqa: E402
+from occi.data_loader import default_columns, scrimmage_plays  # noqa: E402
+
+PLAYS_FILE = "plays_with_conflict_scores.csv"
+MANIFEST_FILE = "export_manifest.json"
+TEMPLATE_DIR = WEBAPP_DIR / "templates"
+APP_PATH = WEBAPP_DIR / "app.py"
+# Columns the calculator and the payloads read from the processed plays.
+PLAY_COLUMNS = set(default_columns())
+# Code that computes the payloads, hashed with the other inputs.
+PAYLOAD_SOURCES = [Path(module.__file__) for module in (calculator, data_loader, unified, similarity)]
+_HASH_CHUNK = 1 << 20
+
+
+def _load_app():
+    spec = importlib.util.spec_from_file_location("occi_webapp", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _sha1_files(paths: list[Path]) -> str:
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(path.name.encode())
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _json_bytes(payload) -> bytes:
+    if isinstance(payload, str):
+        return payload.encode()
+    return json.dumps(payload, allow_nan=False).encode()
+
+
+def render_index() -> bytes:
+    """``index.html`` with the page reading the exported files."""
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(["html"]))
+    return env.get_template("index.html").render(static_export=True).encode()
+
+
+def build_payloads(plays: pd.DataFrame, dashboard=None) -> dict[str, bytes]:
+    """Every exported ``/api/*`` payload, keyed by its path without ``.json.gz``."""
+    dashboard = dashboard or _load_app()
+    calculator = dashboard.OCCICalculator(plays)
+    calculator.calculate_play_occi()
+    team_stats = calculator.calculate_team_occi()
+    play_data = calculator.get_play_data_with_occi()
+    seasons = dashboard.season_list(play_data)
+
+    payloads = {
+        "api/team-rankings": dashboard.team_rankings_records(team_stats),
+        "api/team-chart": dashboard.figure_json(dashboard.team_chart_figure(team_stats)),
+        "api/seasons": seasons,
+        "api/occi-distribution": dashboard.figure_json(dashboard.occi_distribution_figure(play_data)),
+        "api/pass-vs-run": dashboard.figure_json(dashboard.pass_vs_run_figure(play_data)),
+    }
+    for season in seasons:
+        season_plays = play_data[play_data["season"] == season]
+        payloads[f"api/occi-distribution/{season}"] = dashboard.figure_json(
+            dashboard.occi_distribution_figure(season_plays, season)
+        )
+
+    similarity = calculator.build_similarity_index("season")
+    for team, team_plays in play_data.groupby("posteam", sort=True):
+        payloads[f"api/team-detail/{team}"] = dashboard.figure_json(dashboard.team_detail_figure(team, team_plays))
+        similar = dashboard.similar_teams_payload(similarity, team)
+        if similar is not None:
+            payloads[f"api/similar/{team}"] = similar
+    return {path: _json_bytes(payload) for path, payload in payloads.items()}
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def export_dashboard(processed_dir: Path, output_dir: Path, force: bool = False) -> dict:
+    """Write the static dashboard and return counts of written/unchanged/removed files."""
+    processed_dir, output_dir = Path(processed_dir), Path(output_dir)
+    plays_path = processed_dir / PLAYS_FILE
+    inputs = _sha1_files(
+        [plays_path, Path(__file__).resolve(), APP_PATH, TEMPLATE_DIR / "index.html", *PAYLOAD_SOURCES]
+    )
+
+    manifest_path = output_dir / MANIFEST_FILE
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+    previous = manifest.get("files", {})
+    if (
+        not force
+        and manifest.get("inputs") == inputs
+        and all((output_dir / name).exists() for name in previous)
+    ):
+        return {"written": 0, "unchanged": len(previous), "removed": 0, "up_to_date": True}
+
+    plays = pd.read_csv(plays_path, usecols=lambda col: col in PLAY_COLUMNS)
+    plays = scrimmage_plays(plays).reset_index(drop=True)
+    files = {f"{path}.json.gz": data for path, data in build_payloads(plays).items()}
+    files["index.html"] = render_index()
+
+    hashes, written = {}, 0
+    for name, data in files.items():
+        hashes[name] = hashlib.sha1(data).hexdigest()
+        target = output_dir / name
+        if previous.get(name) == hashes[name] and target.exists():
+            continue
+        # mtime=0 keeps the gzip bytes a pure function of the payload.
+        _write_atomic(target, gzip.compress(data, compresslevel=9, mtime=0) if name.endswith(".gz") else data)
+        written += 1
+
+    removed = 0
+    for name in set(previous) - set(hashes):
+        (output_dir / name).unlink(missing_ok=True)
+        removed += 1
+
+    _write_atomic(manifest_path, json.dumps({"inputs": inputs, "files": hashes}, indent=2, sort_keys=True).encode())
+    return {"written": written, "unchanged": len(hashes) - written, "removed": removed, "up_to_date": False}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the OCCI dashboard as static gzipped JSON and HTML")
+    parser.add_argument("--processed-dir", type=Path, default=PROCESSED_DATA_DIR)
+    parser.add_argument("--output-dir", type=Path, default=ROOT / "dist" / "dashboard")
+    parser.add_argument("--force", action="store_true", help="Rebuild every payload even if the inputs are unchanged")
+    args = parser.parse_args()
+    print(json.dumps(export_dashboard(args.processed_dir, args.output_dir, force=args.force), indent=2))
+
+
+if __name__ == "__main__":
+    main()
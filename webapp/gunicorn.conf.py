@@ -0,0 +1,41 @@
+"""
+Gunicorn settings for serving the OCCI dashboard with several workers.
+
+The master scores the plays once and publishes them to a shared play store
+(``OCCI_PLAY_STORE``, default ``data/play_store``); every worker then maps the
+store read-only instead of loading its own copy, so extra workers add almost
+no memory and start without reloading data. An existing store is reused
+unless ``OCCI_REFRESH_STORE=true``.
+
+Usage::
+
+    OCCI_SEASONS=2022,2023 gunicorn -c webapp/gunicorn.conf.py --chdir webapp app:app
+"""
+import os
+import sys
+
+WEBAPP_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(WEBAPP_DIR)
+sys.path.insert(0, WEBAPP_DIR)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+bind = os.environ.get('OCCI_BIND', '0.0.0.0:5001')
+workers = int(os.environ.get('OCCI_WORKERS', '4'))
+store_dir = os.environ.get('OCCI_PLAY_STORE', os.path.join(ROOT, 'data', 'play_store'))
+seasons = [int(season) for season in os.environ.get('OCCI_SEASONS', '2023').split(',')]
+
+
+def on_starting(server):
+    """Publish the play store in the master before any worker starts."""
+    from conflict_map.pipeline.play_store import current_generation
+    
+    refresh = os.environ.get('OCCI_REFRESH_STORE', 'false').lower() == 'true'
+    if refresh or current_generation(store_dir) is None:
+        import app
+        app.publish_play_store(store_dir, seasons)
+
+
+def post_worker_init(worker):
+    """Map the published store in each worker."""
+    import app
+    app.attach_play_store(store_dir)